@@ -0,0 +1 @@
+"""Benchmarks of engine internals, run as modules from the backend directory."""
@@ -0,0 +1,241 @@
+"""Makespan of critical-path dispatch against FIFO dispatch on synthetic DAGs.
+
+Run from the backend directory:
+
+    python -m benchmarks.dispatch --concurrency 8 --seed 7
+
+Plans are compiled with `compile_plan`, so the ranks are the ones the engine
+uses. Node durations are drawn at random and runs are simulated on a virtual
+clock, so results are exact and take no wall time; the graph shapes mimic
+workflows with one deep chain of LLM calls and many short side branches.
+"""
+
+import argparse
+import heapq
+import random
+from collections.abc import Callable
+
+from engine.plan import ExecutionPlan, compile_plan
+from enums import NodeType
+from models import Edge, Node
+
+type Graph = tuple[ExecutionPlan, list[float]]
+
+# Share of chain nodes that also read the previous node of another chain.
+CROSS_LINK_RATE = 0.1
+
+
+def _build(
+    rng: random.Random, types: list[NodeType], pairs: list[tuple[int, int]]
+) -> Graph:
+    """Compile a graph and draw a duration for each of its nodes.
+
+    Args:
+        rng: The random generator.
+        types: The type of each node, by index.
+        pairs: The `(source, target)` index pairs.
+
+    Returns:
+        The compiled plan and the node durations in seconds, by plan index.
+
+    """
+    nodes = [
+        Node(id=i + 1, workflow_id=1, type=node_type, data={})
+        for i, node_type in enumerate(types)
+    ]
+    edges = [
+        Edge(id=i + 1, workflow_id=1, source_node_id=s + 1, target_node_id=t + 1)
+        for i, (s, t) in enumerate(pairs)
+    ]
+    plan = compile_plan(workflow_id=1, version=1, nodes=nodes, edges=edges)
+    durations = [
+        rng.uniform(0.5, 2.0) if node.type == NodeType.LLM else 0.01
+        for node in plan.nodes
+    ]
+
+    return plan, durations
+
+
+def spine(rng: random.Random, depth: int, branches: int) -> Graph:
+    """Build a deep chain of LLM nodes with short side branches hanging off it.
+
+    Side branches are created before the chain links they hang off, so FIFO
+    dispatch sees them first.
+
+    Args:
+        rng: The random generator.
+        depth: The length of the chain.
+        branches: The number of side branches.
+
+    Returns:
+        The compiled plan and node durations.
+
+    """
+    types = [NodeType.INPUT]
+    pairs = []
+    anchors = sorted(rng.randrange(depth) for _ in range(branches))
+    previous = 0
+    for link in range(depth):
+        for _ in range(anchors.count(link)):
+            source = previous
+            for _ in range(rng.randint(1, 3)):
+                types.append(NodeType.LLM)
+                pairs.append((source, len(types) - 1))
+                source = len(types) - 1
+            types.append(NodeType.OUTPUT)
+            pairs.append((source, len(types) - 1))
+        types.append(NodeType.LLM)
+        pairs.append((previous, len(types) - 1))
+        previous = len(types) - 1
+    types.append(NodeType.OUTPUT)
+    pairs.append((previous, len(types) - 1))
+
+    return _build(rng=rng, types=types, pairs=pairs)
+
+
+def chains(rng: random.Random, width: int, depth: int) -> Graph:
+    """Build parallel LLM chains of random length with occasional cross-links.
+
+    Nodes are numbered level by level, so FIFO dispatch runs the graph
+    breadth first whatever the length of each chain.
+
+    Args:
+        rng: The random generator.
+        width: The number of chains.
+        depth: The length of the longest chains.
+
+    Returns:
+        The compiled plan and node durations.
+
+    """
+    types = [NodeType.INPUT]
+    pairs = []
+    lengths = [rng.randint(1, depth) for _ in range(width)]
+    tails = [0] * width
+    for level in range(depth):
+        links = [chain for chain in range(width) if lengths[chain] > level]
+        for chain in links:
+            types.append(NodeType.LLM)
+            pairs.append((tails[chain], len(types) - 1))
+            if level and rng.random() < CROSS_LINK_RATE:
+                pairs.append((tails[rng.choice(links)], len(types) - 1))
+        for chain, node in zip(
+            links, range(len(types) - len(links), len(types)), strict=True
+        ):
+            tails[chain] = node
+    for tail in tails:
+        types.append(NodeType.OUTPUT)
+        pairs.append((tail, len(types) - 1))
+
+    return _build(rng=rng, types=types, pairs=pairs)
+
+
+def simulate(
+    plan: ExecutionPlan,
+    durations: list[float],
+    concurrency: int,
+    key: Callable[[int, int], tuple[int, ...]],
+) -> float:
+    """Run a plan on a virtual clock and return its makespan.
+
+    Args:
+        plan: The compiled plan.
+        durations: The node durations in seconds, by plan index.
+        concurrency: The number of nodes run at once.
+        key: The dispatch order of a ready node, given its index and the
+            order in which it became ready.
+
+    Returns:
+        The time at which the last node finished.
+
+    """
+    in_degree = list(plan.in_degree)
+    ready = [(key(i, i), i) for i in plan.levels[0]]
+    heapq.heapify(ready)
+    running: list[tuple[float, int]] = []
+    clock, sequence = 0.0, len(plan.nodes)
+    while ready or running:
+        while ready and len(running) < concurrency:
+            _, node_index = heapq.heappop(ready)
+            heapq.heappush(running, (clock + durations[node_index], node_index))
+
+        clock, node_index = heapq.heappop(running)
+        for target in plan.successors(node_index):
+            in_degree[target] -= 1
+            if in_degree[target] == 0:
+                sequence += 1
+                heapq.heappush(ready, (key(target, sequence), target))
+
+    return clock
+
+
+def lower_bound(plan: ExecutionPlan, durations: list[float], concurrency: int) -> float:
+    """Return the makespan no dispatch order can beat.
+
+    Args:
+        plan: The compiled plan.
+        durations: The node durations in seconds, by plan index.
+        concurrency: The number of nodes run at once.
+
+    Returns:
+        The larger of the longest path and the total work per slot.
+
+    """
+    finish = list(durations)
+    for level in plan.levels:
+        for source in level:
+            for target in plan.successors(source):
+                finish[target] = max(finish[target], finish[source] + durations[target])
+
+    return max(*finish, sum(durations) / concurrency)
+
+
+def main() -> None:
+    """Print FIFO and critical-path makespans for a set of synthetic graphs."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    shapes: dict[str, Callable[[random.Random], Graph]] = {
+        "spine 40 x 120": lambda rng: spine(rng=rng, depth=40, branches=120),
+        "spine 100 x 400": lambda rng: spine(rng=rng, depth=100, branches=400),
+        "chains 32 x 20": lambda rng: chains(rng=rng, width=32, depth=20),
+        "chains 128 x 50": lambda rng: chains(rng=rng, width=128, depth=50),
+    }
+    rng = random.Random(args.seed)  # noqa: S311
+    print(  # noqa: T201
+        f"{'graph':<18}{'nodes':>8}{'bound s':>10}{'fifo s':>10}"
+        f"{'critical s':>12}{'gain':>8}"
+    )
+    for name, shape in shapes.items():
+        bound = fifo = critical = 0.0
+        for _ in range(args.runs):
+            plan, durations = shape(rng)
+            bound += lower_bound(
+                plan=plan, durations=durations, concurrency=args.concurrency
+            )
+            fifo += simulate(
+                plan=plan,
+                durations=durations,
+                concurrency=args.concurrency,
+                key=lambda _, sequence: (sequence,),
+            )
+            critical += simulate(
+                plan=plan,
+                durations=durations,
+                concurrency=args.concurrency,
+                key=lambda i, _, plan=plan: (-plan.ranks[i], i),
+            )
+        print(  # noqa: T201
+            f"{name:<18}{len(plan.nodes):>8}{bound / args.runs:>10.1f}"
+            f"{fifo / args.runs:>10.1f}"
+            f"{critical / args.runs:>12.1f}{1 - critical / fifo:>8.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,12 @@
 
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Query, WebSocketException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from dependencies import db
+from exceptions import AuthCredentialsError
 from schemas import UserResponse
 from usecases import AuthUsecase
 
@@ -35,6 +36,36 @@ async def get_current_user(
     )
 
 
+async def get_websocket_user(
+    token: Annotated[str, Query(description="Access token")],
+    session: Annotated[AsyncSession, Depends(dependency=db.get_session)],
+) -> UserResponse:
+    """Get the user of a WebSocket connection.
+
+    Browsers cannot set headers on WebSocket handshakes, so the access token
+    is passed as a query parameter instead.
+
+    Dependencies:
+        token: The access token.
+        session: The session.
+
+    Returns:
+        The user.
+
+    Raises:
+        WebSocketException: If the token is invalid.
+
+    """
+    try:
+        return UserResponse.model_validate(
+            await AuthUsecase().get_current_user(token=token, session=session)
+        )
+    except AuthCredentialsError as e:
+        raise WebSocketException(
+            code=status.WS_1008_POLICY_VIOLATION, reason=e.message
+        ) from e
+
+
 def get_auth_usecase() -> AuthUsecase:
     """Get the user auth usecase.
 
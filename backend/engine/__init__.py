@@ -0,0 +1,20 @@
+"""Workflow execution engine."""
+
+from engine.executor import ExecutionExecutor, execution_executor
+from engine.prefect import PrefectExecutor, prefect_executor
+from engine.queue import StreamExecutor, execution_stream
+from engine.runner import ExecutionEngine, execution_engine
+from engine.supervisor import ExecutionSupervisor, execution_supervisor
+
+__all__ = [
+    "ExecutionEngine",
+    "ExecutionExecutor",
+    "ExecutionSupervisor",
+    "PrefectExecutor",
+    "StreamExecutor",
+    "execution_engine",
+    "execution_executor",
+    "execution_stream",
+    "execution_supervisor",
+    "prefect_executor",
+]
@@ -0,0 +1,102 @@
+"""Static analysis of compiled execution plans."""
+
+from array import array
+from dataclasses import dataclass
+
+from engine.plan import ExecutionPlan
+
+
+@dataclass(frozen=True, slots=True)
+class NodeEstimate:
+    """Expected cost of one node run, averaged over its past runs."""
+
+    duration_ms: float
+    prompt_tokens: float
+    completion_tokens: float
+
+
+@dataclass(frozen=True, slots=True)
+class PlanAnalysis:
+    """Shape and expected cost of one execution of a workflow graph.
+
+    Levels and the critical path hold node IDs. The critical path is the
+    chain of nodes with the longest estimated duration, which bounds the
+    execution latency however many nodes run in parallel.
+    """
+
+    workflow_id: int
+    version: int
+    levels: list[list[int]]
+    width: int
+    critical_path: list[int]
+    estimated_duration_ms: float
+    estimated_prompt_tokens: float
+    estimated_completion_tokens: float
+    unestimated_node_ids: list[int]
+
+
+def analyze_plan(
+    plan: ExecutionPlan, estimates: dict[int, NodeEstimate]
+) -> PlanAnalysis:
+    """Analyze a compiled plan against per-node cost estimates.
+
+    The longest path is found in one pass over the plan levels, which are
+    already in topological order, reading predecessors from the CSR arrays.
+    Nodes without an estimate count as free.
+
+    Args:
+        plan: The compiled plan.
+        estimates: The estimates keyed by node ID.
+
+    Returns:
+        The analysis.
+
+    """
+    size = len(plan.nodes)
+    node_ids = plan.node_ids
+    durations = array(
+        "d",
+        (
+            estimate.duration_ms if (estimate := estimates.get(node_id)) else 0.0
+            for node_id in node_ids
+        ),
+    )
+    finish = array("d", [0.0]) * size
+    parent = array("i", [-1]) * size
+    offsets, sources = plan.predecessor_offsets, plan.predecessor_sources
+
+    # Ties go to the node ordered last, so free sinks stay on the path.
+    end = -1
+    for level in plan.levels:
+        for node_index in level:
+            start, best = 0.0, -1
+            for source in sources[offsets[node_index] : offsets[node_index + 1]]:
+                if finish[source] > start or best < 0:
+                    start, best = finish[source], source
+            finish[node_index] = start + durations[node_index]
+            parent[node_index] = best
+            if end < 0 or finish[node_index] >= finish[end]:
+                end = node_index
+
+    critical_path = []
+    while end >= 0:
+        critical_path.append(node_ids[end])
+        end = parent[end]
+    critical_path.reverse()
+
+    known = [estimates[node_id] for node_id in node_ids if node_id in estimates]
+    return PlanAnalysis(
+        workflow_id=plan.workflow_id,
+        version=plan.version,
+        levels=[[node_ids[i] for i in level] for level in plan.levels],
+        width=max((len(level) for level in plan.levels), default=0),
+        critical_path=critical_path,
+        estimated_duration_ms=max(finish, default=0.0),
+        estimated_prompt_tokens=sum(estimate.prompt_tokens for estimate in known),
+        estimated_completion_tokens=sum(
+            estimate.completion_tokens for estimate in known
+        ),
+        unestimated_node_ids=[
+            node_id for node_id in node_ids if node_id not in estimates
+        ],
+    )
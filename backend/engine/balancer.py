@@ -0,0 +1,147 @@
+"""Least-outstanding-requests load balancing across LLM provider hosts."""
+
+import contextlib
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from http import HTTPStatus
+
+import httpx
+
+from settings import engine_settings
+
+
+@dataclass(slots=True)
+class _Host:
+    """Load and health of one provider host, as seen by this process."""
+
+    in_flight: int = 0
+    latency: float | None = None
+    failures: int = 0
+    ejected_until: float = 0.0
+
+
+def _is_host_failure(error: BaseException) -> bool:
+    """Tell whether a failed request points at its host rather than itself.
+
+    Connection errors, timeouts and 5xx responses count against the host,
+    whether raised as is or as the cause of a node error. Errors the model
+    or the node configuration caused, such as an unknown model, do not.
+
+    Args:
+        error: The error the request raised.
+
+    Returns:
+        True if the error counts towards ejecting the host.
+
+    """
+    cause = error if isinstance(error, httpx.HTTPError) else error.__cause__
+    if isinstance(cause, httpx.HTTPStatusError):
+        return cause.response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+
+    return isinstance(cause, httpx.TransportError)
+
+
+class ProviderBalancer:
+    """Spread LLM requests over the hosts of a provider group.
+
+    Each request goes to the host with the lowest expected wait, its
+    in-flight requests plus one times its average latency, which decays
+    towards recent requests. Hosts without a latency yet are assumed as fast
+    as the average known one, so new hosts get traffic at once. A host
+    failing several requests in a row is ejected for a while; once back, one
+    more failure ejects it again until a request succeeds. Only connection
+    errors, timeouts and 5xx responses count as failures. When every host is
+    ejected, they are all considered, so the group degrades instead of
+    failing outright.
+
+    The state is per process: each worker balances its own requests.
+    """
+
+    def __init__(self, eject_failures: int, eject_seconds: float, decay: float) -> None:
+        """Initialize the balancer.
+
+        Args:
+            eject_failures: The consecutive failures ejecting a host.
+            eject_seconds: The seconds an ejected host gets no requests.
+            decay: The weight of the latest request in the average latency.
+
+        """
+        self._eject_failures = eject_failures
+        self._eject_seconds = eject_seconds
+        self._decay = decay
+        self._hosts: dict[str, _Host] = {}
+
+    def pick(self, base_urls: list[str]) -> str:
+        """Choose the host for the next request of a group.
+
+        Args:
+            base_urls: The base URLs of the group hosts.
+
+        Returns:
+            The base URL of the chosen host.
+
+        """
+        now = time.monotonic()
+        hosts = {
+            base_url: self._hosts.setdefault(base_url.rstrip("/"), _Host())
+            for base_url in base_urls
+        }
+        healthy = {
+            base_url: host
+            for base_url, host in hosts.items()
+            if host.ejected_until <= now
+        } or hosts
+
+        known = [host.latency for host in healthy.values() if host.latency is not None]
+        default = sum(known) / len(known) if known else 1.0
+
+        return min(
+            healthy,
+            key=lambda base_url: (
+                (healthy[base_url].in_flight + 1)
+                * (healthy[base_url].latency or default),
+                healthy[base_url].in_flight,
+            ),
+        )
+
+    @contextlib.contextmanager
+    def track(self, base_url: str) -> Iterator[None]:
+        """Count a request as in flight to a host and record its outcome.
+
+        Args:
+            base_url: The base URL of the host.
+
+        Yields:
+            None, while the request runs.
+
+        """
+        host = self._hosts.setdefault(base_url.rstrip("/"), _Host())
+        host.in_flight += 1
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            if _is_host_failure(error=e):
+                host.failures += 1
+                if host.failures >= self._eject_failures:
+                    host.ejected_until = time.monotonic() + self._eject_seconds
+            raise
+        else:
+            latency = time.monotonic() - started
+            host.latency = (
+                latency
+                if host.latency is None
+                else self._decay * latency + (1 - self._decay) * host.latency
+            )
+            host.failures = 0
+            host.ejected_until = 0.0
+        finally:
+            host.in_flight -= 1
+
+
+provider_balancer = ProviderBalancer(
+    eject_failures=engine_settings.provider_eject_failures,
+    eject_seconds=engine_settings.provider_eject_seconds,
+    decay=engine_settings.provider_latency_decay,
+)
@@ -0,0 +1,71 @@
+"""Cross-process execution cancellation signals over Redis pub/sub."""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+
+import redis.asyncio as redis
+
+from utils.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionCancellations:
+    """Broadcast cancel requests to whichever process runs the execution.
+
+    Executions may run in any API worker or on the Prefect work pool, so a
+    cancel request is published to every process and the one holding the
+    execution acts on it.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        channel: str = "execution-cancel",
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        """Initialize the cancellation channel.
+
+        Args:
+            client: The Redis client.
+            channel: The pub/sub channel name.
+            reconnect_delay: The seconds to wait before resubscribing.
+
+        """
+        self._client = client
+        self._channel = channel
+        self._reconnect_delay = reconnect_delay
+
+    async def publish(self, execution_id: int) -> None:
+        """Ask the process running an execution to cancel it.
+
+        Args:
+            execution_id: The execution ID.
+
+        """
+        try:
+            await self._client.publish(self._channel, str(execution_id))
+        except redis.RedisError:
+            logger.exception("Cancel signal for execution %s was lost", execution_id)
+
+    async def listen(self) -> AsyncIterator[int]:
+        """Follow cancel requests, resubscribing after Redis errors.
+
+        Yields:
+            The IDs of executions to cancel.
+
+        """
+        while True:
+            try:
+                async with self._client.pubsub() as pubsub:
+                    await pubsub.subscribe(self._channel)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            yield int(message["data"])
+            except redis.RedisError:
+                logger.warning("Cancel channel lost, resubscribing")
+                await asyncio.sleep(self._reconnect_delay)
+
+
+execution_cancellations = ExecutionCancellations(client=redis_client)
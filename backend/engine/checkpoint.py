@@ -0,0 +1,110 @@
+"""Per-execution checkpoints of completed node outputs."""
+
+import json
+from typing import TYPE_CHECKING, Any, cast
+
+import redis.asyncio as redis
+
+from settings import engine_settings
+from utils.hashing import canonical_json
+from utils.redis import redis_client
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable
+
+
+class ExecutionCheckpoints:
+    """Redis hashes holding the outputs of the nodes an execution completed.
+
+    Checkpoints are keyed by the graph version they were taken against, so an
+    execution resumed after its workflow was edited starts over.
+    """
+
+    def __init__(
+        self, client: redis.Redis, ttl: int, prefix: str = "execution-checkpoint"
+    ) -> None:
+        """Initialize the checkpoints.
+
+        Args:
+            client: The Redis client.
+            ttl: The checkpoint time to live in seconds, refreshed on every save.
+            prefix: The key prefix.
+
+        """
+        self._client = client
+        self._ttl = ttl
+        self._prefix = prefix
+
+    def _key(self, execution_id: int, version: int) -> str:
+        """Return the hash key of an execution at a graph version."""
+        return f"{self._prefix}:{execution_id}:{version}"
+
+    async def save(
+        self,
+        execution_id: int,
+        version: int,
+        node_id: int,
+        output: Any,  # noqa: ANN401
+    ) -> None:
+        """Record the output of a completed node.
+
+        Saving is best effort: a Redis outage only costs the ability to resume.
+
+        Args:
+            execution_id: The execution ID.
+            version: The graph version the execution runs against.
+            node_id: The node ID.
+            output: The JSON-compatible node output.
+
+        """
+        key = self._key(execution_id=execution_id, version=version)
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                pipe.hset(key, str(node_id), canonical_json(output).decode())
+                pipe.expire(key, self._ttl)
+                await pipe.execute()
+        except redis.RedisError:
+            return
+
+    async def load(self, execution_id: int, version: int) -> dict[int, Any]:
+        """Read the outputs of the nodes an execution completed.
+
+        Args:
+            execution_id: The execution ID.
+            version: The graph version the execution runs against.
+
+        Returns:
+            The node outputs keyed by node ID, empty if none were kept.
+
+        """
+        try:
+            outputs = await cast(
+                "Awaitable[dict[str, str]]",
+                self._client.hgetall(
+                    self._key(execution_id=execution_id, version=version)
+                ),
+            )
+        except redis.RedisError:
+            return {}
+
+        return {int(node_id): json.loads(raw) for node_id, raw in outputs.items()}
+
+    async def clear(self, execution_id: int, version: int) -> None:
+        """Drop the checkpoint of a finished execution.
+
+        Args:
+            execution_id: The execution ID.
+            version: The graph version the execution ran against.
+
+        """
+        try:
+            await self._client.delete(
+                self._key(execution_id=execution_id, version=version)
+            )
+        except redis.RedisError:
+            return
+
+
+execution_checkpoints = ExecutionCheckpoints(
+    client=redis_client, ttl=engine_settings.checkpoint_ttl
+)
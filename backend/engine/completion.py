@@ -0,0 +1,109 @@
+"""Exact-match cache of LLM completions."""
+
+import json
+import time
+from typing import Any
+
+import redis.asyncio as redis
+
+from settings import engine_settings
+from utils.hashing import canonical_json
+from utils.redis import redis_client
+
+
+class CompletionCache:
+    """Redis-backed store of LLM completions keyed by their request digest.
+
+    Unlike memoized node outputs, entries are shared by every node, workflow
+    and user sending the same request to the same model. Memory is bounded
+    by the number and size of entries: a sorted set orders entries by last
+    use, and the least recently used ones are evicted past the maximum,
+    without relying on the server-wide eviction policy that would also hit
+    leases and event streams.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        ttl: int,
+        max_entries: int,
+        max_size: int,
+        prefix: str = "llm-completion",
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            client: The Redis client.
+            ttl: The entry time to live in seconds.
+            max_entries: The number of entries kept.
+            max_size: The largest entry cached, in bytes.
+            prefix: The key prefix.
+
+        """
+        self._client = client
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_size = max_size
+        self._prefix = prefix
+        self._index = f"{prefix}:index"
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        """Look up a cached completion and mark it as recently used.
+
+        Redis errors are treated as misses so that a cache outage never
+        fails an execution.
+
+        Args:
+            key: The request digest.
+
+        Returns:
+            The cached completion, or None on a miss.
+
+        """
+        entry = f"{self._prefix}:{key}"
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                pipe.get(entry)
+                pipe.zadd(self._index, {entry: time.time()}, xx=True)
+                raw, _ = await pipe.execute()
+        except redis.RedisError:
+            return None
+
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: dict[str, Any]) -> None:
+        """Cache a completion, evicting the least recently used ones if full.
+
+        Args:
+            key: The request digest.
+            value: The JSON-compatible completion.
+
+        """
+        raw = canonical_json(value)
+        if len(raw) > self._max_size:
+            return
+
+        entry = f"{self._prefix}:{key}"
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                pipe.set(entry, raw, ex=self._ttl)
+                pipe.zadd(self._index, {entry: time.time()})
+                pipe.zcard(self._index)
+                *_, size = await pipe.execute()
+
+            if size > self._max_entries:
+                evicted = await self._client.zpopmin(
+                    self._index, size - self._max_entries
+                )
+                if evicted:
+                    await self._client.delete(*(member for member, _ in evicted))
+        except redis.RedisError:
+            return
+
+
+completion_cache = CompletionCache(
+    client=redis_client,
+    ttl=engine_settings.completion_cache_ttl,
+    max_entries=engine_settings.completion_cache_max_entries,
+    max_size=engine_settings.completion_cache_max_size,
+)
@@ -0,0 +1,109 @@
+"""Micro-batching of concurrent embedding requests to Ollama."""
+
+import asyncio
+import contextlib
+from dataclasses import dataclass, field
+
+from settings import ollama_settings
+from utils.ollama import OllamaClients, embed, ollama_clients
+
+
+@dataclass(slots=True)
+class _Batch:
+    """Texts waiting to be embedded in one request, by position in it."""
+
+    positions: dict[str, int] = field(default_factory=dict)
+    full: asyncio.Event = field(default_factory=asyncio.Event)
+    task: "asyncio.Task[list[list[float]]]" = field(init=False)
+
+
+class EmbeddingBatcher:
+    """Gather concurrent embed calls into one `/api/embed` request per model.
+
+    The first call for a base URL and model opens a batch; calls arriving
+    within the window join it, and the batch is sent when the window closes
+    or it fills up. Identical texts in a batch are embedded once. A failed
+    request fails every call in its batch.
+    """
+
+    def __init__(self, clients: OllamaClients, window: float, max_size: int) -> None:
+        """Initialize the batcher.
+
+        Args:
+            clients: The pooled Ollama clients.
+            window: The seconds a batch waits for more texts.
+            max_size: The number of distinct texts sent in one request.
+
+        """
+        self._clients = clients
+        self._window = window
+        self._max_size = max_size
+        self._batches: dict[tuple[str, str], _Batch] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def embed(self, base_url: str, model: str, text: str) -> list[float]:
+        """Embed a text as part of the next batch for its model.
+
+        Args:
+            base_url: The Ollama base URL.
+            model: The embedding model name.
+            text: The text to embed.
+
+        Returns:
+            The embedding.
+
+        Raises:
+            httpx.HTTPError: If the batch request fails.
+
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._batches = {}
+
+        key = (base_url.rstrip("/"), model)
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = _Batch()
+            batch.task = asyncio.create_task(self._send(key=key, batch=batch))
+            self._batches[key] = batch
+
+        position = batch.positions.setdefault(text, len(batch.positions))
+        if len(batch.positions) >= self._max_size:
+            batch.full.set()
+            del self._batches[key]
+
+        embeddings = await asyncio.shield(batch.task)
+
+        return embeddings[position]
+
+    async def _send(self, key: tuple[str, str], batch: _Batch) -> list[list[float]]:
+        """Wait for the batch to fill or its window to close, then embed it.
+
+        Args:
+            key: The base URL and model of the batch.
+            batch: The batch.
+
+        Returns:
+            One embedding per distinct text, by position.
+
+        """
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(batch.full.wait(), timeout=self._window)
+        if self._batches.get(key) is batch:
+            del self._batches[key]
+
+        base_url, model = key
+        return await embed(
+            client=self._clients.get(base_url=base_url),
+            base_url=base_url,
+            model=model,
+            texts=list(batch.positions),
+        )
+
+
+embedding_batcher = EmbeddingBatcher(
+    clients=ollama_clients,
+    window=ollama_settings.embed_batch_window,
+    max_size=ollama_settings.embed_batch_max_size,
+)
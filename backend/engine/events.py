@@ -0,0 +1,154 @@
+"""Per-execution progress events shared across workers through Redis Streams."""
+
+import json
+import logging
+from collections.abc import AsyncIterator
+from typing import Any
+
+import redis.asyncio as redis
+
+from enums import ExecutionEventType
+from settings import engine_settings
+from utils.hashing import canonical_json
+from utils.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionEvents:
+    """Append-only event log per execution.
+
+    Every execution gets its own stream, so a subscriber on any worker can
+    replay what it missed and then block for new entries.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        ttl: int,
+        max_length: int,
+        prefix: str = "execution-events",
+    ) -> None:
+        """Initialize the event log.
+
+        Args:
+            client: The Redis client.
+            ttl: The stream time to live in seconds, refreshed on every event.
+            max_length: The approximate maximum number of events kept.
+            prefix: The key prefix.
+
+        """
+        self._client = client
+        self._ttl = ttl
+        self._max_length = max_length
+        self._prefix = prefix
+
+    def _key(self, execution_id: int) -> str:
+        """Return the stream key of an execution."""
+        return f"{self._prefix}:{execution_id}"
+
+    async def publish(
+        self,
+        execution_id: int,
+        event_type: ExecutionEventType,
+        node_id: int | None = None,
+        data: dict[str, Any] | None = None,
+    ) -> None:
+        """Append an event to the execution stream.
+
+        Publishing is best effort: a Redis outage must not fail the execution.
+
+        Args:
+            execution_id: The execution ID.
+            event_type: The event type.
+            node_id: The node the event refers to, if any.
+            data: The event payload.
+
+        """
+        key = self._key(execution_id=execution_id)
+        event = {"type": event_type, "node_id": node_id, "data": data or {}}
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                pipe.xadd(
+                    key,
+                    {"event": canonical_json(event)},
+                    maxlen=self._max_length,
+                    approximate=True,
+                )
+                pipe.expire(key, self._ttl)
+                await pipe.execute()
+        except redis.RedisError:
+            return
+
+    async def exists(self, execution_id: int) -> bool:
+        """Return whether the event stream of an execution is still kept.
+
+        Redis errors count as an expired stream, so the outcome of a finished
+        execution is replayed from the database instead.
+
+        Args:
+            execution_id: The execution ID.
+
+        Returns:
+            True if the stream exists.
+
+        """
+        try:
+            return bool(await self._client.exists(self._key(execution_id=execution_id)))
+        except redis.RedisError:
+            return False
+
+    async def read(
+        self, execution_id: int, last_event_id: str = "0", block: int = 15
+    ) -> AsyncIterator[tuple[str, dict[str, Any]] | None]:
+        """Replay and follow the events of an execution.
+
+        Iteration stops after the execution-finished event. A Redis error
+        ends it with a stream-error event carrying the ID of the last event
+        read, so clients can reconnect from there.
+
+        Args:
+            execution_id: The execution ID.
+            last_event_id: The ID of the last event already seen.
+            block: The seconds to wait for new events before yielding None.
+
+        Yields:
+            Event ID and event pairs, or None when no event arrived in time.
+
+        """
+        key = self._key(execution_id=execution_id)
+        while True:
+            try:
+                response = await self._client.xread(
+                    {key: last_event_id}, block=block * 1000, count=100
+                )
+            except redis.RedisError:
+                logger.warning("Events of execution %s were cut off", execution_id)
+                yield (
+                    last_event_id,
+                    {
+                        "type": ExecutionEventType.STREAM_ERROR,
+                        "node_id": None,
+                        "data": {"error": "Execution events are unavailable"},
+                    },
+                )
+                return
+
+            if not response:
+                yield None
+                continue
+
+            for event_id, fields in response[0][1]:
+                last_event_id = event_id
+                event = json.loads(fields["event"])
+                yield event_id, event
+
+                if event["type"] == ExecutionEventType.EXECUTION_FINISHED:
+                    return
+
+
+execution_events = ExecutionEvents(
+    client=redis_client,
+    ttl=engine_settings.events_ttl,
+    max_length=engine_settings.events_max_length,
+)
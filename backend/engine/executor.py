@@ -0,0 +1,307 @@
+"""Bounded worker pool with admission control for execution runs."""
+
+import asyncio
+import logging
+from collections import Counter, defaultdict
+from collections.abc import Awaitable, Callable
+from functools import partial
+
+import redis.asyncio as redis
+
+from engine.fair import FairQueue
+from engine.lease import ExecutionLeases, execution_leases
+from engine.runner import ExecutionEngine, execution_engine
+from engine.slots import ExecutionSlots, execution_slots
+from enums import ExecutionPriority
+from exceptions import ExecutionQueueFullError, ExecutionRateLimitError
+from settings import executor_settings
+from settings.executor import ExecutorSettings
+
+logger = logging.getLogger(__name__)
+
+type Job = Callable[[], Awaitable[None]]
+
+
+class ExecutionExecutor:
+    """Run executions on a fixed number of workers fed by a bounded queue.
+
+    Callers reserve a slot before creating the execution row, so saturated
+    workers reject new work up front instead of piling up coroutines. The
+    queue depth bounds the memory of this process; the user and global
+    limits are Redis slots shared by all processes, and fall back to counts
+    per process while Redis is unavailable. A batch is charged one slot per
+    execution it runs at once. Queued jobs are handed to
+    workers in weighted fair order across priority classes and users.
+    Queued executions stay leased, so the supervisor of another worker runs
+    them if this one dies before they start.
+    """
+
+    def __init__(
+        self,
+        engine: ExecutionEngine,
+        settings: ExecutorSettings,
+        leases: ExecutionLeases,
+        slots: ExecutionSlots,
+    ) -> None:
+        """Initialize the executor.
+
+        Args:
+            engine: The engine running the executions.
+            settings: The worker count, queue and user limits and class weights.
+            leases: The execution leases.
+            slots: The admission slots shared by all processes.
+
+        """
+        self._engine = engine
+        self._leases = leases
+        self._slots = slots
+        self._heartbeat = settings.execution_heartbeat
+        self._workers = settings.workers
+        self._queue_size = settings.queue_size
+        self._user_limit = settings.user_limit
+        self._global_limit = settings.global_limit
+        self._retry_after = settings.retry_after
+        self._weights = {
+            ExecutionPriority.INTERACTIVE: settings.interactive_weight,
+            ExecutionPriority.BATCH: settings.batch_weight,
+        }
+        self._queue: FairQueue[tuple[Job, int, list[int], int, list[str]]] = FairQueue(
+            weights=self._weights
+        )
+        self._queued: set[int] = set()
+        self._waiting = 0
+        self._user_load: Counter[int] = Counter()
+        self._reserved: defaultdict[int, list[tuple[int, list[str]]]] = defaultdict(
+            list
+        )
+        self._held: dict[str, int] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def reserve(self, user_id: int, slots: int = 1) -> None:
+        """Reserve a queue entry and slots for a user.
+
+        Args:
+            user_id: The user ID.
+            slots: The slots to reserve, one per execution run at once.
+
+        Raises:
+            ExecutionRateLimitError: If the user is at their limit.
+            ExecutionQueueFullError: If the queue or the cluster is full.
+
+        """
+        if self._waiting >= self._queue_size:
+            raise ExecutionQueueFullError(retry_after=self._retry_after)
+
+        try:
+            tokens = await self._slots.acquire(
+                user_id=user_id,
+                user_limit=self._user_limit,
+                global_limit=self._global_limit,
+                count=slots,
+            )
+        except redis.RedisError:
+            logger.warning("Execution slots unavailable, limiting load per process")
+            if self._user_load[user_id] + slots > self._user_limit:
+                raise ExecutionRateLimitError(retry_after=self._retry_after) from None
+            if self._user_load.total() + slots > self._global_limit:
+                raise ExecutionQueueFullError(retry_after=self._retry_after) from None
+            tokens = []
+
+        self._reserved[user_id].append((slots, tokens))
+        self._held.update(dict.fromkeys(tokens, user_id))
+        self._waiting += 1
+        self._user_load[user_id] += slots
+
+    async def release(self, user_id: int, slots: int = 1) -> None:
+        """Give back a reservation that will not be submitted.
+
+        Args:
+            user_id: The user ID.
+            slots: The slots reserved.
+
+        """
+        self._waiting -= 1
+        self._unload(user_id=user_id, slots=slots)
+        await self._release_slots(tokens=self._take_slots(user_id=user_id, slots=slots))
+
+    async def submit(
+        self,
+        execution_id: int,
+        user_id: int,
+        priority: ExecutionPriority = ExecutionPriority.INTERACTIVE,
+    ) -> None:
+        """Queue an execution into a previously reserved single slot.
+
+        Args:
+            execution_id: The execution ID.
+            user_id: The user ID the slot was reserved for.
+            priority: The priority class of the execution.
+
+        """
+        self._start()
+        await self._enqueue(
+            job=partial(self._engine.run, execution_id),
+            user_id=user_id,
+            execution_ids=[execution_id],
+            priority=priority,
+            slots=1,
+        )
+
+    async def submit_batch(
+        self,
+        execution_ids: list[int],
+        user_id: int,
+        priority: ExecutionPriority = ExecutionPriority.BATCH,
+        slots: int = 1,
+    ) -> None:
+        """Queue a batch of executions into previously reserved slots.
+
+        The batch occupies a single worker, which runs its executions against
+        one shared plan.
+
+        Args:
+            execution_ids: The IDs of executions sharing one workflow.
+            user_id: The user ID the slots were reserved for.
+            priority: The priority class of the executions.
+            slots: The slots reserved for the batch.
+
+        """
+        self._start()
+        await self._enqueue(
+            job=partial(self._engine.run_batch, execution_ids),
+            user_id=user_id,
+            execution_ids=execution_ids,
+            priority=priority,
+            slots=slots,
+        )
+
+    async def _enqueue(
+        self,
+        job: Job,
+        user_id: int,
+        execution_ids: list[int],
+        priority: ExecutionPriority,
+        slots: int,
+    ) -> None:
+        """Lease the executions of a job and queue it.
+
+        Args:
+            job: The job running the executions.
+            user_id: The user ID the slots were reserved for.
+            execution_ids: The IDs of the executions the job runs.
+            priority: The priority class of the executions.
+            slots: The slots reserved for the job.
+
+        """
+        self._queued.update(execution_ids)
+        await self._renew_leases(execution_ids=execution_ids)
+        tokens = self._take_slots(user_id=user_id, slots=slots)
+        self._queue.put_nowait(
+            (job, user_id, execution_ids, slots, tokens),
+            priority=priority,
+            user_id=user_id,
+        )
+
+    def _start(self) -> None:
+        """Start the workers on the running event loop if not already there."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+
+        self._loop = loop
+        self._queue = FairQueue(weights=self._weights)
+        self._queued = set()
+        self._held = {
+            token: user_id
+            for user_id, reservations in self._reserved.items()
+            for _, tokens in reservations
+            for token in tokens
+        }
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self._workers)]
+        self._tasks.append(asyncio.create_task(self._keep_leased()))
+
+    def _unload(self, user_id: int, slots: int) -> None:
+        """Decrement the load of a user."""
+        self._user_load[user_id] -= slots
+        if self._user_load[user_id] <= 0:
+            del self._user_load[user_id]
+
+    def _take_slots(self, user_id: int, slots: int) -> list[str]:
+        """Take the tokens of a reservation of a user, empty if Redis was down."""
+        reservations = self._reserved[user_id]
+        index = next(
+            (i for i, (count, _) in enumerate(reservations) if count == slots), -1
+        )
+        _, tokens = reservations.pop(index)
+        if not reservations:
+            del self._reserved[user_id]
+        return tokens
+
+    async def _release_slots(self, tokens: list[str]) -> None:
+        """Give back Redis slots, leaving them to expire if Redis is unavailable.
+
+        Args:
+            tokens: The tokens of the slots, empty if Redis granted none.
+
+        """
+        if not tokens:
+            return
+
+        user_id = self._held[tokens[0]]
+        for token in tokens:
+            del self._held[token]
+        try:
+            await self._slots.release(tokens=tokens, user_id=user_id)
+        except redis.RedisError:
+            logger.warning("Execution slots of user %s were not released", user_id)
+
+    async def _renew_leases(self, execution_ids: list[int]) -> None:
+        """Renew the leases of queued executions, logging instead of failing.
+
+        Args:
+            execution_ids: The execution IDs.
+
+        """
+        if not execution_ids:
+            return
+
+        try:
+            await self._leases.renew(execution_ids=execution_ids)
+        except redis.RedisError:
+            logger.warning("Leases of executions %s were not renewed", execution_ids)
+
+    async def _keep_leased(self) -> None:
+        """Renew queued execution leases and held slots periodically, forever."""
+        while True:
+            await asyncio.sleep(self._heartbeat)
+            await self._renew_leases(execution_ids=list(self._queued))
+            try:
+                await self._slots.renew(slots=dict(self._held))
+            except redis.RedisError:
+                logger.warning("Execution slots were not renewed")
+
+    async def _work(self) -> None:
+        """Run queued jobs one at a time, forever.
+
+        Dequeued executions are leased by the engine while they run.
+        """
+        while True:
+            job, user_id, execution_ids, slots, tokens = await self._queue.get()
+            self._waiting -= 1
+            self._queued.difference_update(execution_ids)
+            try:
+                await job()
+            except Exception:
+                logger.exception("Execution job %s crashed", job)
+            finally:
+                self._unload(user_id=user_id, slots=slots)
+                await self._release_slots(tokens=tokens)
+
+
+execution_executor = ExecutionExecutor(
+    engine=execution_engine,
+    settings=executor_settings,
+    leases=execution_leases,
+    slots=execution_slots,
+)
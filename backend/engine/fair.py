@@ -0,0 +1,130 @@
+"""Weighted fair queuing of jobs across priority classes and users."""
+
+import asyncio
+from collections import OrderedDict, deque
+from collections.abc import Iterable
+
+from enums import ExecutionPriority
+
+
+class StrideScheduler:
+    """Share turns between priority classes in proportion to their weights.
+
+    Every class holds a pass value; the waiting class with the lowest pass is
+    served and its pass advances by the inverse of its weight. A class that
+    was idle resumes at the current pass, so it cannot bank turns.
+    """
+
+    def __init__(self, weights: dict[ExecutionPriority, int]) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            weights: The relative share of turns of each priority class.
+
+        """
+        self._weights = weights
+        self._passes = dict.fromkeys(weights, 0.0)
+        self._pass = 0.0
+
+    def order(self, priorities: Iterable[ExecutionPriority]) -> list[ExecutionPriority]:
+        """Sort priority classes by the order their next turns come in.
+
+        Args:
+            priorities: The priority classes with waiting jobs.
+
+        Returns:
+            The priority classes, the one to serve first first.
+
+        """
+        return sorted(
+            priorities,
+            key=lambda priority: (self._passes[priority], -self._weights[priority]),
+        )
+
+    def serve(self, priority: ExecutionPriority) -> None:
+        """Charge a priority class for a turn.
+
+        Args:
+            priority: The priority class served.
+
+        """
+        self._pass = self._passes[priority]
+        self._passes[priority] += 1 / self._weights[priority]
+
+    def resume(self, priority: ExecutionPriority) -> None:
+        """Move an idle priority class up to the current pass.
+
+        Args:
+            priority: The priority class found without waiting jobs.
+
+        """
+        self._passes[priority] = max(self._passes[priority], self._pass)
+
+
+class FairQueue[T]:
+    """Queue sharing its consumers between priority classes and users.
+
+    Classes get turns in proportion to their weights through stride
+    scheduling. Within a class, users with queued jobs are served round
+    robin, so a user queueing thousands of jobs waits behind them alone.
+    """
+
+    def __init__(self, weights: dict[ExecutionPriority, int]) -> None:
+        """Initialize an empty queue.
+
+        Args:
+            weights: The relative share of turns of each priority class.
+
+        """
+        self._scheduler = StrideScheduler(weights=weights)
+        self._users: dict[ExecutionPriority, OrderedDict[int, deque[T]]] = {
+            priority: OrderedDict() for priority in weights
+        }
+        self._size = 0
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        """Return the number of queued jobs."""
+        return self._size
+
+    def put_nowait(self, item: T, priority: ExecutionPriority, user_id: int) -> None:
+        """Queue a job.
+
+        Args:
+            item: The job.
+            priority: The priority class of the job.
+            user_id: The user the job belongs to.
+
+        """
+        users = self._users[priority]
+        if not users:
+            self._scheduler.resume(priority=priority)
+
+        users.setdefault(user_id, deque()).append(item)
+        self._size += 1
+        self._ready.set()
+
+    async def get(self) -> T:
+        """Wait for and remove the next job in fair order.
+
+        Returns:
+            The job.
+
+        """
+        while not self._size:
+            self._ready.clear()
+            await self._ready.wait()
+
+        priority = self._scheduler.order(
+            priority for priority, users in self._users.items() if users
+        )[0]
+        self._scheduler.serve(priority=priority)
+
+        users = self._users[priority]
+        user_id, jobs = users.popitem(last=False)
+        item = jobs.popleft()
+        if jobs:
+            users[user_id] = jobs
+        self._size -= 1
+
+        return item
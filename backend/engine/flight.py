@@ -0,0 +1,142 @@
+"""Cross-process single-flight of identical executions."""
+
+import logging
+
+import redis.asyncio as redis
+
+from settings import engine_settings
+from utils.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Follow the leader of a key, or open its flight as the leader.
+_JOIN = """
+local leader = redis.call('GET', KEYS[1])
+if leader then
+    return leader
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('SET', KEYS[2], KEYS[1], 'EX', ARGV[2])
+return false
+"""
+
+# Close the flight led by an execution.
+_LAND = """
+local flight = redis.call('GET', KEYS[1])
+redis.call('DEL', KEYS[1])
+if flight and redis.call('GET', flight) == ARGV[1] then
+    redis.call('DEL', flight)
+end
+return 0
+"""
+
+# Hand the flight led by an execution over to another one.
+_HAND_OVER = """
+local flight = redis.call('GET', KEYS[1])
+redis.call('DEL', KEYS[1])
+if not flight or redis.call('GET', flight) ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', flight, ARGV[2], 'EX', ARGV[3])
+redis.call('SET', KEYS[2], flight, 'EX', ARGV[3])
+return 1
+"""
+
+
+class ExecutionFlights:
+    """Find the running execution with the same workflow version and input.
+
+    The first execution of a key leads the flight and runs; executions
+    created with the same key while it runs are told which execution to
+    follow. Who follows whom is recorded on the execution rows, so a flight
+    lost with Redis or expired before its leader finished only stops new
+    executions from joining. Joining and landing are Lua scripts, so an
+    execution either finds the leader before it lands or opens a new flight.
+    """
+
+    def __init__(
+        self, client: redis.Redis, ttl: int, prefix: str = "execution-flight"
+    ) -> None:
+        """Initialize the flights.
+
+        Args:
+            client: The Redis client.
+            ttl: The seconds a flight stays open without landing.
+            prefix: The key prefix.
+
+        """
+        self._client = client
+        self._ttl = ttl
+        self._prefix = prefix
+        self._join = client.register_script(_JOIN)
+        self._land = client.register_script(_LAND)
+        self._hand_over = client.register_script(_HAND_OVER)
+
+    def _leader_key(self, execution_id: int) -> str:
+        """Return the key holding the flight an execution leads."""
+        return f"{self._prefix}:leader:{execution_id}"
+
+    async def join(self, key: str, execution_id: int) -> int | None:
+        """Lead or follow the flight of a key.
+
+        Redis errors make the execution lead, so an outage only costs the
+        deduplication.
+
+        Args:
+            key: The digest of the workflow version and execution input.
+            execution_id: The execution ID.
+
+        Returns:
+            The ID of the leading execution to follow, or None to lead.
+
+        """
+        flight = f"{self._prefix}:{key}"
+        try:
+            leader = await self._join(
+                keys=[flight, self._leader_key(execution_id=execution_id)],
+                args=[execution_id, self._ttl],
+            )
+        except redis.RedisError:
+            logger.warning("Execution %s runs without deduplication", execution_id)
+            return None
+
+        return int(leader) if leader is not None else None
+
+    async def land(self, execution_id: int) -> None:
+        """Close the flight led by an execution, so no new execution follows it.
+
+        Args:
+            execution_id: The leading execution ID.
+
+        """
+        try:
+            await self._land(
+                keys=[self._leader_key(execution_id=execution_id)],
+                args=[execution_id],
+            )
+        except redis.RedisError:
+            logger.warning("Flight of execution %s was left open", execution_id)
+
+    async def hand_over(self, execution_id: int, successor_id: int) -> None:
+        """Make another execution lead the flight led by an execution.
+
+        Args:
+            execution_id: The leading execution ID.
+            successor_id: The ID of the execution leading from now on.
+
+        """
+        try:
+            await self._hand_over(
+                keys=[
+                    self._leader_key(execution_id=execution_id),
+                    self._leader_key(execution_id=successor_id),
+                ],
+                args=[execution_id, successor_id, self._ttl],
+            )
+        except redis.RedisError:
+            logger.warning("Flight of execution %s was left open", execution_id)
+
+
+execution_flights = ExecutionFlights(
+    client=redis_client, ttl=engine_settings.flight_ttl
+)
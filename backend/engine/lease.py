@@ -0,0 +1,129 @@
+"""Liveness leases of running executions."""
+
+import os
+import socket
+
+import redis.asyncio as redis
+
+from settings import executor_settings
+from utils.redis import redis_client
+
+
+class ExecutionLeases:
+    """Expiring Redis keys telling which executions have a live runner.
+
+    Runners renew the leases of their executions while they run, and
+    executors those of the executions waiting in their queue. An execution
+    without a lease was left behind by a process that died, and is claimed
+    by exactly one supervisor before it is run again.
+    """
+
+    def __init__(
+        self, client: redis.Redis, ttl: int, prefix: str = "execution-lease"
+    ) -> None:
+        """Initialize the leases.
+
+        Args:
+            client: The Redis client.
+            ttl: The seconds a lease lasts without being renewed.
+            prefix: The key prefix.
+
+        """
+        self._client = client
+        self._ttl = ttl
+        self._prefix = prefix
+        self._holder = f"{socket.gethostname()}-{os.getpid()}"
+
+    @property
+    def ttl(self) -> int:
+        """Return the seconds a lease lasts without being renewed."""
+        return self._ttl
+
+    def _key(self, execution_id: int) -> str:
+        """Return the lease key of an execution."""
+        return f"{self._prefix}:{execution_id}"
+
+    async def renew(self, execution_ids: list[int]) -> None:
+        """Take or extend the leases of executions run by this process.
+
+        Args:
+            execution_ids: The execution IDs.
+
+        Raises:
+            redis.RedisError: If Redis is unavailable.
+
+        """
+        async with self._client.pipeline(transaction=False) as pipe:
+            for execution_id in execution_ids:
+                pipe.set(
+                    self._key(execution_id=execution_id), self._holder, ex=self._ttl
+                )
+            await pipe.execute()
+
+    async def claim(self, execution_id: int) -> bool:
+        """Take the lease of an execution unless someone holds it.
+
+        Args:
+            execution_id: The execution ID.
+
+        Returns:
+            True if the lease was free and is now held by this process.
+
+        Raises:
+            redis.RedisError: If Redis is unavailable.
+
+        """
+        return bool(
+            await self._client.set(
+                self._key(execution_id=execution_id),
+                self._holder,
+                ex=self._ttl,
+                nx=True,
+            )
+        )
+
+    async def held(self, execution_ids: list[int]) -> list[bool]:
+        """Return whether each execution has a live lease.
+
+        Args:
+            execution_ids: The execution IDs.
+
+        Returns:
+            One flag per execution, in the given order.
+
+        Raises:
+            redis.RedisError: If Redis is unavailable.
+
+        """
+        if not execution_ids:
+            return []
+
+        holders = await self._client.mget(
+            [self._key(execution_id=execution_id) for execution_id in execution_ids]
+        )
+        return [holder is not None for holder in holders]
+
+    async def release(self, execution_ids: list[int]) -> None:
+        """Drop the leases of executions that stopped running here.
+
+        Args:
+            execution_ids: The execution IDs.
+
+        """
+        if not execution_ids:
+            return
+
+        try:
+            await self._client.delete(
+                *(
+                    self._key(execution_id=execution_id)
+                    for execution_id in execution_ids
+                )
+            )
+        except redis.RedisError:
+            return
+
+
+execution_leases = ExecutionLeases(
+    client=redis_client, ttl=executor_settings.execution_lease
+)
@@ -0,0 +1,109 @@
+"""Content-addressed memoization of node outputs."""
+
+import json
+import time
+from typing import Any
+
+import redis.asyncio as redis
+
+from settings import engine_settings
+from utils.hashing import canonical_json
+from utils.redis import redis_client
+
+
+class NodeOutputStore:
+    """Redis-backed store of node outputs keyed by their input digest.
+
+    Memory is bounded like the completion cache's: a sorted set orders
+    entries by last use, the least recently used ones are evicted past the
+    maximum, and outputs over the maximum size are not stored.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        ttl: int,
+        max_entries: int,
+        max_size: int,
+        prefix: str = "node-output",
+    ) -> None:
+        """Initialize the store.
+
+        Args:
+            client: The Redis client.
+            ttl: The entry time to live in seconds.
+            max_entries: The number of entries kept.
+            max_size: The largest output stored, in bytes.
+            prefix: The key prefix.
+
+        """
+        self._client = client
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_size = max_size
+        self._prefix = prefix
+        self._index = f"{prefix}:index"
+
+    async def get(self, key: str) -> tuple[bool, Any]:
+        """Look up a memoized output and mark it as recently used.
+
+        Redis errors are treated as misses so that a cache outage never
+        fails an execution.
+
+        Args:
+            key: The node input digest.
+
+        Returns:
+            Whether the output was found, and the output.
+
+        """
+        entry = f"{self._prefix}:{key}"
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                pipe.get(entry)
+                pipe.zadd(self._index, {entry: time.time()}, xx=True)
+                raw, _ = await pipe.execute()
+        except redis.RedisError:
+            return False, None
+
+        if raw is None:
+            return False, None
+
+        return True, json.loads(raw)
+
+    async def set(self, key: str, value: Any) -> None:  # noqa: ANN401
+        """Memoize an output, evicting the least recently used ones if full.
+
+        Args:
+            key: The node input digest.
+            value: The JSON-compatible node output.
+
+        """
+        raw = canonical_json(value)
+        if len(raw) > self._max_size:
+            return
+
+        entry = f"{self._prefix}:{key}"
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                pipe.set(entry, raw, ex=self._ttl)
+                pipe.zadd(self._index, {entry: time.time()})
+                pipe.zcard(self._index)
+                *_, size = await pipe.execute()
+
+            if size > self._max_entries:
+                evicted = await self._client.zpopmin(
+                    self._index, size - self._max_entries
+                )
+                if evicted:
+                    await self._client.delete(*(member for member, _ in evicted))
+        except redis.RedisError:
+            return
+
+
+node_output_store = NodeOutputStore(
+    client=redis_client,
+    ttl=engine_settings.memo_ttl,
+    max_entries=engine_settings.memo_max_entries,
+    max_size=engine_settings.memo_max_size,
+)
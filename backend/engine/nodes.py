@@ -0,0 +1,572 @@
+"""Node handlers for the execution engine."""
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+import httpx
+
+from engine.balancer import provider_balancer
+from engine.completion import completion_cache
+from engine.embedding import embedding_batcher
+from engine.events import execution_events
+from engine.plan import ExecutionPlan
+from engine.semantic import SemanticScope, semantic_cache
+from enums import ExecutionEventType, LLMProviderType, NodeType
+from exceptions import NodeExecutionError
+from models import LLMProvider, Node
+from settings import chroma_settings, engine_settings, ollama_settings
+from utils.hashing import digest
+from utils.ollama import OllamaClients, stream_generate
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class NodeContext:
+    """Per-execution state shared with node handlers.
+
+    Handlers report LLM token usage in `usage`, keyed by node ID, and add
+    the IDs of nodes they answered from a cache to `cached`. The engine
+    appends one record per node run to `node_runs`. MAP nodes run the plans
+    in `subgraphs`, keyed by workflow ID, through `run_graph`. LLM nodes
+    take their HTTP client for the provider's base URL from `clients`, and
+    only share semantically cached completions with runs of the same
+    `owner_id`. Tokens are only published when `stream_tokens` is set, which
+    batch executions leave off, and go to `on_token` instead of the execution
+    stream when it is set.
+    """
+
+    input_data: Any
+    clients: OllamaClients
+    owner_id: int | None = None
+    providers: dict[int, LLMProvider] = field(default_factory=dict)
+    execution_id: int | None = None
+    stream_tokens: bool = True
+    usage: dict[int, dict[str, int | None]] = field(default_factory=dict)
+    cached: set[int] = field(default_factory=set)
+    node_runs: list[dict[str, Any]] = field(default_factory=list)
+    subgraphs: dict[int, ExecutionPlan] = field(default_factory=dict)
+    run_graph: "GraphRunner | None" = None
+    on_token: "TokenPublisher | None" = None
+
+    def get_provider(self, provider_id: int | None) -> LLMProvider | None:
+        """Resolve the provider for an LLM node.
+
+        Args:
+            provider_id: The provider ID configured on the node.
+
+        Returns:
+            The configured provider, the owner's default one, or None.
+
+        Raises:
+            NodeExecutionError: If the configured provider is not available.
+
+        """
+        if provider_id is not None:
+            provider = self.providers.get(provider_id)
+            if not provider:
+                raise NodeExecutionError(
+                    message=f"LLM provider {provider_id} not found"
+                )
+            return provider
+
+        return next(
+            (provider for provider in self.providers.values() if provider.is_default),
+            None,
+        )
+
+    def get_provider_group(self, group: str) -> list[LLMProvider]:
+        """Resolve the providers of a load-balancing group.
+
+        Args:
+            group: The group name configured on the node.
+
+        Returns:
+            The owner's providers in the group.
+
+        Raises:
+            NodeExecutionError: If the group has no providers.
+
+        """
+        providers = [
+            provider for provider in self.providers.values() if provider.group == group
+        ]
+        if not providers:
+            raise NodeExecutionError(message=f"LLM provider group {group} not found")
+
+        return providers
+
+
+@dataclass(frozen=True, slots=True)
+class ReadyNode:
+    """A node of a plan whose upstream outputs are all available."""
+
+    index: int
+    inputs: list[Any]
+    input_digests: list[str]
+    ready_at: float
+
+
+type NodeHandler = Callable[[Node, list[Any], NodeContext], Awaitable[Any]]
+type GraphRunner = Callable[[ExecutionPlan, NodeContext], Awaitable[dict[str, Any]]]
+type TokenPublisher = Callable[[str], Awaitable[None]]
+
+
+@dataclass
+class SharedRun:
+    """A node run shared by every execution awaiting the same memo key.
+
+    The handler runs once, on a context of its own. Its tokens are relayed
+    to every execution that joined, and its usage and cache hits are copied
+    to their contexts when it finishes. Executions joining midway are first
+    sent the tokens they missed, as one token.
+    """
+
+    node_id: int
+    tokens: list[str] = field(default_factory=list)
+    listeners: list[tuple[NodeContext, int]] = field(default_factory=list)
+    joining: list[tuple[NodeContext, int]] = field(default_factory=list)
+
+    def join(self, context: NodeContext, node_id: int) -> None:
+        """Relay the run to an execution.
+
+        Args:
+            context: The per-execution node context.
+            node_id: The ID of the node the run answers in that execution.
+
+        """
+        self.joining.append((context, node_id))
+
+    def run_context(self, context: NodeContext) -> NodeContext:
+        """Return the context the handler runs on.
+
+        Args:
+            context: The context of the execution starting the run.
+
+        Returns:
+            A context publishing tokens through this run.
+
+        """
+        return replace(
+            context,
+            execution_id=None,
+            usage={},
+            cached=set(),
+            node_runs=[],
+            on_token=self.publish,
+        )
+
+    async def publish(self, token: str) -> None:
+        """Relay a token to every execution of the run.
+
+        Args:
+            token: The token.
+
+        """
+        self.tokens.append(token)
+        await self._relay(token=token)
+
+    async def finish(self, context: NodeContext) -> None:
+        """Hand the usage and cache hits of the finished run to its executions.
+
+        Args:
+            context: The context the handler ran on.
+
+        """
+        await self._relay(token=None)
+        usage = context.usage.get(self.node_id)
+        for listener, node_id in self.listeners:
+            if usage is not None:
+                listener.usage[node_id] = dict(usage)
+            if self.node_id in context.cached:
+                listener.cached.add(node_id)
+
+    async def _relay(self, token: str | None) -> None:
+        """Publish a token to the listeners, and the missed ones to joiners."""
+        joining, self.joining = self.joining, []
+        publishes = []
+        if token:
+            publishes.extend(
+                _publish_token(node_id=node_id, context=listener, token=token)
+                for listener, node_id in self.listeners
+            )
+        text = "".join(self.tokens)
+        if text:
+            publishes.extend(
+                _publish_token(node_id=node_id, context=listener, token=text)
+                for listener, node_id in joining
+            )
+        self.listeners.extend(joining)
+        await asyncio.gather(*publishes)
+
+
+def reuses_completion(node: Node) -> bool:
+    """Return whether an earlier completion may answer an LLM node again.
+
+    Completions at temperature zero are reproducible. Nodes sampling at a
+    higher temperature, or at the model default, expect a fresh sample on
+    every run unless their data sets `cache`.
+
+    Args:
+        node: The LLM node.
+
+    Returns:
+        True if the node output may be served from a cache.
+
+    """
+    temperature = node.data.get("temperature")
+    return node.data.get("cache") is True or (
+        temperature is not None and float(temperature) == 0
+    )
+
+
+def render_prompt(template: str, inputs: list[Any]) -> str:
+    """Render an LLM prompt from the node template and upstream outputs.
+
+    Args:
+        template: The prompt configured on the node.
+        inputs: The upstream node outputs.
+
+    Returns:
+        The prompt with `{input}` substituted, or the upstream text appended.
+
+    """
+    text = "\n\n".join(
+        value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+        for value in inputs
+        if value is not None
+    )
+    if "{input}" in template:
+        return template.replace("{input}", text)
+
+    return "\n\n".join(part for part in (template, text) if part)
+
+
+async def run_input(node: Node, _inputs: list[Any], context: NodeContext) -> Any:  # noqa: ANN401
+    """Return the execution input, falling back to the node sample input."""
+    if context.input_data is not None:
+        return context.input_data
+
+    return node.data.get("sample_input")
+
+
+async def _stream_completion(
+    node: Node, context: NodeContext, base_url: str, request: dict[str, Any]
+) -> str:
+    """Stream a completion from Ollama, publishing tokens as they arrive.
+
+    `request` holds the model, prompt and sampling options. The first token
+    is published at once; later ones are buffered for `token_flush_interval`
+    seconds and published together, as one event.
+
+    Raises:
+        NodeExecutionError: If the request fails.
+
+    """
+    tokens = []
+    buffered: list[str] = []
+    flushed_at = float("-inf")
+    try:
+        async for chunk in stream_generate(
+            client=context.clients.get(base_url=base_url),
+            base_url=base_url,
+            **request,
+        ):
+            if chunk.get("error"):
+                raise NodeExecutionError(
+                    message=f"Node {node.id} LLM request failed: {chunk['error']}"
+                )
+
+            if chunk.get("done"):
+                context.usage[node.id] = {
+                    "prompt_tokens": chunk.get("prompt_eval_count"),
+                    "completion_tokens": chunk.get("eval_count"),
+                }
+
+            token = chunk.get("response")
+            if not token:
+                continue
+
+            tokens.append(token)
+            buffered.append(token)
+            now = time.monotonic()
+            if now - flushed_at >= engine_settings.token_flush_interval:
+                await _publish_token(
+                    node_id=node.id, context=context, token="".join(buffered)
+                )
+                buffered.clear()
+                flushed_at = now
+    except httpx.HTTPError as e:
+        raise NodeExecutionError(
+            message=f"Node {node.id} LLM request failed: {e}"
+        ) from e
+
+    if buffered:
+        await _publish_token(node_id=node.id, context=context, token="".join(buffered))
+
+    return "".join(tokens)
+
+
+async def _publish_token(node_id: int, context: NodeContext, token: str) -> None:
+    """Publish a token of an LLM node to its listener or execution, if any."""
+    if context.on_token is not None:
+        await context.on_token(token)
+    elif context.execution_id is not None and context.stream_tokens:
+        await execution_events.publish(
+            execution_id=context.execution_id,
+            event_type=ExecutionEventType.TOKEN,
+            node_id=node_id,
+            data={"token": token},
+        )
+
+
+async def _serve_cached(node: Node, context: NodeContext, response: str) -> str:
+    """Relay a cached completion as one token and mark the node run cached."""
+    context.cached.add(node.id)
+    if response:
+        await _publish_token(node_id=node.id, context=context, token=response)
+
+    return response
+
+
+async def _embed_prompt(node: Node, base_url: str, prompt: str) -> list[float] | None:
+    """Embed the prompt of an LLM node, or return None if Ollama cannot."""
+    try:
+        embedding = await embedding_batcher.embed(
+            base_url=base_url,
+            model=node.data.get("embedding_model")
+            or engine_settings.semantic_cache_model,
+            text=prompt,
+        )
+    except httpx.HTTPError as e:
+        logger.warning("Node %s prompt could not be embedded: %s", node.id, e)
+        return None
+
+    return embedding
+
+
+def _resolve_hosts(
+    node: Node, context: NodeContext
+) -> tuple[LLMProviderType, list[str]]:
+    """Resolve the provider type and host base URLs an LLM node may call.
+
+    Nodes setting `provider_group` may call any host of the group, others
+    the single host of their provider.
+
+    Raises:
+        NodeExecutionError: If the provider or group is not available, or
+            the group mixes provider types.
+
+    """
+    group = node.data.get("provider_group")
+    if group:
+        providers = context.get_provider_group(group=group)
+    else:
+        provider = context.get_provider(provider_id=node.data.get("provider_id"))
+        providers = [provider] if provider else []
+
+    types = {provider.type for provider in providers} or {LLMProviderType.OLLAMA}
+    if len(types) > 1:
+        raise NodeExecutionError(
+            message=f"LLM provider group {group} mixes provider types"
+        )
+
+    base_urls = sorted(
+        {
+            (provider.base_url or ollama_settings.url).rstrip("/")
+            for provider in providers
+        }
+    ) or [ollama_settings.url.rstrip("/")]
+
+    return types.pop(), base_urls
+
+
+async def run_llm(node: Node, inputs: list[Any], context: NodeContext) -> str:
+    """Run a completion for an LLM node, publishing tokens as they arrive.
+
+    Completions that `reuses_completion` allows are served from the
+    completion cache, as one token, when the same request was answered
+    before. Nodes setting `semantic_threshold` are
+    also served the completion of the most similar earlier prompt to the
+    same model by the same user, when its cosine similarity reaches the
+    threshold.
+
+    Nodes setting `provider_group` send each request to the group host with
+    the fewest requests in flight and the lowest recent latency, skipping
+    hosts ejected after repeated failures. Cached completions are shared by
+    the whole group.
+
+    Raises:
+        NodeExecutionError: If the node is misconfigured or the request fails.
+
+    """
+    model = node.data.get("model")
+    if not model:
+        raise NodeExecutionError(message=f"Node {node.id} has no model configured")
+
+    provider_type, base_urls = _resolve_hosts(node=node, context=context)
+    hosts = ",".join(base_urls)
+
+    options = {}
+    if node.data.get("temperature") is not None:
+        options["temperature"] = float(node.data["temperature"])
+    request = {
+        "model": model,
+        "prompt": render_prompt(template=node.data.get("prompt", ""), inputs=inputs),
+        "options": options,
+    }
+
+    key = None
+    if engine_settings.completion_cache and reuses_completion(node=node):
+        key = digest(provider_type, hosts, request)
+        cached = await completion_cache.get(key=key)
+        if cached is not None:
+            return await _serve_cached(
+                node=node, context=context, response=cached["response"]
+            )
+
+    threshold = node.data.get("semantic_threshold")
+    scope = None
+    embedding = None
+    if (
+        engine_settings.semantic_cache
+        and threshold is not None
+        and context.owner_id is not None
+    ):
+        scope = SemanticScope(
+            owner_id=context.owner_id,
+            key=digest(provider_type, hosts, model, options),
+        )
+        embedding = await _embed_prompt(
+            node=node,
+            base_url=provider_balancer.pick(base_urls=base_urls),
+            prompt=request["prompt"],
+        )
+        if embedding is not None:
+            response = await semantic_cache.get(
+                client=context.clients.get(base_url=chroma_settings.url),
+                scope=scope,
+                embedding=embedding,
+                threshold=float(threshold),
+            )
+            if response is not None:
+                return await _serve_cached(
+                    node=node, context=context, response=response
+                )
+
+    base_url = provider_balancer.pick(base_urls=base_urls)
+    with provider_balancer.track(base_url=base_url):
+        response = await _stream_completion(
+            node=node, context=context, base_url=base_url, request=request
+        )
+    if key is not None:
+        await completion_cache.set(key=key, value={"response": response})
+    if scope is not None and embedding is not None:
+        await semantic_cache.set(
+            client=context.clients.get(base_url=chroma_settings.url),
+            scope=scope,
+            embedding=embedding,
+            prompt=request["prompt"],
+            response=response,
+        )
+
+    return response
+
+
+async def run_output(_node: Node, inputs: list[Any], _context: NodeContext) -> Any:  # noqa: ANN401
+    """Pass the upstream output through to the execution result."""
+    return inputs[0] if len(inputs) == 1 else inputs
+
+
+def _map_config(node: Node) -> tuple[int, int]:
+    """Return the subgraph workflow ID and item concurrency of a MAP node.
+
+    Raises:
+        NodeExecutionError: If the workflow ID is missing or the concurrency
+            is not a positive integer.
+
+    """
+    workflow_id = node.data.get("workflow_id")
+    if not isinstance(workflow_id, int):
+        raise NodeExecutionError(message=f"Node {node.id} has no workflow_id")
+    concurrency = node.data.get("concurrency", engine_settings.map_concurrency)
+    if not isinstance(concurrency, int) or concurrency < 1:
+        raise NodeExecutionError(
+            message=f"Node {node.id} concurrency must be a positive integer"
+        )
+
+    return workflow_id, concurrency
+
+
+async def run_map(node: Node, inputs: list[Any], context: NodeContext) -> list[Any]:
+    """Run the subgraph of a MAP node once per item of its list input.
+
+    Items run concurrently, at most `concurrency` at a time, as executions of
+    the referenced workflow that publish no events and record no node runs.
+    The first failing item cancels the others.
+
+    Raises:
+        NodeExecutionError: If the node is misconfigured, its input is not a
+            list or an item fails.
+
+    """
+    workflow_id, concurrency = _map_config(node=node)
+    plan = context.subgraphs.get(workflow_id)
+    if plan is None or context.run_graph is None:
+        raise NodeExecutionError(message=f"Node {node.id} has no subgraph workflow")
+
+    items = inputs[0] if len(inputs) == 1 else inputs
+    if node.data.get("items_key") and isinstance(items, dict):
+        items = items.get(node.data["items_key"])
+    if not isinstance(items, list):
+        raise NodeExecutionError(message=f"Node {node.id} input is not a list")
+    if not items:
+        return []
+
+    run_graph = context.run_graph
+    semaphore = asyncio.Semaphore(min(concurrency, engine_settings.map_concurrency))
+
+    async def run_item(item: Any) -> dict[str, Any]:  # noqa: ANN401
+        async with semaphore:
+            return await run_graph(
+                plan,
+                replace(
+                    context,
+                    input_data=item,
+                    execution_id=None,
+                    usage={},
+                    cached=set(),
+                    node_runs=[],
+                ),
+            )
+
+    tasks = [asyncio.create_task(run_item(item)) for item in items]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for i, task in enumerate(tasks):
+            if task.done() and not task.cancelled() and task.exception():
+                raise NodeExecutionError(
+                    message=f"Node {node.id} item {i} failed: {task.exception()}"
+                ) from task.exception()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return [task.result() for task in tasks]
+
+
+# Node types whose outputs are worth memoizing across executions.
+MEMOIZED_NODE_TYPES = frozenset({NodeType.LLM})
+
+NODE_HANDLERS: dict[NodeType, NodeHandler] = {
+    NodeType.INPUT: run_input,
+    NodeType.LLM: run_llm,
+    NodeType.OUTPUT: run_output,
+    NodeType.MAP: run_map,
+}
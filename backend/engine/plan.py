@@ -0,0 +1,288 @@
+"""Compiled execution plans and their per-process cache."""
+
+from array import array
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from engine.topology import topology_cache
+from enums import NodeType
+from exceptions import ExecutionGraphError
+from models import Edge, Node, Workflow
+from repositories import EdgeRepository, NodeRepository, WorkflowRepository
+from settings import engine_settings
+from utils.hashing import digest
+
+# Node data keys that only affect how the node is drawn on the canvas.
+_DISPLAY_KEYS = frozenset({"label", "nodeType"})
+
+
+@dataclass(frozen=True, slots=True)
+class ExecutionPlan:
+    """Integer-indexed, array-backed form of a workflow graph.
+
+    Nodes are addressed by their position in `nodes`, and `node_ids` holds
+    their IDs in the same order. Adjacency is stored in CSR layout: the
+    successors of node `i` are
+    `successor_targets[successor_offsets[i]:successor_offsets[i + 1]]`, and
+    predecessors are laid out the same way, ordered by edge ID.
+    `config_digests` hash each node's type and data, ignoring display-only keys.
+    `ranks` count the nodes on the longest path from each node to an OUTPUT
+    node, itself included, and are 0 for nodes that reach none.
+    """
+
+    workflow_id: int
+    version: int
+    nodes: tuple[Node, ...]
+    node_ids: array
+    index: dict[int, int]
+    successor_offsets: array
+    successor_targets: array
+    predecessor_offsets: array
+    predecessor_sources: array
+    in_degree: array
+    levels: tuple[tuple[int, ...], ...]
+    config_digests: tuple[str, ...]
+    ranks: array
+
+    def successors(self, node_index: int) -> array:
+        """Return the indices of the nodes fed by a node."""
+        return self.successor_targets[
+            self.successor_offsets[node_index] : self.successor_offsets[node_index + 1]
+        ]
+
+    def predecessors(self, node_index: int) -> array:
+        """Return the indices of the nodes feeding a node."""
+        return self.predecessor_sources[
+            self.predecessor_offsets[node_index] : self.predecessor_offsets[
+                node_index + 1
+            ]
+        ]
+
+
+def _build_csr(size: int, pairs: list[tuple[int, int]]) -> tuple[array, array]:
+    """Pack `(row, column)` pairs into CSR offsets and columns.
+
+    Args:
+        size: The number of rows.
+        pairs: The pairs, in the order columns should appear within a row.
+
+    Returns:
+        The offsets and columns arrays.
+
+    """
+    offsets = array("i", [0]) * (size + 1)
+    for row, _ in pairs:
+        offsets[row + 1] += 1
+    for row in range(size):
+        offsets[row + 1] += offsets[row]
+
+    columns = array("i", [0]) * len(pairs)
+    cursor = array("i", offsets[:-1])
+    for row, column in pairs:
+        columns[cursor[row]] = column
+        cursor[row] += 1
+
+    return offsets, columns
+
+
+def compile_plan(
+    workflow_id: int, version: int, nodes: Sequence[Node], edges: Sequence[Edge]
+) -> ExecutionPlan:
+    """Compile a workflow graph into an execution plan.
+
+    Args:
+        workflow_id: The workflow ID.
+        version: The workflow graph version.
+        nodes: The workflow nodes.
+        edges: The workflow edges.
+
+    Returns:
+        The compiled plan.
+
+    Raises:
+        ExecutionGraphError: If the graph contains a cycle.
+
+    """
+    ordered_nodes = tuple(sorted(nodes, key=lambda node: node.id))
+    index = {node.id: i for i, node in enumerate(ordered_nodes)}
+    pairs = [
+        (index[edge.source_node_id], index[edge.target_node_id])
+        for edge in sorted(edges, key=lambda edge: edge.id)
+    ]
+
+    successor_offsets, successor_targets = _build_csr(len(ordered_nodes), pairs)
+    predecessor_offsets, predecessor_sources = _build_csr(
+        len(ordered_nodes), [(target, source) for source, target in pairs]
+    )
+    in_degree = array(
+        "i",
+        (
+            predecessor_offsets[i + 1] - predecessor_offsets[i]
+            for i in range(len(ordered_nodes))
+        ),
+    )
+
+    remaining = array("i", in_degree)
+    level = [i for i, degree in enumerate(in_degree) if degree == 0]
+    levels = []
+    while level:
+        levels.append(tuple(level))
+        next_level = []
+        for source in level:
+            for target in successor_targets[
+                successor_offsets[source] : successor_offsets[source + 1]
+            ]:
+                remaining[target] -= 1
+                if remaining[target] == 0:
+                    next_level.append(target)
+        level = next_level
+
+    if sum(len(level) for level in levels) != len(ordered_nodes):
+        raise ExecutionGraphError
+
+    ranks = array("i", (int(node.type == NodeType.OUTPUT) for node in ordered_nodes))
+    for level in reversed(levels):
+        for source in level:
+            for target in successor_targets[
+                successor_offsets[source] : successor_offsets[source + 1]
+            ]:
+                if ranks[target] and ranks[target] >= ranks[source]:
+                    ranks[source] = ranks[target] + 1
+
+    return ExecutionPlan(
+        workflow_id=workflow_id,
+        version=version,
+        nodes=ordered_nodes,
+        node_ids=array("q", (node.id for node in ordered_nodes)),
+        index=index,
+        successor_offsets=successor_offsets,
+        successor_targets=successor_targets,
+        predecessor_offsets=predecessor_offsets,
+        predecessor_sources=predecessor_sources,
+        in_degree=in_degree,
+        levels=tuple(levels),
+        config_digests=tuple(
+            digest(
+                node.type,
+                {k: v for k, v in node.data.items() if k not in _DISPLAY_KEYS},
+            )
+            for node in ordered_nodes
+        ),
+        ranks=ranks,
+    )
+
+
+class PlanCache:
+    """LRU cache holding the latest compiled plan of each workflow."""
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_size: The maximum number of workflows kept.
+
+        """
+        self._max_size = max_size
+        self._plans: OrderedDict[int, ExecutionPlan] = OrderedDict()
+
+    def get(self, workflow_id: int, version: int) -> ExecutionPlan | None:
+        """Return the cached plan for a workflow version, if any.
+
+        Args:
+            workflow_id: The workflow ID.
+            version: The workflow graph version.
+
+        Returns:
+            The plan, or None if it is missing or stale.
+
+        """
+        plan = self._plans.get(workflow_id)
+        if not plan or plan.version != version:
+            return None
+
+        self._plans.move_to_end(workflow_id)
+        return plan
+
+    def put(self, plan: ExecutionPlan) -> None:
+        """Store a plan, evicting the least recently used one when full.
+
+        Args:
+            plan: The compiled plan.
+
+        """
+        current = self._plans.get(plan.workflow_id)
+        if current and current.version > plan.version:
+            return
+
+        self._plans[plan.workflow_id] = plan
+        self._plans.move_to_end(plan.workflow_id)
+        while len(self._plans) > self._max_size:
+            self._plans.popitem(last=False)
+
+    def invalidate(self, workflow_id: int) -> None:
+        """Drop the cached plan of a workflow.
+
+        Args:
+            workflow_id: The workflow ID.
+
+        """
+        self._plans.pop(workflow_id, None)
+
+
+plan_cache = PlanCache(max_size=engine_settings.plan_cache_size)
+
+
+async def load_plan(session: AsyncSession, workflow: Workflow) -> ExecutionPlan:
+    """Return the compiled plan of a workflow, compiling it on a cache miss.
+
+    Args:
+        session: The session.
+        workflow: The workflow.
+
+    Returns:
+        The compiled plan for the current workflow version.
+
+    Raises:
+        ExecutionGraphError: If the graph contains a cycle.
+
+    """
+    plan = plan_cache.get(workflow_id=workflow.id, version=workflow.version)
+    if plan:
+        return plan
+
+    plan = compile_plan(
+        workflow_id=workflow.id,
+        version=workflow.version,
+        nodes=await NodeRepository().get_all(session=session, workflow_id=workflow.id),
+        edges=await EdgeRepository().get_all(session=session, workflow_id=workflow.id),
+    )
+    plan_cache.put(plan=plan)
+
+    return plan
+
+
+async def invalidate_plan(session: AsyncSession, workflow_id: int) -> int:
+    """Bump the graph version of a workflow and drop its local plan.
+
+    Other processes notice the new version on their next lookup. The local
+    topological order, already updated by the caller, moves to the new
+    version.
+
+    Args:
+        session: The session.
+        workflow_id: The workflow ID.
+
+    Returns:
+        The new graph version.
+
+    """
+    version = await WorkflowRepository().bump_version(
+        session=session, workflow_id=workflow_id
+    )
+    plan_cache.invalidate(workflow_id=workflow_id)
+    topology_cache.advance(workflow_id=workflow_id, version=version)
+
+    return version
@@ -0,0 +1,171 @@
+"""Hand executions over to flow runs on the Prefect work pool."""
+
+import logging
+from typing import TYPE_CHECKING, Any, cast
+
+import httpx
+from prefect.deployments import run_deployment
+from prefect.exceptions import PrefectException
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from enums import ExecutionPriority, ExecutionStatus
+from repositories import ExecutionRepository
+from sessions import async_session
+from settings import prefect_settings
+
+if TYPE_CHECKING:
+    from collections.abc import Coroutine
+
+    from prefect.client.schemas.objects import FlowRun
+
+logger = logging.getLogger(__name__)
+
+
+class PrefectExecutor:
+    """Submit executions as Prefect flow runs instead of running them in-process.
+
+    Admission is left to the work pool: the API only creates the flow run
+    and returns, so request latency does not depend on how long runs take.
+    """
+
+    def __init__(
+        self,
+        deployment: str,
+        batch_deployment: str,
+        session_factory: async_sessionmaker[AsyncSession] = async_session,
+    ) -> None:
+        """Initialize the executor.
+
+        Args:
+            deployment: The `flow-name/deployment-name` of the execution flow.
+            batch_deployment: The `flow-name/deployment-name` of the batch flow.
+            session_factory: The factory used to open database sessions.
+
+        """
+        self._deployment = deployment
+        self._batch_deployment = batch_deployment
+        self._session_factory = session_factory
+        self._execution_repository = ExecutionRepository()
+
+    async def reserve(self, user_id: int, slots: int = 1) -> None:
+        """Accept every execution; the work pool queues them.
+
+        Args:
+            user_id: The user ID.
+            slots: The slots the executions would take.
+
+        """
+
+    async def release(self, user_id: int, slots: int = 1) -> None:
+        """Nothing to give back, see `reserve`.
+
+        Args:
+            user_id: The user ID.
+            slots: The slots the executions would have taken.
+
+        """
+
+    async def submit(
+        self,
+        execution_id: int,
+        user_id: int,
+        priority: ExecutionPriority = ExecutionPriority.INTERACTIVE,
+    ) -> None:
+        """Create a flow run for an execution without waiting for it.
+
+        Args:
+            execution_id: The execution ID.
+            user_id: The user ID.
+            priority: The priority class of the execution.
+
+        """
+        await self._create_flow_run(
+            deployment=self._deployment,
+            parameters={"execution_id": execution_id},
+            execution_ids=[execution_id],
+            user_id=user_id,
+            priority=priority,
+        )
+
+    async def submit_batch(
+        self,
+        execution_ids: list[int],
+        user_id: int,
+        priority: ExecutionPriority = ExecutionPriority.BATCH,
+        slots: int = 1,  # noqa: ARG002
+    ) -> None:
+        """Create one flow run for a batch of executions without waiting for it.
+
+        Args:
+            execution_ids: The IDs of executions sharing one workflow.
+            user_id: The user ID.
+            priority: The priority class of the executions.
+            slots: The slots the batch would take, see `reserve`.
+
+        """
+        await self._create_flow_run(
+            deployment=self._batch_deployment,
+            parameters={"execution_ids": execution_ids},
+            execution_ids=execution_ids,
+            user_id=user_id,
+            priority=priority,
+        )
+
+    async def _create_flow_run(
+        self,
+        deployment: str,
+        parameters: dict[str, Any],
+        execution_ids: list[int],
+        user_id: int,
+        priority: ExecutionPriority,
+    ) -> None:
+        """Create a flow run and link the executions to it.
+
+        The executions are failed right away if Prefect cannot take them,
+        since no flow run would ever pick them up. Flow runs go to the work
+        queue named after their priority class: the interactive queue is
+        polled first and the batch queue has a concurrency limit, so batch
+        runs cannot take every worker of the pool.
+
+        Args:
+            deployment: The `flow-name/deployment-name` to run.
+            parameters: The flow run parameters.
+            execution_ids: The executions run by the flow run.
+            user_id: The user ID.
+            priority: The priority class of the executions.
+
+        """
+        try:
+            flow_run = await cast(
+                "Coroutine[Any, Any, FlowRun]",
+                run_deployment(
+                    name=deployment,
+                    parameters=parameters,
+                    flow_run_name=f"execution-{execution_ids[0]}",
+                    timeout=0,
+                    tags=[f"user-{user_id}", f"priority-{priority}"],
+                    work_queue_name=priority,
+                    as_subflow=False,
+                ),
+            )
+        except (PrefectException, httpx.HTTPError) as e:
+            logger.exception("Executions %s could not be submitted", execution_ids)
+            data = {
+                "status": ExecutionStatus.FAILED,
+                "error": f"Flow run could not be created: {e}",
+                "finished_at": func.now(),
+            }
+        else:
+            data = {"flow_run_id": flow_run.id}
+
+        async with self._session_factory() as session:
+            await self._execution_repository.update_all_by_ids(
+                session=session, execution_ids=execution_ids, data=data
+            )
+
+
+prefect_executor = PrefectExecutor(
+    deployment=prefect_settings.deployment,
+    batch_deployment=prefect_settings.batch_deployment,
+)
@@ -0,0 +1,469 @@
+"""Distributed execution queue on Redis Streams with lease recovery."""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+from collections import defaultdict
+
+import redis.asyncio as redis
+from sqlalchemy.exc import SQLAlchemyError
+
+from engine.fair import StrideScheduler
+from engine.runner import ExecutionEngine, execution_engine
+from engine.slots import ExecutionSlots, execution_slots
+from enums import ExecutionPriority
+from exceptions import ExecutionQueueFullError
+from settings import executor_settings
+from settings.executor import ExecutorSettings
+from utils.hashing import canonical_json
+from utils.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class StreamExecutor:
+    """Queue executions on Redis streams consumed by a consumer group.
+
+    Every priority class has a stream of its own, and consumers take new jobs
+    from the streams in weighted fair order, so a backlog of batch jobs
+    cannot starve interactive ones. Every API worker and standalone worker
+    process joins the same group on every stream, so jobs are balanced
+    across hosts. A consumer keeps its jobs leased by heartbeating them; jobs
+    whose consumer stops heartbeating, because it crashed or was recycled,
+    are reclaimed by another consumer and resumed. Executions left following
+    a leader that finished without them are queued again as they are found.
+
+    Jobs carry the user and global slots reserved for them, which consumers
+    keep renewing while the jobs are on the streams and release once they
+    are acknowledged.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        engine: ExecutionEngine,
+        settings: ExecutorSettings,
+        slots: ExecutionSlots,
+        key: str = "execution-queue",
+    ) -> None:
+        """Initialize the queue.
+
+        Args:
+            client: The Redis client.
+            engine: The engine running the executions.
+            settings: The worker count, queue size, limits, class weights and
+                lease timings.
+            slots: The admission slots shared by all processes.
+            key: The prefix of the stream keys, also naming the consumer group.
+
+        """
+        self._client = client
+        self._engine = engine
+        self._slots = slots
+        self._workers = settings.workers
+        self._queue_size = settings.queue_size
+        self._user_limit = settings.user_limit
+        self._global_limit = settings.global_limit
+        self._retry_after = settings.retry_after
+        self._lease = settings.queue_lease
+        self._heartbeat = settings.queue_heartbeat
+        self._max_deliveries = settings.queue_max_deliveries
+        self._shutdown_grace = settings.queue_shutdown_grace
+        self._keys = {priority: f"{key}:{priority}" for priority in ExecutionPriority}
+        self._priorities = {key: priority for priority, key in self._keys.items()}
+        self._scheduler = StrideScheduler(
+            weights={
+                ExecutionPriority.INTERACTIVE: settings.interactive_weight,
+                ExecutionPriority.BATCH: settings.batch_weight,
+            }
+        )
+        self._group = f"{key}-executors"
+        self._consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self._reserved: defaultdict[int, list[tuple[int, list[str]]]] = defaultdict(
+            list
+        )
+        self._jobs: set[asyncio.Task] = set()
+        self._tasks: list[asyncio.Task] = []
+
+    async def reserve(self, user_id: int, slots: int = 1) -> None:
+        """Check that the streams have room for another job and take slots.
+
+        Args:
+            user_id: The user ID.
+            slots: The slots to reserve, one per execution run at once.
+
+        Raises:
+            ExecutionRateLimitError: If the user is at their limit.
+            ExecutionQueueFullError: If the streams or the cluster are full.
+
+        """
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key in self._keys.values():
+                pipe.xlen(key)
+            lengths = await pipe.execute()
+        if sum(lengths) >= self._queue_size:
+            raise ExecutionQueueFullError(retry_after=self._retry_after)
+
+        tokens = await self._slots.acquire(
+            user_id=user_id,
+            user_limit=self._user_limit,
+            global_limit=self._global_limit,
+            count=slots,
+        )
+        self._reserved[user_id].append((slots, tokens))
+
+    async def release(self, user_id: int, slots: int = 1) -> None:
+        """Give back a reservation that will not be submitted.
+
+        Args:
+            user_id: The user ID.
+            slots: The slots reserved.
+
+        """
+        await self._release_slots(
+            tokens=self._take_slots(user_id=user_id, slots=slots), user_id=user_id
+        )
+
+    async def submit(
+        self,
+        execution_id: int,
+        user_id: int,
+        priority: ExecutionPriority = ExecutionPriority.INTERACTIVE,
+    ) -> None:
+        """Queue an execution into a previously reserved single slot.
+
+        Args:
+            execution_id: The execution ID.
+            user_id: The user ID.
+            priority: The priority class of the execution.
+
+        """
+        await self.submit_batch(
+            execution_ids=[execution_id], user_id=user_id, priority=priority
+        )
+
+    async def submit_batch(
+        self,
+        execution_ids: list[int],
+        user_id: int,
+        priority: ExecutionPriority = ExecutionPriority.BATCH,
+        slots: int = 1,
+    ) -> None:
+        """Queue a batch of executions as one job on the stream of its class.
+
+        Args:
+            execution_ids: The IDs of executions sharing one workflow.
+            user_id: The user ID.
+            priority: The priority class of the executions.
+            slots: The slots reserved for the batch.
+
+        """
+        job = {
+            "execution_ids": execution_ids,
+            "user_id": user_id,
+            "priority": priority,
+            "slots": self._take_slots(user_id=user_id, slots=slots),
+        }
+        await self._client.xadd(self._keys[priority], {"job": canonical_json(job)})
+
+    def start(self) -> None:
+        """Start consuming jobs on the running event loop."""
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._consume()),
+                asyncio.create_task(self._keep_slots()),
+            ]
+
+    async def stop(self) -> None:
+        """Stop consuming, giving running jobs a grace period to finish.
+
+        Jobs still running afterwards are cancelled without being
+        acknowledged, so another consumer resumes them once the lease expires.
+        """
+        if not self._tasks:
+            return
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        if self._jobs:
+            _, pending = await asyncio.wait(self._jobs, timeout=self._shutdown_grace)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _consume(self) -> None:
+        """Pull new and abandoned jobs while there are free workers, forever."""
+        await self._create_groups()
+        reclaimed_at = 0.0
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                if len(self._jobs) >= self._workers:
+                    await asyncio.wait(self._jobs, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                if loop.time() - reclaimed_at >= self._lease / 2:
+                    reclaimed_at = loop.time()
+                    await self._reclaim()
+                    await self._requeue_orphans()
+
+                if await self._read_next():
+                    continue
+
+                # Every stream is empty: wait for the next job on any of them,
+                # which may hand over one job per stream at once.
+                response = await self._client.xreadgroup(
+                    self._group,
+                    self._consumer,
+                    dict.fromkeys(self._keys.values(), ">"),
+                    count=1,
+                    block=self._heartbeat * 1000,
+                )
+                for key, entries in response or []:
+                    for entry_id, fields in entries:
+                        self._scheduler.serve(priority=self._priorities[key])
+                        self._spawn(
+                            key=key, entry_id=entry_id, fields=fields, resume=False
+                        )
+            except redis.RedisError:
+                logger.exception("Execution queue unavailable")
+                await asyncio.sleep(self._heartbeat)
+
+    def _take_slots(self, user_id: int, slots: int) -> list[str]:
+        """Take the tokens of a reservation of a user, empty without one."""
+        reservations = self._reserved.get(user_id)
+        if not reservations:
+            return []
+
+        index = next(
+            (i for i, (count, _) in enumerate(reservations) if count == slots), -1
+        )
+        _, tokens = reservations.pop(index)
+        if not reservations:
+            del self._reserved[user_id]
+        return tokens
+
+    async def _release_slots(self, tokens: list[str], user_id: int) -> None:
+        """Give back slots, leaving them to expire if Redis is unavailable.
+
+        Args:
+            tokens: The tokens of the slots.
+            user_id: The user ID the slots were taken for.
+
+        """
+        try:
+            await self._slots.release(tokens=tokens, user_id=user_id)
+        except redis.RedisError:
+            logger.warning("Execution slots of user %s were not released", user_id)
+
+    async def _keep_slots(self) -> None:
+        """Renew the slots of the jobs on the streams periodically, forever.
+
+        The streams hold exactly the jobs that are not acknowledged yet, so
+        their slots stay taken while they wait or run, and expire once no
+        consumer is left to renew them.
+        """
+        while True:
+            try:
+                slots: dict[str, int] = {}
+                for key in self._keys.values():
+                    for _, fields in await self._client.xrange(key):
+                        job = json.loads(fields["job"])
+                        slots.update(
+                            dict.fromkeys(job.get("slots", []), job["user_id"])
+                        )
+                await self._slots.renew(slots=slots)
+            except redis.RedisError:
+                logger.warning("Execution slots of queued jobs were not renewed")
+            await asyncio.sleep(self._heartbeat)
+
+    async def _create_groups(self) -> None:
+        """Create the consumer group and streams if they do not exist yet."""
+        for key in self._keys.values():
+            try:
+                await self._client.xgroup_create(
+                    key, self._group, id="0", mkstream=True
+                )
+            except redis.ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+
+    async def _read_next(self) -> bool:
+        """Take a new job from the stream of the class whose turn it is.
+
+        Returns:
+            Whether a job was taken.
+
+        """
+        for priority in self._scheduler.order(self._keys):
+            key = self._keys[priority]
+            response = await self._client.xreadgroup(
+                self._group, self._consumer, {key: ">"}, count=1
+            )
+            for _, entries in response or []:
+                for entry_id, fields in entries:
+                    self._scheduler.serve(priority=priority)
+                    self._spawn(key=key, entry_id=entry_id, fields=fields, resume=False)
+                    return True
+
+            self._scheduler.resume(priority=priority)
+
+        return False
+
+    async def _reclaim(self) -> None:
+        """Take over jobs whose lease expired, failing the ones retried too often."""
+        for priority in self._scheduler.order(self._keys):
+            await self._reclaim_stream(key=self._keys[priority])
+
+    async def _reclaim_stream(self, key: str) -> None:
+        """Take over the expired jobs of a stream while there are free workers.
+
+        Args:
+            key: The stream key.
+
+        """
+        if len(self._jobs) >= self._workers:
+            return
+
+        _, entries, _ = await self._client.xautoclaim(
+            key,
+            self._group,
+            self._consumer,
+            min_idle_time=self._lease * 1000,
+            start_id="0-0",
+            count=self._workers - len(self._jobs),
+        )
+        for entry_id, fields in entries:
+            pending = await self._client.xpending_range(
+                key, self._group, min=entry_id, max=entry_id, count=1
+            )
+            if pending and pending[0]["times_delivered"] > self._max_deliveries:
+                job = json.loads(fields["job"])
+                logger.error("Giving up on execution job %s", job["execution_ids"])
+                await self._engine.fail(
+                    execution_ids=job["execution_ids"],
+                    error="Execution was abandoned by its workers too many times",
+                )
+                await self._ack(key=key, entry_id=entry_id)
+                await self._release_slots(
+                    tokens=job.get("slots", []), user_id=job["user_id"]
+                )
+                continue
+
+            self._spawn(key=key, entry_id=entry_id, fields=fields, resume=True)
+
+    async def _requeue_orphans(self) -> None:
+        """Queue executions following leaders that finished without them."""
+        try:
+            orphans = await self._engine.claim_orphaned_followers(limit=self._workers)
+        except SQLAlchemyError:
+            logger.exception("Executions left by their leaders were not claimed")
+            return
+
+        for execution_id, user_id, priority in orphans:
+            logger.warning("Queueing execution %s left by its leader", execution_id)
+            await self.submit(
+                execution_id=execution_id, user_id=user_id, priority=priority
+            )
+
+    def _spawn(
+        self, key: str, entry_id: str, fields: dict[str, str], *, resume: bool
+    ) -> None:
+        """Run a job in the background.
+
+        Args:
+            key: The stream key.
+            entry_id: The stream entry ID.
+            fields: The stream entry fields.
+            resume: Whether the job was reclaimed from another consumer.
+
+        """
+        task = asyncio.create_task(
+            self._run_job(key=key, entry_id=entry_id, fields=fields, resume=resume)
+        )
+        self._jobs.add(task)
+        task.add_done_callback(self._jobs.discard)
+
+    async def _run_job(
+        self, key: str, entry_id: str, fields: dict[str, str], *, resume: bool
+    ) -> None:
+        """Run a job, keeping it leased, and acknowledge it once done.
+
+        Failed jobs are left pending so that they are retried after the lease
+        expires, up to the maximum number of deliveries.
+
+        Args:
+            key: The stream key.
+            entry_id: The stream entry ID.
+            fields: The stream entry fields.
+            resume: Whether the job was reclaimed from another consumer.
+
+        """
+        job = json.loads(fields["job"])
+        heartbeat = asyncio.create_task(self._keep_leased(key=key, entry_id=entry_id))
+        try:
+            await self._engine.run_batch(
+                execution_ids=job["execution_ids"], resume=resume
+            )
+        except Exception:
+            logger.exception("Execution job %s crashed", job["execution_ids"])
+            return
+        finally:
+            heartbeat.cancel()
+
+        await self._ack(key=key, entry_id=entry_id)
+        await self._release_slots(tokens=job.get("slots", []), user_id=job["user_id"])
+
+    async def _keep_leased(self, key: str, entry_id: str) -> None:
+        """Reset the idle time of a running job periodically, forever.
+
+        Args:
+            key: The stream key.
+            entry_id: The stream entry ID.
+
+        """
+        while True:
+            await asyncio.sleep(self._heartbeat)
+            try:
+                await self._client.xclaim(
+                    key,
+                    self._group,
+                    self._consumer,
+                    min_idle_time=0,
+                    message_ids=[entry_id],
+                    justid=True,
+                )
+            except redis.RedisError:
+                logger.warning("Heartbeat of execution job %s failed", entry_id)
+
+    async def _ack(self, key: str, entry_id: str) -> None:
+        """Acknowledge and drop a finished job.
+
+        A lost acknowledgement only makes the job be reclaimed later, when
+        its executions are already finished and are not started again.
+
+        Args:
+            key: The stream key.
+            entry_id: The stream entry ID.
+
+        """
+        try:
+            async with self._client.pipeline(transaction=True) as pipe:
+                pipe.xack(key, self._group, entry_id)
+                pipe.xdel(key, entry_id)
+                await pipe.execute()
+        except redis.RedisError:
+            logger.warning("Acknowledging execution job %s failed", entry_id)
+
+
+execution_stream = StreamExecutor(
+    client=redis_client,
+    engine=execution_engine,
+    settings=executor_settings,
+    slots=execution_slots,
+)
@@ -0,0 +1,874 @@
+"""Concurrent DAG runner for workflow executions."""
+
+import asyncio
+import heapq
+import logging
+import time
+from collections.abc import Awaitable
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from typing import Any
+
+import redis.asyncio as redis
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from engine.cancel import execution_cancellations
+from engine.checkpoint import execution_checkpoints
+from engine.events import execution_events
+from engine.flight import execution_flights
+from engine.lease import execution_leases
+from engine.memo import node_output_store
+from engine.nodes import (
+    MEMOIZED_NODE_TYPES,
+    NODE_HANDLERS,
+    NodeContext,
+    NodeHandler,
+    ReadyNode,
+    SharedRun,
+    reuses_completion,
+)
+from engine.plan import ExecutionPlan, load_plan
+from engine.singleflight import SingleFlight
+from enums import ExecutionEventType, ExecutionPriority, ExecutionStatus, NodeType
+from exceptions import ExecutionGraphError
+from models import Execution, Node
+from repositories import (
+    ExecutionNodeRunRepository,
+    ExecutionRepository,
+    LLMProviderRepository,
+    WorkflowRepository,
+)
+from sessions import async_session
+from settings import engine_settings, executor_settings
+from utils.blob import blob_store
+from utils.hashing import digest
+from utils.ollama import ollama_clients
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionEngine:
+    """Schedule workflow nodes topologically and run ready nodes concurrently."""
+
+    def __init__(
+        self, session_factory: async_sessionmaker[AsyncSession] = async_session
+    ) -> None:
+        """Initialize the engine.
+
+        Args:
+            session_factory: The factory used to open database sessions.
+
+        """
+        self._session_factory = session_factory
+        self._execution_repository = ExecutionRepository()
+        self._execution_node_run_repository = ExecutionNodeRunRepository()
+        self._workflow_repository = WorkflowRepository()
+        self._llm_provider_repository = LLMProviderRepository()
+        self._single_flight: SingleFlight[Any] = SingleFlight()
+        self._shared_runs: dict[str, SharedRun] = {}
+        self._running: dict[int, asyncio.Task] = {}
+        self._cancelled: set[int] = set()
+        self._listener: asyncio.Task | None = None
+        self._listener_loop: asyncio.AbstractEventLoop | None = None
+
+    async def run(self, execution_id: int) -> None:
+        """Run an execution to completion and persist its outcome.
+
+        Args:
+            execution_id: The execution ID.
+
+        """
+        await self.run_batch(execution_ids=[execution_id])
+
+    async def run_batch(
+        self, execution_ids: list[int], *, resume: bool = False
+    ) -> None:
+        """Run executions of one workflow against a single compiled plan.
+
+        The workflow, providers and plan are resolved once, in a short-lived
+        session, so that no database connection is held while nodes wait on
+        the LLM provider. The executions stay leased while they run, and
+        resumed ones skip the nodes they completed before.
+
+        Args:
+            execution_ids: The IDs of executions sharing one workflow.
+            resume: Whether to also restart executions left RUNNING by a
+                worker that died.
+
+        """
+        async with self._session_factory() as session:
+            executions = await self._execution_repository.get_all_by_ids(
+                session=session, execution_ids=execution_ids
+            )
+            if not executions:
+                return
+
+            workflow = await self._workflow_repository.get_by(
+                session=session, id=executions[0].workflow_id
+            )
+            if not workflow:
+                return
+
+            providers = await self._llm_provider_repository.get_all(
+                session=session, user_id=workflow.owner_id
+            )
+
+            try:
+                plan = await load_plan(session=session, workflow=workflow)
+                subgraphs = await self._load_subgraphs(
+                    session=session, plan=plan, owner_id=workflow.owner_id
+                )
+            except ExecutionGraphError as e:
+                await self.fail(execution_ids=execution_ids, error=e.message)
+                return
+
+            # Leased before starting, so no supervisor takes them for abandoned.
+            await self._renew_leases(execution_ids=execution_ids)
+            remaining = await self._execution_repository.start_batch(
+                session=session,
+                execution_ids=[execution.id for execution in executions],
+                resume=resume,
+            )
+
+        started = set(remaining)
+
+        # Executions cancelled while queued are no longer startable.
+        executions = [execution for execution in executions if execution.id in started]
+        await execution_leases.release(
+            execution_ids=[
+                execution_id
+                for execution_id in execution_ids
+                if execution_id not in started
+            ]
+        )
+        if not executions:
+            return
+
+        checkpoints = {
+            execution.id: await execution_checkpoints.load(
+                execution_id=execution.id, version=plan.version
+            )
+            for execution in executions
+            if resume
+        }
+
+        # Inputs shared by many executions of a batch are read only once.
+        input_blobs = {
+            key: await blob_store.load(key=key)
+            for key in {execution.input_blob for execution in executions}
+            if key is not None
+        }
+
+        self._watch_cancellations()
+        semaphore = asyncio.Semaphore(engine_settings.batch_concurrency)
+        heartbeat = asyncio.create_task(self._keep_leased(execution_ids=list(started)))
+        try:
+            await asyncio.gather(
+                *(
+                    self._run_execution(
+                        execution=execution,
+                        plan=plan,
+                        context=NodeContext(
+                            input_data=(
+                                input_blobs[execution.input_blob]
+                                if execution.input_blob
+                                else execution.input_data
+                            ),
+                            clients=ollama_clients,
+                            owner_id=workflow.owner_id,
+                            providers={provider.id: provider for provider in providers},
+                            execution_id=execution.id,
+                            stream_tokens=(
+                                execution.priority != ExecutionPriority.BATCH
+                            ),
+                            subgraphs=subgraphs,
+                            run_graph=self.run_graph,
+                        ),
+                        semaphore=semaphore,
+                        time_left=remaining[execution.id],
+                        completed=checkpoints.get(execution.id),
+                    )
+                    for execution in executions
+                )
+            )
+        finally:
+            heartbeat.cancel()
+            await execution_leases.release(execution_ids=list(started))
+
+    async def _renew_leases(self, execution_ids: list[int]) -> None:
+        """Renew the leases of executions, logging instead of failing.
+
+        Args:
+            execution_ids: The execution IDs.
+
+        """
+        try:
+            await execution_leases.renew(execution_ids=execution_ids)
+        except redis.RedisError:
+            logger.warning("Leases of executions %s were not renewed", execution_ids)
+
+    async def _keep_leased(self, execution_ids: list[int]) -> None:
+        """Renew the leases of running executions periodically, forever.
+
+        Args:
+            execution_ids: The execution IDs.
+
+        """
+        while True:
+            await asyncio.sleep(executor_settings.execution_heartbeat)
+            await self._renew_leases(execution_ids=execution_ids)
+
+    async def _load_subgraphs(
+        self,
+        session: AsyncSession,
+        plan: ExecutionPlan,
+        owner_id: int,
+        subgraphs: dict[int, ExecutionPlan] | None = None,
+        ancestors: tuple[int, ...] = (),
+    ) -> dict[int, ExecutionPlan]:
+        """Load the plans of the workflows MAP nodes run, transitively.
+
+        Only workflows of the same owner are loaded; MAP nodes referencing
+        any other workflow fail when they run.
+
+        Args:
+            session: The session.
+            plan: The plan whose MAP nodes are resolved.
+            owner_id: The owner user ID.
+            subgraphs: The plans loaded so far, keyed by workflow ID.
+            ancestors: The IDs of the workflows mapping over this plan.
+
+        Returns:
+            The plans keyed by workflow ID.
+
+        Raises:
+            ExecutionGraphError: If a workflow maps over itself, directly or
+                through other workflows, or a subgraph contains a cycle.
+
+        """
+        subgraphs = {} if subgraphs is None else subgraphs
+        ancestors = (*ancestors, plan.workflow_id)
+        for node in plan.nodes:
+            workflow_id = node.data.get("workflow_id")
+            if node.type != NodeType.MAP or not isinstance(workflow_id, int):
+                continue
+            if workflow_id in ancestors:
+                raise ExecutionGraphError(
+                    message=f"Workflow {workflow_id} maps over itself"
+                )
+            if workflow_id in subgraphs:
+                continue
+
+            workflow = await self._workflow_repository.get_by(
+                session=session, id=workflow_id, owner_id=owner_id
+            )
+            if not workflow:
+                continue
+
+            subgraphs[workflow_id] = await load_plan(session=session, workflow=workflow)
+            await self._load_subgraphs(
+                session=session,
+                plan=subgraphs[workflow_id],
+                owner_id=owner_id,
+                subgraphs=subgraphs,
+                ancestors=ancestors,
+            )
+
+        return subgraphs
+
+    async def _run_execution(  # noqa: PLR0913
+        self,
+        execution: Execution,
+        plan: ExecutionPlan,
+        context: NodeContext,
+        semaphore: asyncio.Semaphore,
+        *,
+        time_left: float | None = None,
+        completed: dict[int, Any] | None = None,
+    ) -> None:
+        """Run one execution of a batch and persist its outcome.
+
+        The execution can be cancelled through `cancel` until it finishes, and
+        is cancelled once it ran for `timeout_seconds`, counted from when it
+        first started running; time spent queued, also behind the other
+        executions of its batch, does not count.
+        Cancelling stops its pending nodes and closes their LLM streams; the
+        executions following a cancelled one are then run here, led by the
+        oldest of them.
+
+        Args:
+            execution: The execution.
+            plan: The compiled workflow plan.
+            context: The per-execution node context.
+            semaphore: The semaphore bounding concurrent executions.
+            time_left: The seconds of running left before the execution times
+                out, as counted by the database, if any.
+            completed: The checkpointed outputs of nodes completed by an
+                earlier attempt, keyed by node ID.
+
+        """
+        task = asyncio.current_task()
+        if task is not None:
+            self._running[execution.id] = task
+
+        try:
+            async with semaphore, asyncio.timeout(time_left):
+                output_data = await self.run_graph(
+                    plan=plan, context=context, completed=completed
+                )
+        except TimeoutError:
+            data = {
+                "status": ExecutionStatus.CANCELLED,
+                "error": f"Execution timed out after {execution.timeout_seconds}s",
+            }
+        except asyncio.CancelledError:
+            if execution.id not in self._cancelled or task is None:
+                raise
+            task.uncancel()
+            data = {"status": ExecutionStatus.CANCELLED, "error": "Execution cancelled"}
+        except Exception as e:
+            logger.exception("Execution %s failed", execution.id)
+            data = {"status": ExecutionStatus.FAILED, "error": str(e)}
+        else:
+            data = {"status": ExecutionStatus.SUCCESS, "output_data": output_data}
+        finally:
+            self._running.pop(execution.id, None)
+            self._cancelled.discard(execution.id)
+
+        promoted = await self._finish(
+            execution_id=execution.id,
+            data=data,
+            node_runs=[
+                {**node_run, "execution_started_at": execution.started_at}
+                for node_run in context.node_runs
+            ],
+        )
+        await execution_checkpoints.clear(
+            execution_id=execution.id, version=plan.version
+        )
+        if promoted is not None:
+            await self.run(execution_id=promoted.id)
+
+    async def fail(self, execution_ids: list[int], error: str) -> None:
+        """Fail executions that will not be run.
+
+        Args:
+            execution_ids: The execution IDs.
+            error: The error message.
+
+        """
+        for execution_id in execution_ids:
+            await self._finish(
+                execution_id=execution_id,
+                data={"status": ExecutionStatus.FAILED, "error": error},
+            )
+
+    async def claim_orphaned_followers(
+        self, limit: int
+    ) -> list[tuple[int, int, ExecutionPriority]]:
+        """Claim executions following leaders that finished without them.
+
+        This happens when the process finishing a leader dies before its
+        followers, or when an execution starts following a leader just as it
+        finishes. Claimed executions lead themselves and must be queued.
+
+        Args:
+            limit: The maximum number of executions claimed.
+
+        Returns:
+            The ID, owner user ID and priority class of every claimed execution.
+
+        """
+        async with self._session_factory() as session:
+            return await self._execution_repository.claim_orphaned_followers(
+                session=session, limit=limit
+            )
+
+    def cancel(self, execution_id: int) -> bool:
+        """Cancel an execution if it runs in this process.
+
+        Args:
+            execution_id: The execution ID.
+
+        Returns:
+            True if the execution was running here, False otherwise.
+
+        """
+        task = self._running.get(execution_id)
+        if task is None:
+            return False
+
+        self._cancelled.add(execution_id)
+        task.cancel()
+        return True
+
+    def _watch_cancellations(self) -> None:
+        """Start following cancel signals on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._listener_loop is loop:
+            return
+
+        self._listener_loop = loop
+        self._listener = loop.create_task(self._follow_cancellations())
+
+    async def _follow_cancellations(self) -> None:
+        """Cancel local executions as cancel signals arrive, forever."""
+        async for execution_id in execution_cancellations.listen():
+            self.cancel(execution_id=execution_id)
+
+    async def _run_node(
+        self,
+        plan: ExecutionPlan,
+        ready: ReadyNode,
+        context: NodeContext,
+    ) -> Any:  # noqa: ANN401
+        """Run a single node, publishing its progress and recording its run.
+
+        Args:
+            plan: The compiled workflow plan.
+            ready: The node and its upstream outputs.
+            context: The per-execution node context.
+
+        Returns:
+            The node output.
+
+        """
+        node = plan.nodes[ready.index]
+        started = time.perf_counter()
+        # Timestamp columns are naive UTC, like the server-side now() defaults.
+        started_at = datetime.now(tz=UTC).replace(tzinfo=None)
+        await self._publish(
+            context=context, event_type=ExecutionEventType.NODE_STARTED, node_id=node.id
+        )
+
+        cached, error = False, None
+        try:
+            cached, output = await self._execute_node(
+                plan=plan, ready=ready, context=context
+            )
+            if node.id in context.cached:
+                context.cached.discard(node.id)
+                cached = True
+        except asyncio.CancelledError:
+            error = "Cancelled"
+            raise
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            finished = time.perf_counter()
+            waited = started - ready.ready_at
+            usage = context.usage.pop(node.id, {})
+            context.node_runs.append(
+                {
+                    "node_id": node.id,
+                    "node_type": node.type,
+                    "queued_at": started_at
+                    - timedelta(seconds=started - ready.ready_at),
+                    "started_at": started_at,
+                    "finished_at": started_at + timedelta(seconds=finished - started),
+                    "queue_wait_ms": waited * 1000,
+                    "duration_ms": (finished - started) * 1000,
+                    "prompt_tokens": usage.get("prompt_tokens"),
+                    "completion_tokens": usage.get("completion_tokens"),
+                    "cached": cached,
+                    "error": error,
+                }
+            )
+
+        if context.execution_id is not None:
+            await execution_checkpoints.save(
+                execution_id=context.execution_id,
+                version=plan.version,
+                node_id=node.id,
+                output=output,
+            )
+        await self._publish(
+            context=context,
+            event_type=ExecutionEventType.NODE_FINISHED,
+            node_id=node.id,
+            data={"output": output, "cached": cached},
+        )
+
+        return output
+
+    async def _execute_node(
+        self,
+        plan: ExecutionPlan,
+        ready: ReadyNode,
+        context: NodeContext,
+    ) -> tuple[bool, Any]:
+        """Run a node handler, serving memoized outputs when inputs are unchanged.
+
+        The memo key covers the node type, its data and the digests of its
+        upstream outputs, so editing one node only recomputes that node and
+        whatever its new output flows into. Concurrent runs of the same key,
+        such as identical prompts across a batch, share one handler call,
+        whose tokens and usage reach every execution sharing it.
+        LLM nodes sampling a fresh completion on every run are only reused
+        by their owner, see `_execute_sampled`.
+
+        Args:
+            plan: The compiled workflow plan.
+            ready: The node and its upstream outputs.
+            context: The per-execution node context.
+
+        Returns:
+            Whether the output was served without running the node, and the
+            node output.
+
+        """
+        node = plan.nodes[ready.index]
+        handler = NODE_HANDLERS[node.type]
+        if node.type not in MEMOIZED_NODE_TYPES or node.data.get("memoize") is False:
+            return False, await handler(node, ready.inputs, context)
+        if not reuses_completion(node=node):
+            return await self._execute_sampled(plan=plan, ready=ready, context=context)
+
+        key = digest(plan.config_digests[ready.index], ready.input_digests)
+        cached, output = await node_output_store.get(key=key)
+        if cached:
+            return True, output
+
+        # Joined before awaiting, so no token of the shared run is missed.
+        shared = self._shared_runs.get(key)
+        if shared is not None:
+            shared.join(context=context, node_id=node.id)
+
+        return await self._single_flight.do(
+            key=key,
+            fn=partial(self._share, handler, node, ready.inputs, context, key),
+        )
+
+    async def _execute_sampled(
+        self,
+        plan: ExecutionPlan,
+        ready: ReadyNode,
+        context: NodeContext,
+    ) -> tuple[bool, Any]:
+        """Run a sampling node, reusing its owner's sample from an older version.
+
+        While a user iterates on one node of a workflow, the nodes upstream
+        of it keep their sample from before the edit instead of drawing a
+        new one on every run. Samples are keyed by owner and workflow and
+        stamped with the workflow version they answered, so running the
+        same version again, or another user's run, still samples afresh.
+
+        Args:
+            plan: The compiled workflow plan.
+            ready: The node and its upstream outputs.
+            context: The per-execution node context.
+
+        Returns:
+            Whether the output was served without running the node, and the
+            node output.
+
+        """
+        node = plan.nodes[ready.index]
+        handler = NODE_HANDLERS[node.type]
+        if context.owner_id is None:
+            return False, await handler(node, ready.inputs, context)
+
+        key = digest(
+            "owner",
+            context.owner_id,
+            plan.workflow_id,
+            plan.config_digests[ready.index],
+            ready.input_digests,
+        )
+        cached, sample = await node_output_store.get(key=key)
+        if cached and sample["version"] != plan.version:
+            output = sample["output"]
+        else:
+            cached = False
+            output = await handler(node, ready.inputs, context)
+        await node_output_store.set(
+            key=key, value={"version": plan.version, "output": output}
+        )
+
+        return cached, output
+
+    def _share(
+        self,
+        handler: NodeHandler,
+        node: Node,
+        inputs: list[Any],
+        context: NodeContext,
+        key: str,
+    ) -> Awaitable[Any]:
+        """Start a memoized node run that executions awaiting its key join.
+
+        Args:
+            handler: The node handler.
+            node: The node.
+            inputs: The upstream outputs.
+            context: The context of the execution starting the run.
+            key: The memo key.
+
+        Returns:
+            The node run.
+
+        """
+        shared = SharedRun(node_id=node.id)
+        shared.join(context=context, node_id=node.id)
+        self._shared_runs[key] = shared
+
+        return self._compute(handler, node, inputs, shared.run_context(context), key)
+
+    async def _compute(
+        self,
+        handler: NodeHandler,
+        node: Node,
+        inputs: list[Any],
+        context: NodeContext,
+        key: str,
+    ) -> Any:  # noqa: ANN401
+        """Run a memoized node handler and store its output.
+
+        The run stays joinable until its output is stored and its usage
+        handed out, so an execution missing the store joins it in time.
+
+        Args:
+            handler: The node handler.
+            node: The node.
+            inputs: The upstream outputs.
+            context: The context of the shared run.
+            key: The memo key.
+
+        Returns:
+            The node output.
+
+        """
+        try:
+            output = await handler(node, inputs, context)
+            await node_output_store.set(key=key, value=output)
+            await self._shared_runs[key].finish(context=context)
+        finally:
+            self._shared_runs.pop(key)
+
+        return output
+
+    @staticmethod
+    async def _publish(
+        context: NodeContext,
+        event_type: ExecutionEventType,
+        node_id: int,
+        data: dict[str, Any] | None = None,
+    ) -> None:
+        """Publish a node event when the context belongs to an execution.
+
+        Args:
+            context: The per-execution node context.
+            event_type: The event type.
+            node_id: The node ID.
+            data: The event payload.
+
+        """
+        if context.execution_id is None:
+            return
+
+        await execution_events.publish(
+            execution_id=context.execution_id,
+            event_type=event_type,
+            node_id=node_id,
+            data=data,
+        )
+
+    async def _finish(
+        self,
+        execution_id: int,
+        data: dict[str, Any],
+        node_runs: list[dict[str, Any]] | None = None,
+    ) -> Execution | None:
+        """Persist the final state of an execution and announce it.
+
+        Large outputs are offloaded to the blob store; the announcement still
+        carries the whole output. Executions following this one are finished
+        with the same outcome, unless it was cancelled: its oldest follower
+        then leads the others instead, and is returned for running.
+
+        Args:
+            execution_id: The execution ID.
+            data: The final status and its output or error.
+            node_runs: The run records of the nodes that ran, with the start
+                time of the execution they are partitioned on.
+
+        Returns:
+            The promoted follower, if any.
+
+        """
+        row = data
+        if data.get("output_data") is not None:
+            output_data, output_blob = await blob_store.offload(
+                value=data["output_data"]
+            )
+            row = {**data, "output_data": output_data, "output_blob": output_blob}
+        row = {**row, "finished_at": func.now()}
+
+        promoted = None
+        async with self._session_factory() as session:
+            if node_runs:
+                await self._execution_node_run_repository.create_batch(
+                    session=session,
+                    data=[
+                        {**node_run, "execution_id": execution_id}
+                        for node_run in node_runs
+                    ],
+                )
+            # A cancel request already finished and announced it.
+            finished = (
+                [execution_id]
+                if await self._execution_repository.finish_unfinished(
+                    session=session, execution_id=execution_id, data=row
+                )
+                else []
+            )
+            if engine_settings.dedupe and data["status"] == ExecutionStatus.CANCELLED:
+                promoted = await self._execution_repository.promote_follower(
+                    session=session, leader_id=execution_id
+                )
+            elif engine_settings.dedupe:
+                await execution_flights.land(execution_id=execution_id)
+                finished += await self._execution_repository.finish_followers(
+                    session=session, leader_id=execution_id, data=row
+                )
+
+        if promoted is not None:
+            await execution_flights.hand_over(
+                execution_id=execution_id, successor_id=promoted.id
+            )
+        for target in finished:
+            await execution_events.publish(
+                execution_id=target,
+                event_type=ExecutionEventType.EXECUTION_FINISHED,
+                data=data,
+            )
+
+        return promoted
+
+    @staticmethod
+    def _skip_completed(
+        plan: ExecutionPlan,
+        completed: dict[int, Any],
+        in_degree: list[int],
+        outputs: list[Any],
+        output_digests: list[str],
+    ) -> list[int]:
+        """Fill in the outputs of completed nodes and find the frontier.
+
+        Args:
+            plan: The compiled workflow plan.
+            completed: The outputs of nodes already completed, keyed by node ID.
+            in_degree: The pending upstream counts, updated in place.
+            outputs: The node outputs, updated in place.
+            output_digests: The node output digests, updated in place.
+
+        Returns:
+            The indices of the nodes ready to run.
+
+        """
+        ready = []
+        for level in plan.levels:
+            for node_index in level:
+                node_id = plan.node_ids[node_index]
+                if in_degree[node_index]:
+                    continue
+                if node_id not in completed:
+                    ready.append(node_index)
+                    continue
+
+                outputs[node_index] = completed[node_id]
+                output_digests[node_index] = digest(outputs[node_index])
+                for target in plan.successors(node_index):
+                    in_degree[target] -= 1
+
+        return ready
+
+    async def run_graph(
+        self,
+        plan: ExecutionPlan,
+        context: NodeContext,
+        completed: dict[int, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Run the nodes of a plan, starting each one as soon as it is ready.
+
+        At most `node_concurrency` nodes run at once. When more are ready,
+        the ones with the longest remaining path to an OUTPUT node start
+        first, so the chain that bounds the run never waits behind side
+        branches. Completed nodes whose upstream nodes all completed too are
+        not run again; the run starts from the frontier they leave.
+
+        Args:
+            plan: The compiled workflow plan.
+            context: The per-execution node context.
+            completed: The outputs of nodes already completed, keyed by node ID.
+
+        Returns:
+            The outputs of OUTPUT nodes keyed by their output key.
+
+        """
+        in_degree = list(plan.in_degree)
+        frontier = list(plan.levels[0]) if plan.levels else []
+        outputs: list[Any] = [None] * len(plan.nodes)
+        output_digests: list[str] = [""] * len(plan.nodes)
+        if completed:
+            frontier = self._skip_completed(
+                plan=plan,
+                completed=completed,
+                in_degree=in_degree,
+                outputs=outputs,
+                output_digests=output_digests,
+            )
+        now = time.perf_counter()
+        ready = [(-plan.ranks[i], i, now) for i in frontier]
+        heapq.heapify(ready)
+        pending: dict[asyncio.Task, int] = {}
+
+        try:
+            while ready or pending:
+                while ready and len(pending) < engine_settings.node_concurrency:
+                    _, node_index, ready_at = heapq.heappop(ready)
+                    sources = plan.predecessors(node_index)
+                    task = asyncio.create_task(
+                        self._run_node(
+                            plan=plan,
+                            ready=ReadyNode(
+                                index=node_index,
+                                inputs=[outputs[source] for source in sources],
+                                input_digests=[
+                                    output_digests[source] for source in sources
+                                ],
+                                ready_at=ready_at,
+                            ),
+                            context=context,
+                        )
+                    )
+                    pending[task] = node_index
+
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                now = time.perf_counter()
+                for task in done:
+                    node_index = pending.pop(task)
+                    outputs[node_index] = task.result()
+                    output_digests[node_index] = digest(outputs[node_index])
+
+                    for target in plan.successors(node_index):
+                        in_degree[target] -= 1
+                        if in_degree[target] == 0:
+                            heapq.heappush(ready, (-plan.ranks[target], target, now))
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        return {
+            str(node.data.get("output_key") or node.id): outputs[node_index]
+            for node_index, node in enumerate(plan.nodes)
+            if node.type == NodeType.OUTPUT
+        }
+
+
+execution_engine = ExecutionEngine()
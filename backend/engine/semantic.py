@@ -0,0 +1,151 @@
+"""Similarity cache of LLM completions on a Chroma collection."""
+
+import logging
+import time
+from dataclasses import dataclass
+from http import HTTPStatus
+
+import httpx
+
+from settings import engine_settings
+from utils.chroma import get_or_create_collection, query, upsert
+from utils.hashing import digest
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class SemanticScope:
+    """The records a prompt may be answered from."""
+
+    owner_id: int
+    key: str
+
+
+class SemanticCache:
+    """Chroma collection of answered prompts searched by embedding similarity.
+
+    Records are scoped by the owner of the workflow and a digest of the
+    provider, base URL, model and sampling options, so a prompt only matches
+    prompts of the same user sent to the same model with the same options.
+    Unlike exact requests, similar prompts differ, and sharing their
+    completions across users would leak them. Chroma has no expiry; records
+    older than the TTL are filtered out of lookups instead. Chroma errors are
+    treated as misses so that a cache outage never fails an execution.
+    """
+
+    def __init__(self, collection: str, ttl: int) -> None:
+        """Initialize the cache without contacting Chroma.
+
+        Args:
+            collection: The name of the collection holding the records.
+            ttl: The seconds a record can be returned after it was stored.
+
+        """
+        self._collection = collection
+        self._ttl = ttl
+        self._collection_id: str | None = None
+
+    async def _get_collection_id(self, client: httpx.AsyncClient) -> str:
+        """Return the collection ID, creating the collection on first use."""
+        if self._collection_id is None:
+            self._collection_id = await get_or_create_collection(
+                client=client,
+                name=self._collection,
+                metadata={"hnsw:space": "cosine"},
+            )
+
+        return self._collection_id
+
+    async def get(
+        self,
+        client: httpx.AsyncClient,
+        scope: SemanticScope,
+        embedding: list[float],
+        threshold: float,
+    ) -> str | None:
+        """Return the completion of the most similar prompt above a threshold.
+
+        Args:
+            client: The HTTP client.
+            scope: The owner and model scope of the prompt.
+            embedding: The prompt embedding.
+            threshold: The minimum cosine similarity of a hit.
+
+        Returns:
+            The cached completion, or None on a miss.
+
+        """
+        try:
+            neighbours = await query(
+                client=client,
+                collection_id=await self._get_collection_id(client=client),
+                embedding=embedding,
+                where={
+                    "$and": [
+                        {"owner_id": scope.owner_id},
+                        {"scope": scope.key},
+                        {"stored_at": {"$gte": time.time() - self._ttl}},
+                    ]
+                },
+            )
+        except httpx.HTTPError as e:
+            self._forget_collection(error=e)
+            return None
+
+        if not neighbours or 1 - neighbours[0]["distance"] < threshold:
+            return None
+
+        return neighbours[0]["metadata"]["response"]
+
+    async def set(
+        self,
+        client: httpx.AsyncClient,
+        scope: SemanticScope,
+        embedding: list[float],
+        prompt: str,
+        response: str,
+    ) -> None:
+        """Store the completion of a prompt, replacing an earlier one.
+
+        Args:
+            client: The HTTP client.
+            scope: The owner and model scope of the prompt.
+            embedding: The prompt embedding.
+            prompt: The prompt.
+            response: The completion.
+
+        """
+        try:
+            await upsert(
+                client=client,
+                collection_id=await self._get_collection_id(client=client),
+                ids=[digest(scope.owner_id, scope.key, prompt)],
+                embeddings=[embedding],
+                documents=[prompt],
+                metadatas=[
+                    {
+                        "owner_id": scope.owner_id,
+                        "scope": scope.key,
+                        "stored_at": time.time(),
+                        "response": response,
+                    }
+                ],
+            )
+        except httpx.HTTPError as e:
+            self._forget_collection(error=e)
+
+    def _forget_collection(self, error: httpx.HTTPError) -> None:
+        """Log a failed request, dropping the collection ID if it is gone."""
+        logger.warning("Semantic cache unavailable: %s", error)
+        if (
+            isinstance(error, httpx.HTTPStatusError)
+            and error.response.status_code == HTTPStatus.NOT_FOUND
+        ):
+            self._collection_id = None
+
+
+semantic_cache = SemanticCache(
+    collection=engine_settings.semantic_cache_collection,
+    ttl=engine_settings.completion_cache_ttl,
+)
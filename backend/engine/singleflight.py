@@ -0,0 +1,49 @@
+"""Collapse concurrent calls for the same key into one."""
+
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable
+
+
+class SingleFlight[T]:
+    """Share one in-flight call among every caller asking for the same key.
+
+    The first caller starts the call; callers arriving before it finishes
+    await the same task instead of repeating the work. The call is only
+    cancelled once every caller waiting on it has been cancelled.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the single-flight group."""
+        self._calls: dict[str, asyncio.Task[T]] = {}
+        self._waiters: Counter[str] = Counter()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> tuple[bool, T]:
+        """Run a call once per key at a time.
+
+        Args:
+            key: The call key.
+            fn: The coroutine function computing the value.
+
+        Returns:
+            Whether the value came from another caller, and the value.
+
+        """
+        task = self._calls.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+
+        self._waiters[key] += 1
+        try:
+            return shared, await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[key] == 1:
+                task.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if self._waiters[key] <= 0:
+                del self._waiters[key]
@@ -0,0 +1,156 @@
+"""Cluster-wide admission slots of queued and running executions."""
+
+import time
+import uuid
+
+import redis.asyncio as redis
+
+from exceptions import ExecutionQueueFullError, ExecutionRateLimitError
+from settings import executor_settings
+from utils.redis import redis_client
+
+# Drop expired slots, then take the tokens in the user and global sets if both
+# have room for all of them.
+_ACQUIRE = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+local count = #ARGV - 5
+if redis.call('ZCARD', KEYS[1]) + count > tonumber(ARGV[3]) then
+    return 1
+end
+if redis.call('ZCARD', KEYS[2]) + count > tonumber(ARGV[4]) then
+    return 2
+end
+for i = 6, #ARGV do
+    redis.call('ZADD', KEYS[1], ARGV[2], ARGV[i])
+    redis.call('ZADD', KEYS[2], ARGV[2], ARGV[i])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+redis.call('EXPIRE', KEYS[2], ARGV[5])
+return 0
+"""
+
+_USER_LIMITED = 1
+_GLOBAL_LIMITED = 2
+
+
+class ExecutionSlots:
+    """Expiring Redis semaphores bounding executions per user and overall.
+
+    Every admitted execution holds a slot in the sorted set of its user and
+    in the global one, scored by the time the slot expires; a batch holds one
+    per execution it runs at once. Executors renew
+    the slots of their queued and running jobs and release them when the
+    jobs finish, so the slots of a process that died expire instead of
+    counting against the limits forever.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        ttl: int,
+        retry_after: int,
+        prefix: str = "execution-slots",
+    ) -> None:
+        """Initialize the slots.
+
+        Args:
+            client: The Redis client.
+            ttl: The seconds a slot lasts without being renewed.
+            retry_after: The Retry-After seconds of rejected reservations.
+            prefix: The key prefix.
+
+        """
+        self._client = client
+        self._ttl = ttl
+        self._retry_after = retry_after
+        self._prefix = prefix
+        self._acquire = client.register_script(_ACQUIRE)
+
+    def _user_key(self, user_id: int) -> str:
+        """Return the key holding the slots of a user."""
+        return f"{self._prefix}:user:{user_id}"
+
+    def _global_key(self) -> str:
+        """Return the key holding the slots of all users."""
+        return f"{self._prefix}:all"
+
+    async def acquire(
+        self, user_id: int, user_limit: int, global_limit: int, count: int = 1
+    ) -> list[str]:
+        """Take slots for a user if they and the cluster have room for all.
+
+        Args:
+            user_id: The user ID.
+            user_limit: The slots a user may hold.
+            global_limit: The slots all users may hold together.
+            count: The slots to take.
+
+        Returns:
+            The tokens of the slots.
+
+        Raises:
+            ExecutionRateLimitError: If the user is at their limit.
+            ExecutionQueueFullError: If the cluster is at its limit.
+            redis.RedisError: If Redis is unavailable.
+
+        """
+        tokens = [uuid.uuid4().hex for _ in range(count)]
+        now = time.time()
+        result = await self._acquire(
+            keys=[self._user_key(user_id=user_id), self._global_key()],
+            args=[now, now + self._ttl, user_limit, global_limit, self._ttl, *tokens],
+        )
+        if result == _USER_LIMITED:
+            raise ExecutionRateLimitError(retry_after=self._retry_after)
+        if result == _GLOBAL_LIMITED:
+            raise ExecutionQueueFullError(retry_after=self._retry_after)
+        return tokens
+
+    async def renew(self, slots: dict[str, int]) -> None:
+        """Extend slots held by this process.
+
+        Args:
+            slots: The user IDs of the slots, by token.
+
+        Raises:
+            redis.RedisError: If Redis is unavailable.
+
+        """
+        if not slots:
+            return
+
+        expires = time.time() + self._ttl
+        async with self._client.pipeline(transaction=False) as pipe:
+            for token, user_id in slots.items():
+                pipe.zadd(self._user_key(user_id=user_id), {token: expires})
+                pipe.expire(self._user_key(user_id=user_id), self._ttl)
+            pipe.zadd(self._global_key(), dict.fromkeys(slots, expires))
+            pipe.expire(self._global_key(), self._ttl)
+            await pipe.execute()
+
+    async def release(self, tokens: list[str], user_id: int) -> None:
+        """Give back slots.
+
+        Args:
+            tokens: The tokens of the slots.
+            user_id: The user ID the slots were taken for.
+
+        Raises:
+            redis.RedisError: If Redis is unavailable.
+
+        """
+        if not tokens:
+            return
+
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.zrem(self._user_key(user_id=user_id), *tokens)
+            pipe.zrem(self._global_key(), *tokens)
+            await pipe.execute()
+
+
+execution_slots = ExecutionSlots(
+    client=redis_client,
+    ttl=executor_settings.execution_lease,
+    retry_after=executor_settings.retry_after,
+)
@@ -0,0 +1,187 @@
+"""Supervisor resuming executions abandoned by dead API workers."""
+
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+
+import redis.asyncio as redis
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from engine.lease import ExecutionLeases, execution_leases
+from engine.runner import ExecutionEngine, execution_engine
+from enums import ExecutionStatus
+from repositories import ExecutionRepository
+from sessions import async_session
+from settings import executor_settings
+
+logger = logging.getLogger(__name__)
+
+# Executions read per query while looking for unleased ones.
+SWEEP_PAGE_SIZE = 100
+
+
+class ExecutionSupervisor:
+    """Resume RUNNING executions whose lease expired from their checkpoints.
+
+    CREATED executions lost with the queue of a worker that died, and
+    executions left following a leader that finished without them, are run
+    too.
+
+    Every API worker runs a supervisor; the lease claim makes sure only one
+    of them resumes a given execution. Executions run from the queue are
+    reclaimed by the queue itself, and Prefect flow runs are reconciled by
+    the sync flow, so only in-process executions are supervised.
+    """
+
+    def __init__(
+        self,
+        engine: ExecutionEngine,
+        leases: ExecutionLeases,
+        interval: int,
+        limit: int,
+        session_factory: async_sessionmaker[AsyncSession] = async_session,
+    ) -> None:
+        """Initialize the supervisor.
+
+        Args:
+            engine: The engine resuming the executions.
+            leases: The execution leases.
+            interval: The seconds between sweeps.
+            limit: The number of executions resumed at once.
+            session_factory: The factory used to open database sessions.
+
+        """
+        self._engine = engine
+        self._leases = leases
+        self._interval = interval
+        self._limit = limit
+        self._session_factory = session_factory
+        self._execution_repository = ExecutionRepository()
+        self._task: asyncio.Task | None = None
+        self._jobs: set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        """Start sweeping on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._supervise())
+
+    async def stop(self) -> None:
+        """Stop sweeping and cancel the executions resumed here.
+
+        Their leases are released, so another supervisor resumes them.
+        """
+        tasks = [*self._jobs, *([self._task] if self._task else [])]
+        self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _supervise(self) -> None:
+        """Sweep for abandoned executions periodically, forever."""
+        while True:
+            try:
+                await self._sweep()
+            except (redis.RedisError, SQLAlchemyError):
+                logger.exception("Execution supervision failed")
+            await asyncio.sleep(self._interval)
+
+    async def _sweep(self) -> None:
+        """Run abandoned RUNNING and lost CREATED executions, then orphans.
+
+        CREATED executions are only taken once they went unleased for longer
+        than a lease lasts, so a worker is never raced between committing an
+        execution and queuing it.
+        """
+        await self._recover(status=ExecutionStatus.RUNNING)
+        now = datetime.now(tz=UTC).replace(tzinfo=None)
+        await self._recover(
+            status=ExecutionStatus.CREATED,
+            started_before=now - timedelta(seconds=self._leases.ttl),
+        )
+
+        free = self._limit - len(self._jobs)
+        if free <= 0:
+            return
+
+        for execution_id, _, _ in await self._engine.claim_orphaned_followers(
+            limit=free
+        ):
+            logger.warning("Running execution %s left by its leader", execution_id)
+            self._spawn(execution_id=execution_id, resume=False)
+
+    async def _recover(
+        self, status: ExecutionStatus, started_before: datetime | None = None
+    ) -> None:
+        """Run executions in a status that no live process holds a lease on.
+
+        Executions are paged through oldest first until the free workers are
+        taken, so leased ones never hide abandoned ones behind them.
+
+        Args:
+            status: The execution status.
+            started_before: The start time the executions precede, if any.
+
+        """
+        after = None
+        while len(self._jobs) < self._limit:
+            async with self._session_factory() as session:
+                executions = await self._execution_repository.get_in_process(
+                    session=session,
+                    status=status,
+                    limit=SWEEP_PAGE_SIZE,
+                    after=after,
+                    started_before=started_before,
+                )
+            if not executions:
+                return
+
+            after = (executions[-1].started_at, executions[-1].id)
+            execution_ids = [execution.id for execution in executions]
+            held = await self._leases.held(execution_ids=execution_ids)
+            for execution_id, alive in zip(execution_ids, held, strict=True):
+                if len(self._jobs) >= self._limit:
+                    return
+                if alive or not await self._leases.claim(execution_id=execution_id):
+                    continue
+
+                logger.warning(
+                    "Running abandoned %s execution %s", status, execution_id
+                )
+                self._spawn(
+                    execution_id=execution_id,
+                    resume=status == ExecutionStatus.RUNNING,
+                )
+
+    def _spawn(self, execution_id: int, *, resume: bool) -> None:
+        """Run an execution in the background.
+
+        Args:
+            execution_id: The execution ID.
+            resume: Whether the execution restarts from its checkpoint.
+
+        """
+        task = asyncio.create_task(self._run(execution_id=execution_id, resume=resume))
+        self._jobs.add(task)
+        task.add_done_callback(self._jobs.discard)
+
+    async def _run(self, execution_id: int, *, resume: bool) -> None:
+        """Run an execution, logging instead of failing.
+
+        Args:
+            execution_id: The execution ID.
+            resume: Whether the execution restarts from its checkpoint.
+
+        """
+        try:
+            await self._engine.run_batch(execution_ids=[execution_id], resume=resume)
+        except Exception:
+            logger.exception("Supervised execution %s crashed", execution_id)
+
+
+execution_supervisor = ExecutionSupervisor(
+    engine=execution_engine,
+    leases=execution_leases,
+    interval=executor_settings.execution_heartbeat,
+    limit=executor_settings.workers,
+)
@@ -0,0 +1,299 @@
+"""Incrementally maintained topological order of workflow graphs."""
+
+from collections import Counter, OrderedDict, deque
+from collections.abc import Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from exceptions import EdgeCycleError
+from repositories import EdgeRepository
+from settings import engine_settings
+
+
+class TopologicalOrder:
+    """Pearce-Kelly dynamic topological order of one workflow graph.
+
+    Every node with an edge holds a position, and edges always point from a
+    lower to a higher position. An edge breaking that rule only searches and
+    reorders the nodes positioned between its two ends, so checking it for a
+    cycle does not walk the whole graph.
+    """
+
+    def __init__(self, workflow_id: int, version: int) -> None:
+        """Initialize an empty order.
+
+        Args:
+            workflow_id: The workflow ID.
+            version: The workflow graph version the order reflects.
+
+        """
+        self.workflow_id = workflow_id
+        self.version = version
+        self._position: dict[int, int] = {}
+        self._successors: dict[int, Counter[int]] = {}
+        self._predecessors: dict[int, Counter[int]] = {}
+        self._next_position = 0
+
+    @classmethod
+    def build(
+        cls, workflow_id: int, version: int, edges: Iterable[tuple[int, int]]
+    ) -> "TopologicalOrder":
+        """Order a whole graph from scratch.
+
+        Args:
+            workflow_id: The workflow ID.
+            version: The workflow graph version.
+            edges: The source and target node IDs of every edge.
+
+        Returns:
+            The order.
+
+        Raises:
+            EdgeCycleError: If the graph contains a cycle.
+
+        """
+        order = cls(workflow_id=workflow_id, version=version)
+        for source, target in edges:
+            order._link(source=source, target=target)
+
+        in_degree = {
+            node: sum(sources.values()) for node, sources in order._predecessors.items()
+        }
+        nodes = sorted(order._successors.keys() | order._predecessors.keys())
+        ready = deque(node for node in nodes if not in_degree.get(node))
+        while ready:
+            node = ready.popleft()
+            order._place(node=node)
+            for target, count in order._successors.get(node, {}).items():
+                in_degree[target] -= count
+                if in_degree[target] == 0:
+                    ready.append(target)
+
+        if len(order._position) != len(nodes):
+            raise EdgeCycleError
+
+        return order
+
+    def add_edge(self, source: int, target: int) -> None:
+        """Add an edge, moving the nodes between its ends if needed.
+
+        Args:
+            source: The source node ID.
+            target: The target node ID.
+
+        Raises:
+            EdgeCycleError: If the edge would close a cycle, in which case the
+                order is left unchanged.
+
+        """
+        if source == target:
+            raise EdgeCycleError
+
+        upper = self._place(node=source)
+        lower = self._place(node=target)
+        if lower < upper:
+            forward = self._reachable_from(node=target, source=source, upper=upper)
+            backward = self._reaching(node=source, lower=lower)
+            self._reorder(nodes=[*self._sorted(backward), *self._sorted(forward)])
+
+        self._link(source=source, target=target)
+
+    def remove_edge(self, source: int, target: int) -> None:
+        """Remove one edge between two nodes; the order stays valid.
+
+        Args:
+            source: The source node ID.
+            target: The target node ID.
+
+        """
+        for links, node, other in (
+            (self._successors, source, target),
+            (self._predecessors, target, source),
+        ):
+            counts = links.get(node)
+            if counts is None:
+                continue
+            counts[other] -= 1
+            if counts[other] <= 0:
+                del counts[other]
+            if not counts:
+                del links[node]
+
+    def remove_node(self, node: int) -> None:
+        """Remove a node and every edge touching it.
+
+        Args:
+            node: The node ID.
+
+        """
+        for target in list(self._successors.get(node, ())):
+            self._predecessors[target].pop(node, None)
+            if not self._predecessors[target]:
+                del self._predecessors[target]
+        for source in list(self._predecessors.get(node, ())):
+            self._successors[source].pop(node, None)
+            if not self._successors[source]:
+                del self._successors[source]
+
+        self._successors.pop(node, None)
+        self._predecessors.pop(node, None)
+        self._position.pop(node, None)
+
+    def _place(self, node: int) -> int:
+        """Return the position of a node, appending it if it has none."""
+        position = self._position.get(node)
+        if position is None:
+            position = self._position[node] = self._next_position
+            self._next_position += 1
+
+        return position
+
+    def _link(self, source: int, target: int) -> None:
+        """Record an edge in both adjacency maps."""
+        self._successors.setdefault(source, Counter())[target] += 1
+        self._predecessors.setdefault(target, Counter())[source] += 1
+
+    def _reachable_from(self, node: int, source: int, upper: int) -> set[int]:
+        """Collect the nodes reachable from a node and positioned before `upper`.
+
+        Raises:
+            EdgeCycleError: If the source of the new edge is reachable.
+
+        """
+        visited = {node}
+        stack = [node]
+        while stack:
+            for successor in self._successors.get(stack.pop(), ()):
+                if successor == source:
+                    raise EdgeCycleError
+                if successor not in visited and self._position[successor] < upper:
+                    visited.add(successor)
+                    stack.append(successor)
+
+        return visited
+
+    def _reaching(self, node: int, lower: int) -> set[int]:
+        """Collect the nodes reaching a node and positioned after `lower`."""
+        visited = {node}
+        stack = [node]
+        while stack:
+            for predecessor in self._predecessors.get(stack.pop(), ()):
+                if predecessor not in visited and self._position[predecessor] > lower:
+                    visited.add(predecessor)
+                    stack.append(predecessor)
+
+        return visited
+
+    def _sorted(self, nodes: set[int]) -> list[int]:
+        """Sort nodes by their current position."""
+        return sorted(nodes, key=self._position.__getitem__)
+
+    def _reorder(self, nodes: list[int]) -> None:
+        """Reassign the positions held by some nodes in the given node order."""
+        positions = sorted(self._position[node] for node in nodes)
+        for node, position in zip(nodes, positions, strict=True):
+            self._position[node] = position
+
+
+class TopologyCache:
+    """LRU cache holding the topological order of each workflow."""
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_size: The maximum number of workflows kept.
+
+        """
+        self._max_size = max_size
+        self._orders: OrderedDict[int, TopologicalOrder] = OrderedDict()
+
+    def get(self, workflow_id: int, version: int) -> TopologicalOrder | None:
+        """Return the cached order for a workflow version, if any.
+
+        Args:
+            workflow_id: The workflow ID.
+            version: The workflow graph version.
+
+        Returns:
+            The order, or None if it is missing or stale.
+
+        """
+        order = self._orders.get(workflow_id)
+        if not order or order.version != version:
+            return None
+
+        self._orders.move_to_end(workflow_id)
+        return order
+
+    def put(self, order: TopologicalOrder) -> None:
+        """Store an order, evicting the least recently used one when full.
+
+        Args:
+            order: The order.
+
+        """
+        current = self._orders.get(order.workflow_id)
+        if current and current.version > order.version:
+            return
+
+        self._orders[order.workflow_id] = order
+        self._orders.move_to_end(order.workflow_id)
+        while len(self._orders) > self._max_size:
+            self._orders.popitem(last=False)
+
+    def advance(self, workflow_id: int, version: int) -> None:
+        """Move a cached order to the version that follows its own.
+
+        The caller has already applied the change behind the new version. An
+        order more than one version behind missed changes made elsewhere and
+        is dropped.
+
+        Args:
+            workflow_id: The workflow ID.
+            version: The new workflow graph version.
+
+        """
+        order = self._orders.get(workflow_id)
+        if not order:
+            return
+
+        if order.version == version - 1:
+            order.version = version
+        else:
+            del self._orders[workflow_id]
+
+
+topology_cache = TopologyCache(max_size=engine_settings.plan_cache_size)
+
+
+async def load_topology(
+    session: AsyncSession, workflow_id: int, version: int
+) -> TopologicalOrder:
+    """Return the topological order of a workflow, building it on a cache miss.
+
+    Args:
+        session: The session.
+        workflow_id: The workflow ID.
+        version: The workflow graph version.
+
+    Returns:
+        The order for the given workflow version.
+
+    Raises:
+        EdgeCycleError: If the stored graph contains a cycle.
+
+    """
+    order = topology_cache.get(workflow_id=workflow_id, version=version)
+    if order:
+        return order
+
+    edges = await EdgeRepository().get_all(session=session, workflow_id=workflow_id)
+    order = TopologicalOrder.build(
+        workflow_id=workflow_id,
+        version=version,
+        edges=((edge.source_node_id, edge.target_node_id) for edge in edges),
+    )
+    topology_cache.put(order=order)
+
+    return order
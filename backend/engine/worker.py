@@ -0,0 +1,28 @@
+"""Standalone process consuming the execution queue."""
+
+import asyncio
+import logging
+import signal
+
+from engine.queue import execution_stream
+from utils.ollama import ollama_clients
+
+
+async def main() -> None:
+    """Consume the execution queue until SIGINT or SIGTERM is received."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    execution_stream.start()
+    try:
+        await stop.wait()
+    finally:
+        await execution_stream.stop()
+        await ollama_clients.aclose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
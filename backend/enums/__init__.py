@@ -1,10 +1,18 @@
 """Enum exports for the backend domain."""
 
-from enums.execution import ExecutionStatus
+from enums.execution import (
+    ExecutionEventType,
+    ExecutionMode,
+    ExecutionPriority,
+    ExecutionStatus,
+)
 from enums.llm_provider import LLMProviderType
 from enums.node import NodeType
 
 __all__ = [
+    "ExecutionEventType",
+    "ExecutionMode",
+    "ExecutionPriority",
     "ExecutionStatus",
     "LLMProviderType",
     "NodeType",
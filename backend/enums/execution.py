@@ -10,3 +10,33 @@ class ExecutionStatus(StrEnum):
     RUNNING = auto()
     SUCCESS = auto()
     FAILED = auto()
+    CANCELLED = auto()
+
+
+class ExecutionEventType(StrEnum):
+    """Progress events published while an execution runs.
+
+    STREAM_ERROR is never published; it ends a stream whose events can no
+    longer be read.
+    """
+
+    NODE_STARTED = auto()
+    TOKEN = auto()
+    NODE_FINISHED = auto()
+    EXECUTION_FINISHED = auto()
+    STREAM_ERROR = auto()
+
+
+class ExecutionMode(StrEnum):
+    """Where workflow executions are run."""
+
+    LOCAL = auto()
+    PREFECT = auto()
+    QUEUE = auto()
+
+
+class ExecutionPriority(StrEnum):
+    """Scheduling classes of workflow executions."""
+
+    INTERACTIVE = auto()
+    BATCH = auto()
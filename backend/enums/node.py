@@ -9,3 +9,4 @@ class NodeType(StrEnum):
     INPUT = auto()
     LLM = auto()
     OUTPUT = auto()
+    MAP = auto()
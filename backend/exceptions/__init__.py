@@ -2,8 +2,14 @@
 
 from exceptions.auth import AuthCredentialsError
 from exceptions.base import BaseError
-from exceptions.edge import EdgeNodeMismatchError, EdgeNotFoundError
-from exceptions.execution import ExecutionNotFoundError
+from exceptions.edge import EdgeCycleError, EdgeNodeMismatchError, EdgeNotFoundError
+from exceptions.execution import (
+    ExecutionGraphError,
+    ExecutionNotFoundError,
+    ExecutionQueueFullError,
+    ExecutionRateLimitError,
+    NodeExecutionError,
+)
 from exceptions.llm_provider import LLMProviderNotFoundError
 from exceptions.node import NodeNotFoundError
 from exceptions.user import UserAlreadyExistsError, UserNotFoundError
@@ -12,10 +18,15 @@ from exceptions.workflow import WorkflowNotFoundError
 __all__ = [
     "AuthCredentialsError",
     "BaseError",
+    "EdgeCycleError",
     "EdgeNodeMismatchError",
     "EdgeNotFoundError",
+    "ExecutionGraphError",
     "ExecutionNotFoundError",
+    "ExecutionQueueFullError",
+    "ExecutionRateLimitError",
     "LLMProviderNotFoundError",
+    "NodeExecutionError",
     "NodeNotFoundError",
     "UserAlreadyExistsError",
     "UserNotFoundError",
@@ -10,8 +10,10 @@ class BaseError(Exception):
         self,
         message: str = "An error occurred",
         status_code: HTTPStatus = HTTPStatus.INTERNAL_SERVER_ERROR,
+        headers: dict[str, str] | None = None,
     ) -> None:
-        """Initialize the error with a message and HTTP status code."""
+        """Initialize the error with a message, HTTP status code and headers."""
         super().__init__(message)
         self.message = message
         self.status_code = status_code
+        self.headers = headers
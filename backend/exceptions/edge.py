@@ -27,3 +27,15 @@ class EdgeNodeMismatchError(BaseError):
     ) -> None:
         """Initialize the error."""
         super().__init__(message=message, status_code=status_code)
+
+
+class EdgeCycleError(BaseError):
+    """Raised when an edge would close a cycle in the workflow graph."""
+
+    def __init__(
+        self,
+        message: str = "Edge would create a cycle",
+        status_code: HTTPStatus = HTTPStatus.BAD_REQUEST,
+    ) -> None:
+        """Initialize the error."""
+        super().__init__(message=message, status_code=status_code)
@@ -15,3 +15,61 @@ class ExecutionNotFoundError(BaseError):
     ) -> None:
         """Initialize the error."""
         super().__init__(message=message, status_code=status_code)
+
+
+class ExecutionGraphError(BaseError):
+    """Raised when a workflow graph cannot be executed."""
+
+    def __init__(
+        self,
+        message: str = "Workflow graph contains a cycle",
+        status_code: HTTPStatus = HTTPStatus.BAD_REQUEST,
+    ) -> None:
+        """Initialize the error."""
+        super().__init__(message=message, status_code=status_code)
+
+
+class NodeExecutionError(BaseError):
+    """Raised when a node fails during an execution."""
+
+    def __init__(
+        self,
+        message: str = "Node execution failed",
+        status_code: HTTPStatus = HTTPStatus.INTERNAL_SERVER_ERROR,
+    ) -> None:
+        """Initialize the error."""
+        super().__init__(message=message, status_code=status_code)
+
+
+class ExecutionRateLimitError(BaseError):
+    """Raised when a user already has too many executions in progress."""
+
+    def __init__(
+        self,
+        message: str = "Too many executions in progress",
+        status_code: HTTPStatus = HTTPStatus.TOO_MANY_REQUESTS,
+        retry_after: int = 1,
+    ) -> None:
+        """Initialize the error."""
+        super().__init__(
+            message=message,
+            status_code=status_code,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class ExecutionQueueFullError(BaseError):
+    """Raised when the execution queue is full."""
+
+    def __init__(
+        self,
+        message: str = "Execution queue is full",
+        status_code: HTTPStatus = HTTPStatus.SERVICE_UNAVAILABLE,
+        retry_after: int = 1,
+    ) -> None:
+        """Initialize the error."""
+        super().__init__(
+            message=message,
+            status_code=status_code,
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -0,0 +1,11 @@
+"""Prefect flows run by the work pool."""
+
+from flows.execution import execute_batch, execute_workflow, sync_executions
+from flows.partition import maintain_partitions
+
+__all__ = [
+    "execute_batch",
+    "execute_workflow",
+    "maintain_partitions",
+    "sync_executions",
+]
@@ -0,0 +1,183 @@
+"""Prefect flows running workflow executions on the work pool."""
+
+from collections.abc import Awaitable, Callable
+from functools import partial
+from typing import Any, cast
+
+from prefect import flow, get_run_logger, task
+from prefect.cache_policies import NO_CACHE
+from prefect.client.orchestration import get_client
+from prefect.client.schemas.filters import FlowRunFilter, FlowRunFilterId
+from prefect.utilities.annotations import quote
+from sqlalchemy import func
+
+from engine import ExecutionEngine, prefect_executor
+from engine.events import execution_events
+from engine.flight import execution_flights
+from engine.nodes import NodeContext, ReadyNode
+from engine.plan import ExecutionPlan
+from enums import ExecutionEventType, ExecutionStatus
+from models import Execution
+from repositories import ExecutionRepository
+from sessions import async_session
+from settings import executor_settings
+
+
+@task(name="run-node", cache_policy=NO_CACHE)
+async def run_node(node_id: int, run: Callable[[], Awaitable[Any]]) -> Any:  # noqa: ANN401, ARG001
+    """Run one workflow node as a Prefect task.
+
+    Args:
+        node_id: The node ID, recorded as the task parameter.
+        run: The engine callback running the node.
+
+    Returns:
+        The node output.
+
+    """
+    return await run()
+
+
+class PrefectExecutionEngine(ExecutionEngine):
+    """Execution engine that reports every node as a Prefect task run."""
+
+    async def _run_node(
+        self,
+        plan: ExecutionPlan,
+        ready: ReadyNode,
+        context: NodeContext,
+    ) -> Any:  # noqa: ANN401
+        """Run a single node inside its own task run.
+
+        Args:
+            plan: The compiled workflow plan.
+            ready: The node and its upstream outputs.
+            context: The per-execution node context.
+
+        Returns:
+            The node output.
+
+        """
+        node = plan.nodes[ready.index]
+        run = partial(super()._run_node, plan=plan, ready=ready, context=context)
+
+        return await run_node.with_options(task_run_name=f"{node.type}-{node.id}")(
+            node_id=node.id, run=cast("Callable[[], Awaitable[Any]]", quote(run))
+        )
+
+
+@flow(name="execute-workflow")
+async def execute_workflow(execution_id: int) -> None:
+    """Run a workflow execution to completion.
+
+    Args:
+        execution_id: The execution ID.
+
+    """
+    await PrefectExecutionEngine().run(execution_id=execution_id)
+
+
+@flow(name="execute-batch")
+async def execute_batch(execution_ids: list[int]) -> None:
+    """Run a batch of executions of one workflow against a shared plan.
+
+    Nodes are not reported as task runs here, as a batch can hold tens of
+    thousands of executions.
+
+    Args:
+        execution_ids: The IDs of executions sharing one workflow.
+
+    """
+    await ExecutionEngine().run_batch(execution_ids=execution_ids)
+
+
+@flow(name="sync-executions")
+async def sync_executions() -> int:
+    """Fail executions whose flow run ended without finishing them.
+
+    Flow runs that crash, are cancelled or never start leave the execution
+    row behind in CREATED or RUNNING; this reconciles it with Prefect. The
+    executions following a failed one, or any other leader that finished
+    without them, are given flow runs of their own.
+
+    Returns:
+        The number of executions marked as failed.
+
+    """
+    logger = get_run_logger()
+    execution_repository = ExecutionRepository()
+
+    async with async_session() as session:
+        executions = await execution_repository.get_unfinished_flow_runs(
+            session=session
+        )
+    failed = await _fail_ended_flow_runs(executions=executions)
+
+    orphans = await ExecutionEngine().claim_orphaned_followers(
+        limit=executor_settings.queue_size
+    )
+    for execution_id, user_id, priority in orphans:
+        logger.warning("Execution %s was left by its leader", execution_id)
+        await prefect_executor.submit(
+            execution_id=execution_id, user_id=user_id, priority=priority
+        )
+
+    return failed
+
+
+async def _fail_ended_flow_runs(executions: list[Execution]) -> int:
+    """Fail the executions whose flow run is over.
+
+    Args:
+        executions: The unfinished executions handed to a flow run.
+
+    Returns:
+        The number of executions marked as failed.
+
+    """
+    if not executions:
+        return 0
+
+    logger = get_run_logger()
+    execution_repository = ExecutionRepository()
+
+    async with get_client() as client:
+        flow_runs = await client.read_flow_runs(
+            flow_run_filter=FlowRunFilter(
+                id=FlowRunFilterId(
+                    any_=[e.flow_run_id for e in executions if e.flow_run_id]
+                )
+            )
+        )
+    states = {flow_run.id: flow_run.state for flow_run in flow_runs}
+
+    failed = 0
+    for execution in executions:
+        state = states.get(execution.flow_run_id)
+        if state is not None and not state.is_final():
+            continue
+
+        name = state.name if state else "missing"
+        data = {
+            "status": ExecutionStatus.FAILED,
+            "error": f"Flow run ended without finishing the execution ({name})",
+        }
+        async with async_session() as session:
+            updated = await execution_repository.finish_unfinished(
+                session=session,
+                execution_id=execution.id,
+                data={**data, "finished_at": func.now()},
+            )
+        if not updated:
+            continue
+
+        await execution_flights.land(execution_id=execution.id)
+        await execution_events.publish(
+            execution_id=execution.id,
+            event_type=ExecutionEventType.EXECUTION_FINISHED,
+            data=data,
+        )
+        logger.warning("Execution %s failed: flow run %s", execution.id, name)
+        failed += 1
+
+    return failed
@@ -0,0 +1,78 @@
+"""Prefect flow maintaining the monthly partitions of execution tables."""
+
+from datetime import UTC, date, datetime, time
+
+from prefect import flow, get_run_logger
+
+from repositories import ExecutionRepository, PartitionRepository
+from repositories.partition import shift_months
+from sessions import async_session
+from settings import partition_settings
+from utils.blob import blob_store
+
+# Partitioned tables and the timestamp column they are partitioned on.
+PARTITIONED_TABLES = {
+    "executions": "started_at",
+    "execution_node_runs": "execution_started_at",
+}
+
+
+def _month_start(month: date) -> datetime:
+    """Return the naive UTC timestamp a month starts at."""
+    return datetime.combine(month, time())
+
+
+@flow(name="maintain-partitions")
+async def maintain_partitions() -> list[str]:
+    """Create partitions for the coming months and drop expired ones.
+
+    Expired months are detached and dropped whole, so old executions are
+    removed without row-by-row deletes, dead tuples or index bloat. Node runs
+    are partitioned on the start time of their execution, so they leave in
+    the same month as the execution. Blobs of dropped executions are deleted
+    too, unless an execution offloaded the same payload again after the month
+    ended.
+
+    Returns:
+        The names of the dropped partitions.
+
+    """
+    logger = get_run_logger()
+    current = shift_months(month=datetime.now(UTC).date(), months=0)
+    oldest = shift_months(month=current, months=-partition_settings.retention_months)
+
+    execution_repository = ExecutionRepository()
+    dropped = []
+    for table, column in PARTITIONED_TABLES.items():
+        repository = PartitionRepository(table=table, column=column)
+        async with async_session() as session:
+            for month in await repository.get_all(session=session):
+                if month >= oldest:
+                    continue
+
+                end = _month_start(month=shift_months(month=month, months=1))
+                blobs = (
+                    await execution_repository.get_blobs(
+                        session=session,
+                        started_from=_month_start(month=month),
+                        started_before=end,
+                    )
+                    if table == "executions"
+                    else set()
+                )
+                await repository.drop(session=session, month=month)
+                dropped.append(f"{table}_p{month:%Y_%m}")
+                logger.info("Dropped the %s partition of %s", table, f"{month:%Y-%m}")
+
+                if blobs:
+                    deleted = await blob_store.delete(
+                        keys=blobs, before=end.replace(tzinfo=UTC)
+                    )
+                    logger.info("Deleted %s blobs of %s", deleted, f"{month:%Y-%m}")
+
+            for offset in range(partition_settings.premake_months + 1):
+                await repository.create(
+                    session=session, month=shift_months(month=current, months=offset)
+                )
+
+    return dropped
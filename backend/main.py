@@ -1,8 +1,13 @@
 """Graph AI Backend entrypoint."""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
+from engine import execution_stream, execution_supervisor
+from enums import ExecutionMode
 from exceptions import BaseError
 from routers import (
     auth,
@@ -14,8 +19,44 @@ from routers import (
     user,
     workflow,
 )
+from settings import executor_settings
+from utils.ollama import ollama_clients
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Consume the execution queue or supervise in-process executions.
+
+    The pooled Ollama clients are closed on shutdown, after the executions
+    using them have stopped.
+
+    Args:
+        _: The application.
+
+    Yields:
+        Nothing, once the background work is started.
+
+    """
+    consume = (
+        executor_settings.mode == ExecutionMode.QUEUE
+        and executor_settings.queue_consume
+    )
+    supervise = (
+        executor_settings.mode == ExecutionMode.LOCAL and executor_settings.supervise
+    )
+    if consume:
+        execution_stream.start()
+    if supervise:
+        execution_supervisor.start()
+    try:
+        yield
+    finally:
+        await execution_supervisor.stop()
+        await execution_stream.stop()
+        await ollama_clients.aclose()
+
 
-app = FastAPI(title="Graph AI Backend")
+app = FastAPI(title="Graph AI Backend", lifespan=lifespan)
 
 
 @app.exception_handler(exc_class_or_status_code=BaseError)
@@ -27,10 +68,14 @@ async def handle_base_error(_: Request, exc: BaseError) -> JSONResponse:
         exc: The domain error.
 
     Returns:
-        A JSON response with the error detail.
+        A JSON response with the error detail and headers.
 
     """
-    return JSONResponse(status_code=exc.status_code, content={"detail": exc.message})
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.message},
+        headers=exc.headers,
+    )
 
 
 app.include_router(router=health.router)
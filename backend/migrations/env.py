@@ -4,10 +4,12 @@ import asyncio
 from logging.config import fileConfig
 
 from alembic import context
+from alembic.runtime.environment import NameFilterParentNames, NameFilterType
 from sqlalchemy.engine.base import Connection
 from sqlalchemy.ext.asyncio import create_async_engine
 
 from models import Base
+from repositories.partition import is_partition
 from settings import postgres_settings
 
 config = context.config
@@ -20,6 +22,23 @@ config.set_section_option("alembic", "sqlalchemy.url", postgres_settings.url)
 target_metadata = Base.metadata
 
 
+def include_name(
+    name: str | None, type_: NameFilterType, _: NameFilterParentNames
+) -> bool:
+    """Leave partitions, which are managed at run time, out of autogenerate.
+
+    Args:
+        name: The object name.
+        type_: The object type.
+        _: The names of the parent objects.
+
+    Returns:
+        False for partitions, True otherwise.
+
+    """
+    return not (type_ == "table" and name is not None and is_partition(name))
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -54,6 +73,7 @@ def do_run_migrations(connection: Connection) -> None:
         connection=connection,
         target_metadata=target_metadata,
         compare_type=True,
+        include_name=include_name,
     )
 
     with context.begin_transaction():
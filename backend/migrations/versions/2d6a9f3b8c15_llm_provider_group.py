@@ -0,0 +1,36 @@
+"""Add LLM provider load-balancing groups.
+
+Revision ID: 2d6a9f3b8c15
+Revises: 9b4f6e2c1d87
+Create Date: 2026-10-18 23:41:09.372815
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2d6a9f3b8c15"
+down_revision: str | None = "9b4f6e2c1d87"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add the llm_providers.group column."""
+    op.add_column(
+        "llm_providers",
+        sa.Column(
+            "group",
+            sa.String(length=128),
+            nullable=True,
+            comment="Load-balancing group name",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Drop the llm_providers.group column."""
+    op.drop_column("llm_providers", "group")
@@ -0,0 +1,110 @@
+"""Add execution node runs.
+
+Revision ID: 3596bd9f6e3a
+Revises: 4f0c2d8e1a7b
+Create Date: 2026-10-18 13:17:02.557815
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "3596bd9f6e3a"
+down_revision: str | None = "4f0c2d8e1a7b"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create the execution_node_runs table."""
+    op.create_table(
+        "execution_node_runs",
+        sa.Column(
+            "execution_id",
+            sa.Integer(),
+            nullable=False,
+            comment="Parent execution ID",
+        ),
+        sa.Column("node_id", sa.Integer(), nullable=False, comment="Node ID"),
+        sa.Column(
+            "node_type",
+            postgresql.ENUM(
+                "INPUT", "LLM", "OUTPUT", name="nodetype", create_type=False
+            ),
+            nullable=False,
+            comment="Node type at run time",
+        ),
+        sa.Column(
+            "queued_at",
+            sa.DateTime(),
+            nullable=False,
+            comment="Time the node became ready",
+        ),
+        sa.Column(
+            "started_at",
+            sa.DateTime(),
+            nullable=False,
+            comment="Node start time",
+        ),
+        sa.Column(
+            "finished_at",
+            sa.DateTime(),
+            nullable=False,
+            comment="Node end time",
+        ),
+        sa.Column(
+            "queue_wait_ms",
+            sa.Float(),
+            nullable=False,
+            comment="Milliseconds between ready and started",
+        ),
+        sa.Column(
+            "duration_ms",
+            sa.Float(),
+            nullable=False,
+            comment="Milliseconds between started and finished",
+        ),
+        sa.Column(
+            "prompt_tokens",
+            sa.Integer(),
+            nullable=True,
+            comment="Prompt tokens evaluated by the LLM",
+        ),
+        sa.Column(
+            "completion_tokens",
+            sa.Integer(),
+            nullable=True,
+            comment="Tokens generated by the LLM",
+        ),
+        sa.Column(
+            "cached",
+            sa.Boolean(),
+            nullable=False,
+            comment="Whether the output was served without running",
+        ),
+        sa.Column("error", sa.Text(), nullable=True, comment="Error message if failed"),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False, comment="ID"),
+        sa.ForeignKeyConstraint(
+            ["execution_id"], ["executions.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["node_id"], ["nodes.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_execution_node_runs_execution_id"),
+        "execution_node_runs",
+        ["execution_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop the execution_node_runs table."""
+    op.drop_index(
+        op.f("ix_execution_node_runs_execution_id"), table_name="execution_node_runs"
+    )
+    op.drop_table("execution_node_runs")
@@ -0,0 +1,36 @@
+"""Add execution Prefect flow run ID.
+
+Revision ID: 4f0c2d8e1a7b
+Revises: d53515e37456
+Create Date: 2026-10-18 11:04:17.902311
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4f0c2d8e1a7b"
+down_revision: str | None = "d53515e37456"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add the executions.flow_run_id column."""
+    op.add_column(
+        "executions",
+        sa.Column(
+            "flow_run_id",
+            sa.Uuid(),
+            nullable=True,
+            comment="Prefect flow run ID when run on the work pool",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Drop the executions.flow_run_id column."""
+    op.drop_column("executions", "flow_run_id")
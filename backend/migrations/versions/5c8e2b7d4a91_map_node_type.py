@@ -0,0 +1,37 @@
+"""Add the MAP node type.
+
+Revision ID: 5c8e2b7d4a91
+Revises: 7a2d5c19e0b3
+Create Date: 2026-10-18 19:12:40.218734
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c8e2b7d4a91"
+down_revision: str | None = "7a2d5c19e0b3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add MAP to the node types."""
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE nodetype ADD VALUE IF NOT EXISTS 'MAP'")
+
+
+def downgrade() -> None:
+    """Delete MAP nodes and drop MAP from the node types."""
+    op.execute("DELETE FROM execution_node_runs WHERE node_type = 'MAP'")
+    op.execute("DELETE FROM nodes WHERE type = 'MAP'")
+    op.execute("ALTER TYPE nodetype RENAME TO nodetype_old")
+    op.execute("CREATE TYPE nodetype AS ENUM ('INPUT', 'LLM', 'OUTPUT')")
+    for table, column in (("nodes", "type"), ("execution_node_runs", "node_type")):
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE nodetype "
+            f"USING {column}::text::nodetype"
+        )
+    op.execute("DROP TYPE nodetype_old")
@@ -0,0 +1,40 @@
+"""Record the execution each deduplicated execution follows.
+
+Revision ID: 6e1b8d4f2a70
+Revises: 2d6a9f3b8c15
+Create Date: 2026-10-19 09:12:44.218630
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6e1b8d4f2a70"
+down_revision: str | None = "2d6a9f3b8c15"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add the executions.leader_id column."""
+    op.add_column(
+        "executions",
+        sa.Column(
+            "leader_id",
+            sa.Integer(),
+            nullable=True,
+            comment="ID of the identical execution whose run this one follows",
+        ),
+    )
+    op.create_index(
+        op.f("ix_executions_leader_id"), "executions", ["leader_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Drop the executions.leader_id column."""
+    op.drop_index(op.f("ix_executions_leader_id"), table_name="executions")
+    op.drop_column("executions", "leader_id")
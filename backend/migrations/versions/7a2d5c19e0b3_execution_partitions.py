@@ -0,0 +1,169 @@
+"""Partition executions and execution node runs by month.
+
+Revision ID: 7a2d5c19e0b3
+Revises: e3c81a5f9d24
+Create Date: 2026-10-18 17:46:05.530912
+
+"""
+
+import re
+from collections.abc import Sequence
+from datetime import UTC, date, datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7a2d5c19e0b3"
+down_revision: str | None = "e3c81a5f9d24"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+PREMAKE_MONTHS = 2
+
+
+def _shift_months(month: date, months: int) -> date:
+    """Return the first day of the month some months after another."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(year=index // 12, month=index % 12 + 1, day=1)
+
+
+def _get_indexes(table: str) -> list[str]:
+    """Return the definitions of a table's indexes, except its primary key."""
+    return list(
+        op.get_bind().scalars(
+            sa.text(
+                "SELECT pg_get_indexdef(indexrelid) FROM pg_index"
+                " WHERE indrelid = CAST(:table AS regclass) AND NOT indisprimary"
+            ),
+            {"table": table},
+        )
+    )
+
+
+def _create_indexes(definitions: list[str], source: str, table: str) -> None:
+    """Recreate indexes of a dropped table on the table that replaced it."""
+    for definition in definitions:
+        op.execute(
+            re.sub(rf" ON (ONLY )?(\S+\.)?{source} ", f" ON {table} ", definition)
+        )
+
+
+def _partition(table: str, column: str) -> None:
+    """Move a table's rows into a copy partitioned by month on a column.
+
+    Monthly partitions are created from the oldest row up to a few months
+    ahead, next to a default partition catching everything else. The copy
+    keeps every index but the primary key, which must include the column.
+    """
+    op.rename_table(table, f"{table}_unpartitioned")
+    op.execute(f"ALTER INDEX {table}_pkey RENAME TO {table}_unpartitioned_pkey")
+    indexes = _get_indexes(table=f"{table}_unpartitioned")
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {table}_unpartitioned"
+        f" INCLUDING ALL EXCLUDING INDEXES) PARTITION BY RANGE ({column})"
+    )
+    op.create_primary_key(f"{table}_pkey", table, ["id", column])
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+    current = _shift_months(month=datetime.now(UTC).date(), months=0)
+    oldest = op.get_bind().scalar(
+        sa.select(sa.func.min(sa.column(column))).select_from(
+            sa.table(f"{table}_unpartitioned")
+        )
+    )
+    month = _shift_months(month=oldest or current, months=0)
+    while month <= _shift_months(month=current, months=PREMAKE_MONTHS):
+        end = _shift_months(month=month, months=1)
+        op.execute(
+            f"CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table}"
+            f" FOR VALUES FROM ('{month}') TO ('{end}')"
+        )
+        month = end
+
+    op.execute(f"INSERT INTO {table} SELECT * FROM {table}_unpartitioned")  # noqa: S608
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.drop_table(f"{table}_unpartitioned")
+    _create_indexes(definitions=indexes, source=f"{table}_unpartitioned", table=table)
+
+
+def _unpartition(table: str) -> None:
+    """Move a partitioned table's rows back into a single plain table."""
+    op.rename_table(table, f"{table}_partitioned")
+    op.execute(f"ALTER INDEX {table}_pkey RENAME TO {table}_partitioned_pkey")
+    indexes = _get_indexes(table=f"{table}_partitioned")
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {table}_partitioned"
+        " INCLUDING ALL EXCLUDING INDEXES)"
+    )
+    op.create_primary_key(f"{table}_pkey", table, ["id"])
+    op.execute(f"INSERT INTO {table} SELECT * FROM {table}_partitioned")  # noqa: S608
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.drop_table(f"{table}_partitioned")
+    _create_indexes(definitions=indexes, source=f"{table}_partitioned", table=table)
+
+
+def upgrade() -> None:
+    """Partition executions by started_at and node runs by queued_at."""
+    op.drop_constraint(
+        "execution_node_runs_execution_id_fkey",
+        "execution_node_runs",
+        type_="foreignkey",
+    )
+
+    _partition(table="executions", column="started_at")
+    op.create_foreign_key(
+        "executions_workflow_id_fkey",
+        "executions",
+        "workflows",
+        ["workflow_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+    _partition(table="execution_node_runs", column="queued_at")
+    op.create_foreign_key(
+        "execution_node_runs_node_id_fkey",
+        "execution_node_runs",
+        "nodes",
+        ["node_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+
+def downgrade() -> None:
+    """Turn executions and node runs back into plain tables."""
+    _unpartition(table="execution_node_runs")
+    op.create_foreign_key(
+        "execution_node_runs_node_id_fkey",
+        "execution_node_runs",
+        "nodes",
+        ["node_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+    _unpartition(table="executions")
+    op.create_foreign_key(
+        "executions_workflow_id_fkey",
+        "executions",
+        "workflows",
+        ["workflow_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+    # Retention may have dropped executions while their node runs remained.
+    op.execute(
+        "DELETE FROM execution_node_runs"
+        " WHERE execution_id NOT IN (SELECT id FROM executions)"
+    )
+    op.create_foreign_key(
+        "execution_node_runs_execution_id_fkey",
+        "execution_node_runs",
+        "executions",
+        ["execution_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
@@ -0,0 +1,41 @@
+"""Add the execution priority class.
+
+Revision ID: 9b4f6e2c1d87
+Revises: 5c8e2b7d4a91
+Create Date: 2026-10-18 21:03:17.604512
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b4f6e2c1d87"
+down_revision: str | None = "5c8e2b7d4a91"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+priority = sa.Enum("INTERACTIVE", "BATCH", name="executionpriority")
+
+
+def upgrade() -> None:
+    """Add the executions.priority column."""
+    priority.create(op.get_bind())
+    op.add_column(
+        "executions",
+        sa.Column(
+            "priority",
+            priority,
+            server_default="INTERACTIVE",
+            nullable=False,
+            comment="Scheduling class",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Drop the executions.priority column."""
+    op.drop_column("executions", "priority")
+    priority.drop(op.get_bind())
@@ -0,0 +1,51 @@
+"""Add execution cancellation and timeout.
+
+Revision ID: b7e9a14c2f60
+Revises: 3596bd9f6e3a
+Create Date: 2026-10-18 14:02:51.330914
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e9a14c2f60"
+down_revision: str | None = "3596bd9f6e3a"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add the CANCELLED status and the executions.timeout_seconds column."""
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE executionstatus ADD VALUE IF NOT EXISTS 'CANCELLED'")
+
+    op.add_column(
+        "executions",
+        sa.Column(
+            "timeout_seconds",
+            sa.Integer(),
+            nullable=True,
+            comment="Seconds after creation before the execution is cancelled",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Drop the timeout column and fold CANCELLED executions into FAILED."""
+    op.drop_column("executions", "timeout_seconds")
+
+    op.execute("UPDATE executions SET status = 'FAILED' WHERE status = 'CANCELLED'")
+    op.execute("ALTER TYPE executionstatus RENAME TO executionstatus_old")
+    op.execute(
+        "CREATE TYPE executionstatus AS ENUM "
+        "('CREATED', 'RUNNING', 'SUCCESS', 'FAILED')"
+    )
+    op.execute(
+        "ALTER TABLE executions ALTER COLUMN status TYPE executionstatus "
+        "USING status::text::executionstatus"
+    )
+    op.execute("DROP TYPE executionstatus_old")
@@ -0,0 +1,52 @@
+"""Count execution timeouts from the time they start running.
+
+Revision ID: c9d1e4b7a352
+Revises: f3a8c6e1d9b2
+Create Date: 2026-10-21 11:05:12.480931
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c9d1e4b7a352"
+down_revision: str | None = "f3a8c6e1d9b2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add the executions.running_at column."""
+    op.add_column(
+        "executions",
+        sa.Column(
+            "running_at",
+            sa.DateTime(),
+            nullable=True,
+            comment="Time the execution first started running",
+        ),
+    )
+    op.alter_column(
+        "executions",
+        "timeout_seconds",
+        existing_type=sa.Integer(),
+        existing_nullable=True,
+        comment="Seconds of running before the execution is cancelled",
+        existing_comment="Seconds after creation before the execution is cancelled",
+    )
+
+
+def downgrade() -> None:
+    """Drop the executions.running_at column."""
+    op.alter_column(
+        "executions",
+        "timeout_seconds",
+        existing_type=sa.Integer(),
+        existing_nullable=True,
+        comment="Seconds after creation before the execution is cancelled",
+        existing_comment="Seconds of running before the execution is cancelled",
+    )
+    op.drop_column("executions", "running_at")
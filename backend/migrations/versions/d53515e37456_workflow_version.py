@@ -0,0 +1,37 @@
+"""Add workflow graph version.
+
+Revision ID: d53515e37456
+Revises: 96078f6fa6ee
+Create Date: 2026-10-18 09:12:40.518203
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d53515e37456"
+down_revision: str | None = "96078f6fa6ee"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add the workflows.version column."""
+    op.add_column(
+        "workflows",
+        sa.Column(
+            "version",
+            sa.Integer(),
+            server_default="1",
+            nullable=False,
+            comment="Graph version, bumped on node and edge changes",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Drop the workflows.version column."""
+    op.drop_column("workflows", "version")
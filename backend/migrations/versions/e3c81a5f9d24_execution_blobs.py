@@ -0,0 +1,46 @@
+"""Add execution payload blob keys.
+
+Revision ID: e3c81a5f9d24
+Revises: b7e9a14c2f60
+Create Date: 2026-10-18 15:22:41.118406
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3c81a5f9d24"
+down_revision: str | None = "b7e9a14c2f60"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add the executions.input_blob and executions.output_blob columns."""
+    op.add_column(
+        "executions",
+        sa.Column(
+            "input_blob",
+            sa.String(length=64),
+            nullable=True,
+            comment="Blob key of the input data when offloaded",
+        ),
+    )
+    op.add_column(
+        "executions",
+        sa.Column(
+            "output_blob",
+            sa.String(length=64),
+            nullable=True,
+            comment="Blob key of the output data when offloaded",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Drop the executions.input_blob and executions.output_blob columns."""
+    op.drop_column("executions", "output_blob")
+    op.drop_column("executions", "input_blob")
@@ -0,0 +1,141 @@
+"""Partition execution node runs on the start time of their execution.
+
+Revision ID: f3a8c6e1d9b2
+Revises: 6e1b8d4f2a70
+Create Date: 2026-10-20 10:24:37.604118
+
+"""
+
+from collections.abc import Sequence
+from datetime import UTC, date, datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a8c6e1d9b2"
+down_revision: str | None = "6e1b8d4f2a70"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLE = "execution_node_runs"
+PREMAKE_MONTHS = 2
+
+
+def _shift_months(month: date, months: int) -> date:
+    """Return the first day of the month some months after another."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(year=index // 12, month=index % 12 + 1, day=1)
+
+
+def _get_indexes(table: str) -> list[str]:
+    """Return the definitions of a table's indexes, except its primary key."""
+    return list(
+        op.get_bind().scalars(
+            sa.text(
+                "SELECT pg_get_indexdef(indexrelid) FROM pg_index"
+                " WHERE indrelid = CAST(:table AS regclass) AND NOT indisprimary"
+            ),
+            {"table": table},
+        )
+    )
+
+
+def _retire(table: str, suffix: str) -> None:
+    """Rename a partitioned table, its partitions and their indexes away.
+
+    The replacement table reuses the names of the partitions and indexes.
+    """
+    names = op.get_bind().scalars(
+        sa.text(
+            "SELECT c.relname FROM pg_inherits i"
+            " JOIN pg_class c ON c.oid = i.inhrelid"
+            " WHERE i.inhparent = CAST(:table AS regclass)"
+            " UNION ALL"
+            " SELECT c.relname FROM pg_inherits i"
+            " JOIN pg_index x ON x.indrelid = i.inhrelid"
+            " JOIN pg_class c ON c.oid = x.indexrelid"
+            " WHERE i.inhparent = CAST(:table AS regclass)"
+            " UNION ALL"
+            " SELECT c.relname FROM pg_index x"
+            " JOIN pg_class c ON c.oid = x.indexrelid"
+            " WHERE x.indrelid = CAST(:table AS regclass)"
+        ),
+        {"table": table},
+    )
+    for name in list(names):
+        op.execute(f"ALTER TABLE {name} RENAME TO {name}_{suffix}")
+    op.rename_table(table, f"{table}_{suffix}")
+
+
+def _repartition(column: str) -> None:
+    """Move the node runs into a copy partitioned by month on a column.
+
+    Monthly partitions are created from the oldest row up to a few months
+    ahead, next to a default partition catching everything else. The copy
+    keeps every index; the primary key is made of the ID and the column.
+    """
+    indexes = _get_indexes(table=TABLE)
+    _retire(table=TABLE, suffix="old")
+    op.execute(
+        f"CREATE TABLE {TABLE} (LIKE {TABLE}_old"
+        f" INCLUDING ALL EXCLUDING INDEXES) PARTITION BY RANGE ({column})"
+    )
+    op.create_primary_key(f"{TABLE}_pkey", TABLE, ["id", column])
+    op.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+
+    current = _shift_months(month=datetime.now(UTC).date(), months=0)
+    oldest = op.get_bind().scalar(
+        sa.select(sa.func.min(sa.column(column))).select_from(sa.table(f"{TABLE}_old"))
+    )
+    month = _shift_months(month=oldest or current, months=0)
+    while month <= _shift_months(month=current, months=PREMAKE_MONTHS):
+        end = _shift_months(month=month, months=1)
+        op.execute(
+            f"CREATE TABLE {TABLE}_p{month:%Y_%m} PARTITION OF {TABLE}"
+            f" FOR VALUES FROM ('{month}') TO ('{end}')"
+        )
+        month = end
+
+    op.execute(f"INSERT INTO {TABLE} SELECT * FROM {TABLE}_old")  # noqa: S608
+    op.execute(f"ALTER SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id")
+    op.drop_table(f"{TABLE}_old")
+    # Definitions read from a partitioned table build only its own index.
+    for definition in indexes:
+        op.execute(definition.replace(" ON ONLY ", " ON ", 1))
+    op.create_foreign_key(
+        f"{TABLE}_node_id_fkey",
+        TABLE,
+        "nodes",
+        ["node_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+
+def upgrade() -> None:
+    """Add execution_started_at to node runs and partition them on it."""
+    op.add_column(
+        TABLE,
+        sa.Column(
+            "execution_started_at",
+            sa.DateTime(),
+            nullable=True,
+            comment="Parent execution start time",
+        ),
+    )
+    op.execute(
+        f"UPDATE {TABLE} SET execution_started_at = executions.started_at"  # noqa: S608
+        f" FROM executions WHERE executions.id = {TABLE}.execution_id"
+    )
+    # Retention may have dropped executions while their node runs remained.
+    op.execute(f"DELETE FROM {TABLE} WHERE execution_started_at IS NULL")  # noqa: S608
+    op.alter_column(TABLE, "execution_started_at", nullable=False)
+
+    _repartition(column="execution_started_at")
+
+
+def downgrade() -> None:
+    """Partition node runs on queued_at again and drop execution_started_at."""
+    _repartition(column="queued_at")
+    op.drop_column(TABLE, "execution_started_at")
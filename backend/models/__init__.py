@@ -3,6 +3,7 @@
 from models.base import Base, BaseWithDate, BaseWithID
 from models.edge import Edge
 from models.execution import Execution
+from models.execution_node_run import ExecutionNodeRun
 from models.llm_provider import LLMProvider
 from models.node import Node
 from models.user import User
@@ -14,6 +15,7 @@ __all__ = [
     "BaseWithID",
     "Edge",
     "Execution",
+    "ExecutionNodeRun",
     "LLMProvider",
     "Node",
     "User",
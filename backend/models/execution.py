@@ -1,12 +1,14 @@
 """Execution model."""
 
+import uuid
 from datetime import datetime
+from typing import Any, ClassVar
 
-from sqlalchemy import Enum, ForeignKey, Text, func
+from sqlalchemy import DDL, Enum, ForeignKey, Integer, String, Text, Uuid, event, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
-from enums import ExecutionStatus
+from enums import ExecutionPriority, ExecutionStatus
 from models import BaseWithID
 
 
@@ -14,6 +16,9 @@ class Execution(BaseWithID):
     """Workflow execution record."""
 
     __tablename__ = "executions"
+    __table_args__: ClassVar[dict[str, Any]] = {
+        "postgresql_partition_by": "RANGE (started_at)"
+    }
 
     workflow_id: Mapped[int] = mapped_column(
         ForeignKey("workflows.id", ondelete="CASCADE"),
@@ -26,6 +31,12 @@ class Execution(BaseWithID):
         default=ExecutionStatus.CREATED,
         comment="Execution status",
     )
+    priority: Mapped[ExecutionPriority] = mapped_column(
+        Enum(ExecutionPriority),
+        default=ExecutionPriority.INTERACTIVE,
+        server_default=ExecutionPriority.INTERACTIVE.name,
+        comment="Scheduling class",
+    )
     input_data: Mapped[dict | None] = mapped_column(
         JSONB,
         comment="Input data for execution",
@@ -34,10 +45,39 @@ class Execution(BaseWithID):
         JSONB,
         comment="Output data from execution",
     )
+    input_blob: Mapped[str | None] = mapped_column(
+        String(64), comment="Blob key of the input data when offloaded"
+    )
+    output_blob: Mapped[str | None] = mapped_column(
+        String(64), comment="Blob key of the output data when offloaded"
+    )
     error: Mapped[str | None] = mapped_column(Text, comment="Error message if failed")
+    timeout_seconds: Mapped[int | None] = mapped_column(
+        Integer, comment="Seconds of running before the execution is cancelled"
+    )
+    flow_run_id: Mapped[uuid.UUID | None] = mapped_column(
+        Uuid, comment="Prefect flow run ID when run on the work pool"
+    )
+    # Partitioned executions cannot be referenced by ID alone.
+    leader_id: Mapped[int | None] = mapped_column(
+        Integer,
+        index=True,
+        comment="ID of the identical execution whose run this one follows",
+    )
 
     started_at: Mapped[datetime] = mapped_column(
+        primary_key=True,
         server_default=func.now(),
         comment="Execution start time",
     )
+    running_at: Mapped[datetime | None] = mapped_column(
+        comment="Time the execution first started running"
+    )
     finished_at: Mapped[datetime | None] = mapped_column(comment="Execution end time")
+
+
+event.listen(
+    Execution.__table__,
+    "after_create",
+    DDL("CREATE TABLE %(table)s_default PARTITION OF %(table)s DEFAULT"),
+)
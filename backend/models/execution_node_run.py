@@ -0,0 +1,70 @@
+"""Execution node run model."""
+
+from datetime import datetime
+from typing import Any, ClassVar
+
+from sqlalchemy import DDL, Enum, Float, ForeignKey, Integer, Text, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from enums import NodeType
+from models import BaseWithID
+
+
+class ExecutionNodeRun(BaseWithID):
+    """Timing and usage record of one node within an execution."""
+
+    __tablename__ = "execution_node_runs"
+    __table_args__: ClassVar[dict[str, Any]] = {
+        "postgresql_partition_by": "RANGE (execution_started_at)"
+    }
+
+    # Partitioned executions cannot be referenced by ID alone; node runs are
+    # partitioned on the start time of their execution instead, so retention
+    # drops them in the same month as the execution.
+    execution_id: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        index=True,
+        comment="Parent execution ID",
+    )
+    execution_started_at: Mapped[datetime] = mapped_column(
+        primary_key=True, comment="Parent execution start time"
+    )
+    node_id: Mapped[int] = mapped_column(
+        ForeignKey("nodes.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Node ID",
+    )
+    node_type: Mapped[NodeType] = mapped_column(
+        Enum(NodeType),
+        nullable=False,
+        comment="Node type at run time",
+    )
+
+    queued_at: Mapped[datetime] = mapped_column(comment="Time the node became ready")
+    started_at: Mapped[datetime] = mapped_column(comment="Node start time")
+    finished_at: Mapped[datetime] = mapped_column(comment="Node end time")
+    queue_wait_ms: Mapped[float] = mapped_column(
+        Float, comment="Milliseconds between ready and started"
+    )
+    duration_ms: Mapped[float] = mapped_column(
+        Float, comment="Milliseconds between started and finished"
+    )
+
+    prompt_tokens: Mapped[int | None] = mapped_column(
+        Integer, comment="Prompt tokens evaluated by the LLM"
+    )
+    completion_tokens: Mapped[int | None] = mapped_column(
+        Integer, comment="Tokens generated by the LLM"
+    )
+    cached: Mapped[bool] = mapped_column(
+        default=False, comment="Whether the output was served without running"
+    )
+    error: Mapped[str | None] = mapped_column(Text, comment="Error message if failed")
+
+
+event.listen(
+    ExecutionNodeRun.__table__,
+    "after_create",
+    DDL("CREATE TABLE %(table)s_default PARTITION OF %(table)s DEFAULT"),
+)
@@ -37,6 +37,10 @@ class LLMProvider(BaseWithID):
         String(512),
         comment="Custom base URL for self-hosted providers",
     )
+    group: Mapped[str | None] = mapped_column(
+        String(128),
+        comment="Load-balancing group name",
+    )
     is_default: Mapped[bool] = mapped_column(
         Boolean,
         default=False,
@@ -1,6 +1,6 @@
 """Workflow model."""
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from models import BaseWithDate, BaseWithID
@@ -22,3 +22,10 @@ class Workflow(BaseWithID, BaseWithDate):
         nullable=False,
         comment="Workflow name",
     )
+    version: Mapped[int] = mapped_column(
+        Integer,
+        default=1,
+        server_default="1",
+        nullable=False,
+        comment="Graph version, bumped on node and edge changes",
+    )
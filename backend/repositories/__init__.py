@@ -2,16 +2,20 @@
 
 from repositories.edge import EdgeRepository
 from repositories.execution import ExecutionRepository
+from repositories.execution_node_run import ExecutionNodeRunRepository
 from repositories.llm_provider import LLMProviderRepository
 from repositories.node import NodeRepository
+from repositories.partition import PartitionRepository
 from repositories.user import UserRepository
 from repositories.workflow import WorkflowRepository
 
 __all__ = [
     "EdgeRepository",
+    "ExecutionNodeRunRepository",
     "ExecutionRepository",
     "LLMProviderRepository",
     "NodeRepository",
+    "PartitionRepository",
     "UserRepository",
     "WorkflowRepository",
 ]
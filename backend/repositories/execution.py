@@ -1,8 +1,39 @@
 """Repository for executions."""
 
-from models import Execution
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import (
+    Integer,
+    String,
+    and_,
+    any_,
+    bindparam,
+    case,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql.elements import BindParameter
+
+from enums import ExecutionPriority, ExecutionStatus
+from models import Execution, Workflow
 from repositories.base import BaseRepository
 
+UNFINISHED_STATUSES = (ExecutionStatus.CREATED, ExecutionStatus.RUNNING)
+
+
+def _id_array(execution_ids: list[int]) -> BindParameter:
+    """Bind IDs as one array parameter instead of one parameter per ID."""
+    return bindparam("execution_ids", value=execution_ids, type_=ARRAY(Integer))
+
 
 class ExecutionRepository(BaseRepository[Execution]):
     """Repository for Execution model operations."""
@@ -10,3 +41,406 @@ class ExecutionRepository(BaseRepository[Execution]):
     def __init__(self) -> None:
         """Initialize the repository with the Execution model."""
         super().__init__(model=Execution)
+
+    async def create_batch(
+        self,
+        session: AsyncSession,
+        inputs: list[dict | None],
+        input_blobs: list[str | None],
+        data: dict[str, Any],
+    ) -> list[int]:
+        """Create executions for many inputs in a single INSERT statement.
+
+        The inputs travel as one JSONB array parameter, so the statement
+        stays the same size however many executions are created.
+
+        Args:
+            session: The async session.
+            inputs: The input data of every execution.
+            input_blobs: The blob key of every input, if it was offloaded.
+            data: The column values shared by every execution.
+
+        Returns:
+            The created execution IDs, in the order of the inputs.
+
+        """
+        rows = (
+            func.unnest(
+                bindparam("inputs", value=inputs, type_=ARRAY(JSONB)),
+                bindparam("input_blobs", value=input_blobs, type_=ARRAY(String)),
+            )
+            .table_valued("value", "blob", with_ordinality="ordinality")
+            .render_derived()
+        )
+        result = await session.execute(
+            statement=insert(Execution)
+            .from_select(
+                [*data, "input_data", "input_blob"],
+                select(
+                    *(
+                        literal(value, type_=Execution.__table__.c[key].type)
+                        for key, value in data.items()
+                    ),
+                    rows.c.value,
+                    rows.c.blob,
+                ).order_by(rows.c.ordinality),
+            )
+            .returning(Execution.id)
+        )
+        await session.commit()
+
+        # IDs come from a sequence consumed in insert order.
+        return sorted(result.scalars().all())
+
+    async def get_all_by_ids(
+        self, session: AsyncSession, execution_ids: list[int]
+    ) -> list[Execution]:
+        """Get executions by IDs.
+
+        Args:
+            session: The async session.
+            execution_ids: The execution IDs.
+
+        Returns:
+            The list of executions, ordered by ID.
+
+        """
+        result = await session.execute(
+            statement=select(Execution)
+            .where(Execution.id == any_(_id_array(execution_ids)))
+            .order_by(Execution.id)
+        )
+
+        return list(result.scalars().all())
+
+    async def update_all_by_ids(
+        self, session: AsyncSession, execution_ids: list[int], data: dict[str, Any]
+    ) -> None:
+        """Update executions by IDs in a single statement.
+
+        Args:
+            session: The async session.
+            execution_ids: The execution IDs.
+            data: The data to update the executions with.
+
+        """
+        await session.execute(
+            statement=update(Execution)
+            .where(Execution.id == any_(_id_array(execution_ids)))
+            .values(**data),
+            execution_options={"synchronize_session": False},
+        )
+        await session.commit()
+
+    async def start_batch(
+        self, session: AsyncSession, execution_ids: list[int], *, resume: bool = False
+    ) -> dict[int, float | None]:
+        """Move executions that are still CREATED to RUNNING.
+
+        The time an execution first starts running is stamped, and its
+        timeout counts from then. The seconds left are computed on the
+        database clock that stamped it.
+
+        Args:
+            session: The async session.
+            execution_ids: The execution IDs.
+            resume: Whether executions already RUNNING are started again.
+
+        Returns:
+            The seconds left before the timeout of each started execution,
+            keyed by ID, or None for executions without a timeout.
+
+        """
+        statuses = UNFINISHED_STATUSES if resume else (ExecutionStatus.CREATED,)
+        deadline = Execution.running_at + Execution.timeout_seconds * literal_column(
+            "interval '1 second'"
+        )
+        result = await session.execute(
+            statement=update(Execution)
+            .where(
+                Execution.id == any_(_id_array(execution_ids)),
+                Execution.status.in_(statuses),
+            )
+            .values(
+                status=ExecutionStatus.RUNNING,
+                running_at=func.coalesce(Execution.running_at, func.now()),
+            )
+            .returning(Execution.id, func.extract("epoch", deadline - func.now())),
+            execution_options={"synchronize_session": False},
+        )
+        await session.commit()
+
+        return {
+            execution_id: None if remaining is None else float(remaining)
+            for execution_id, remaining in result.tuples()
+        }
+
+    async def get_in_process(
+        self,
+        session: AsyncSession,
+        status: ExecutionStatus,
+        limit: int,
+        after: tuple[datetime, int] | None = None,
+        started_before: datetime | None = None,
+    ) -> list[Execution]:
+        """Get the oldest executions in a status run in-process, not by Prefect.
+
+        Followers are left out, as they only run once their leader finished.
+        Executions are ordered by start time and ID; pass those of the last
+        one returned as `after` to get the next page.
+
+        Args:
+            session: The async session.
+            status: The execution status.
+            limit: The maximum number of executions returned.
+            after: The start time and ID the page starts after.
+            started_before: The start time the executions precede, if any.
+
+        Returns:
+            The list of executions.
+
+        """
+        statement = (
+            select(Execution)
+            .where(
+                Execution.status == status,
+                Execution.flow_run_id.is_(None),
+                Execution.leader_id.is_(None),
+            )
+            .order_by(Execution.started_at, Execution.id)
+            .limit(limit)
+        )
+        if after is not None:
+            started_at, execution_id = after
+            statement = statement.where(
+                or_(
+                    Execution.started_at > started_at,
+                    and_(
+                        Execution.started_at == started_at,
+                        Execution.id > execution_id,
+                    ),
+                )
+            )
+        if started_before is not None:
+            statement = statement.where(Execution.started_at < started_before)
+        result = await session.execute(statement=statement)
+
+        return list(result.scalars().all())
+
+    async def get_blobs(
+        self, session: AsyncSession, started_from: datetime, started_before: datetime
+    ) -> set[str]:
+        """Get the blob keys of the executions started in a time range.
+
+        Args:
+            session: The async session.
+            started_from: The start of the range, inclusive.
+            started_before: The end of the range, exclusive.
+
+        Returns:
+            The keys of their offloaded inputs and outputs.
+
+        """
+        result = await session.execute(
+            statement=select(Execution.input_blob, Execution.output_blob).where(
+                Execution.started_at >= started_from,
+                Execution.started_at < started_before,
+                or_(
+                    Execution.input_blob.is_not(None),
+                    Execution.output_blob.is_not(None),
+                ),
+            )
+        )
+
+        return {key for row in result.all() for key in row if key is not None}
+
+    async def get_unfinished_flow_runs(self, session: AsyncSession) -> list[Execution]:
+        """Get unfinished executions that were handed to a Prefect flow run.
+
+        Args:
+            session: The async session.
+
+        Returns:
+            The list of executions.
+
+        """
+        result = await session.execute(
+            statement=select(Execution).where(
+                Execution.status.in_(UNFINISHED_STATUSES),
+                Execution.flow_run_id.is_not(None),
+            )
+        )
+
+        return list(result.scalars().all())
+
+    async def finish_unfinished(
+        self, session: AsyncSession, execution_id: int, data: dict[str, Any]
+    ) -> bool:
+        """Update an execution only if it has not finished in the meantime.
+
+        Args:
+            session: The async session.
+            execution_id: The execution ID.
+            data: The final status and its output or error.
+
+        Returns:
+            True if the execution was updated, False otherwise.
+
+        """
+        result = await session.execute(
+            statement=update(Execution)
+            .where(
+                Execution.id == execution_id,
+                Execution.status.in_(UNFINISHED_STATUSES),
+            )
+            .values(**data)
+            .returning(Execution.id)
+        )
+        await session.commit()
+
+        return result.scalar_one_or_none() is not None
+
+    async def follow(
+        self, session: AsyncSession, execution_id: int, leader_id: int
+    ) -> bool:
+        """Make an execution follow another one, unless that one has finished.
+
+        Args:
+            session: The async session.
+            execution_id: The following execution ID.
+            leader_id: The leading execution ID.
+
+        Returns:
+            True if the execution now follows the leader, False otherwise.
+
+        """
+        leader = aliased(Execution)
+        result = await session.execute(
+            statement=update(Execution)
+            .where(
+                Execution.id == execution_id,
+                select(leader.id)
+                .where(leader.id == leader_id, leader.status.in_(UNFINISHED_STATUSES))
+                .exists(),
+            )
+            .values(leader_id=leader_id)
+            .returning(Execution.id),
+            execution_options={"synchronize_session": False},
+        )
+        await session.commit()
+
+        return result.scalar_one_or_none() is not None
+
+    async def finish_followers(
+        self, session: AsyncSession, leader_id: int, data: dict[str, Any]
+    ) -> list[int]:
+        """Finish the executions still following a leader with its outcome.
+
+        Args:
+            session: The async session.
+            leader_id: The leading execution ID.
+            data: The final status and its output or error.
+
+        Returns:
+            The IDs of the finished followers.
+
+        """
+        result = await session.execute(
+            statement=update(Execution)
+            .where(
+                Execution.leader_id == leader_id,
+                Execution.status == ExecutionStatus.CREATED,
+            )
+            .values(**data)
+            .returning(Execution.id),
+            execution_options={"synchronize_session": False},
+        )
+        await session.commit()
+
+        return list(result.scalars().all())
+
+    async def promote_follower(
+        self, session: AsyncSession, leader_id: int
+    ) -> Execution | None:
+        """Make the oldest follower of a leader lead the others in its place.
+
+        Args:
+            session: The async session.
+            leader_id: The leading execution ID.
+
+        Returns:
+            The promoted execution, or None if nothing follows the leader.
+
+        """
+        follower = await session.scalar(
+            statement=select(Execution)
+            .where(
+                Execution.leader_id == leader_id,
+                Execution.status == ExecutionStatus.CREATED,
+            )
+            .order_by(Execution.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        if follower is None:
+            await session.commit()
+            return None
+
+        await session.execute(
+            statement=update(Execution)
+            .where(
+                Execution.leader_id == leader_id,
+                Execution.status == ExecutionStatus.CREATED,
+            )
+            .values(
+                leader_id=case((Execution.id == follower.id, None), else_=follower.id)
+            ),
+            execution_options={"synchronize_session": False},
+        )
+        await session.commit()
+
+        return follower
+
+    async def claim_orphaned_followers(
+        self, session: AsyncSession, limit: int
+    ) -> list[tuple[int, int, ExecutionPriority]]:
+        """Stop executions from following leaders that finished without them.
+
+        Claimed executions are left CREATED and leading themselves, so the
+        caller must queue them. Rows locked by a concurrent claim are skipped.
+
+        Args:
+            session: The async session.
+            limit: The maximum number of executions claimed.
+
+        Returns:
+            The ID, owner user ID and priority class of every claimed execution.
+
+        """
+        follower = aliased(Execution)
+        leader = aliased(Execution)
+        orphans = (
+            select(follower.id)
+            .where(
+                follower.status == ExecutionStatus.CREATED,
+                follower.leader_id.is_not(None),
+                ~select(leader.id)
+                .where(
+                    leader.id == follower.leader_id,
+                    leader.status.in_(UNFINISHED_STATUSES),
+                )
+                .exists(),
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await session.execute(
+            statement=update(Execution)
+            .where(Execution.id.in_(orphans), Execution.workflow_id == Workflow.id)
+            .values(leader_id=None)
+            .returning(Execution.id, Workflow.owner_id, Execution.priority),
+            execution_options={"synchronize_session": False},
+        )
+        await session.commit()
+
+        return [(row.id, row.owner_id, row.priority) for row in result.all()]
@@ -0,0 +1,86 @@
+"""Repository for execution node runs."""
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Row, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import ExecutionNodeRun, Node
+from repositories.base import BaseRepository
+
+
+class ExecutionNodeRunRepository(BaseRepository[ExecutionNodeRun]):
+    """Repository for ExecutionNodeRun model operations."""
+
+    def __init__(self) -> None:
+        """Initialize the repository with the ExecutionNodeRun model."""
+        super().__init__(model=ExecutionNodeRun)
+
+    async def create_batch(
+        self, session: AsyncSession, data: list[dict[str, Any]]
+    ) -> None:
+        """Insert node runs without loading them back.
+
+        Args:
+            session: The async session.
+            data: The node runs to insert.
+
+        """
+        await session.execute(statement=insert(ExecutionNodeRun), params=data)
+        await session.commit()
+
+    async def get_all_by_execution(
+        self, session: AsyncSession, execution_id: int
+    ) -> list[ExecutionNodeRun]:
+        """Get the node runs of an execution in start order.
+
+        Args:
+            session: The async session.
+            execution_id: The execution ID.
+
+        Returns:
+            The list of node runs.
+
+        """
+        result = await session.execute(
+            statement=select(ExecutionNodeRun)
+            .filter_by(execution_id=execution_id)
+            .order_by(ExecutionNodeRun.started_at, ExecutionNodeRun.id)
+        )
+
+        return list(result.scalars().all())
+
+    async def get_averages(
+        self, session: AsyncSession, workflow_id: int, since: datetime
+    ) -> list[Row[tuple[int, float, float, float]]]:
+        """Average the successful, uncached runs of each node of a workflow.
+
+        Args:
+            session: The async session.
+            workflow_id: The workflow ID.
+            since: The earliest queue time of the runs averaged.
+
+        Returns:
+            One row per node with runs: the node ID, duration in ms, prompt
+            tokens and completion tokens.
+
+        """
+        result = await session.execute(
+            statement=select(
+                ExecutionNodeRun.node_id,
+                func.avg(ExecutionNodeRun.duration_ms),
+                func.coalesce(func.avg(ExecutionNodeRun.prompt_tokens), 0.0),
+                func.coalesce(func.avg(ExecutionNodeRun.completion_tokens), 0.0),
+            )
+            .join(Node, Node.id == ExecutionNodeRun.node_id)
+            .where(
+                Node.workflow_id == workflow_id,
+                ExecutionNodeRun.queued_at >= since,
+                ExecutionNodeRun.error.is_(None),
+                ExecutionNodeRun.cached.is_(False),
+            )
+            .group_by(ExecutionNodeRun.node_id)
+        )
+
+        return list(result.all())
@@ -0,0 +1,140 @@
+"""Repository for the monthly range partitions of partitioned tables."""
+
+import re
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+MONTHLY_PARTITION = re.compile(r"_p(\d{4})_(\d{2})$")
+DEFAULT_PARTITION = re.compile(r"_default$")
+
+
+def is_partition(name: str) -> bool:
+    """Tell whether a table name is a partition managed by this repository.
+
+    Args:
+        name: The table name.
+
+    Returns:
+        True if the table is a monthly or default partition.
+
+    """
+    return bool(MONTHLY_PARTITION.search(name) or DEFAULT_PARTITION.search(name))
+
+
+def shift_months(month: date, months: int) -> date:
+    """Return the first day of the month some months before or after another.
+
+    Args:
+        month: A day of the starting month.
+        months: The number of months to move, negative to move back.
+
+    Returns:
+        The first day of the resulting month.
+
+    """
+    index = month.year * 12 + month.month - 1 + months
+    return date(year=index // 12, month=index % 12 + 1, day=1)
+
+
+class PartitionRepository:
+    """Repository creating and dropping monthly partitions of one table.
+
+    Rows outside every monthly partition land in the table's default
+    partition, which is never dropped.
+    """
+
+    def __init__(self, table: str, column: str) -> None:
+        """Initialize the repository with the partitioned table.
+
+        Args:
+            table: The name of the table partitioned by month.
+            column: The timestamp column the table is partitioned on.
+
+        """
+        self._table = table
+        self._column = column
+
+    async def get_all(self, session: AsyncSession) -> list[date]:
+        """List the months that have a partition.
+
+        Args:
+            session: The async session.
+
+        Returns:
+            The first day of every partitioned month, in order.
+
+        """
+        result = await session.execute(
+            statement=text(
+                "SELECT child.relname FROM pg_inherits"
+                " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+                " WHERE pg_inherits.inhparent = CAST(:table AS regclass)"
+            ),
+            params={"table": self._table},
+        )
+
+        months = []
+        for name in result.scalars().all():
+            match = MONTHLY_PARTITION.search(name)
+            if match:
+                months.append(date(year=int(match[1]), month=int(match[2]), day=1))
+
+        return sorted(months)
+
+    async def create(self, session: AsyncSession, month: date) -> None:
+        """Create the partition of a month unless it already exists.
+
+        Postgres refuses to create a partition for rows the default partition
+        already holds, so the default partition is detached meanwhile and its
+        rows of the month are moved into the new partition, all in one
+        transaction.
+
+        Args:
+            session: The async session.
+            month: A day of the month.
+
+        """
+        start = shift_months(month=month, months=0)
+        end = shift_months(month=month, months=1)
+        name = self._name(month=start)
+        exists = await session.scalar(
+            statement=text("SELECT to_regclass(:name) IS NOT NULL"),
+            params={"name": name},
+        )
+        if exists:
+            await session.commit()
+            return
+
+        default = f"{self._table}_default"
+        bounds = f"FROM ('{start}') TO ('{end}')"
+        in_month = f"{self._column} >= '{start}' AND {self._column} < '{end}'"
+        for statement in (
+            f"ALTER TABLE {self._table} DETACH PARTITION {default}",
+            f"CREATE TABLE {name} PARTITION OF {self._table} FOR VALUES {bounds}",
+            f"INSERT INTO {self._table} SELECT * FROM {default} WHERE {in_month}",  # noqa: S608
+            f"DELETE FROM {default} WHERE {in_month}",  # noqa: S608
+            f"ALTER TABLE {self._table} ATTACH PARTITION {default} DEFAULT",
+        ):
+            await session.execute(statement=text(statement))
+        await session.commit()
+
+    async def drop(self, session: AsyncSession, month: date) -> None:
+        """Detach and drop the partition of a month, with all its rows.
+
+        Args:
+            session: The async session.
+            month: A day of the month.
+
+        """
+        name = self._name(month=shift_months(month=month, months=0))
+        await session.execute(
+            statement=text(f"ALTER TABLE {self._table} DETACH PARTITION {name}")
+        )
+        await session.execute(statement=text(f"DROP TABLE {name}"))
+        await session.commit()
+
+    def _name(self, month: date) -> str:
+        """Return the partition name of a month."""
+        return f"{self._table}_p{month:%Y_%m}"
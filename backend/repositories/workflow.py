@@ -1,5 +1,8 @@
 """Repository for workflows."""
 
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from models import Workflow
 from repositories.base import BaseRepository
 
@@ -10,3 +13,25 @@ class WorkflowRepository(BaseRepository[Workflow]):
     def __init__(self) -> None:
         """Initialize the repository with the Workflow model."""
         super().__init__(model=Workflow)
+
+    async def bump_version(self, session: AsyncSession, workflow_id: int) -> int:
+        """Increment the graph version of a workflow.
+
+        Args:
+            session: The async session.
+            workflow_id: The workflow ID.
+
+        Returns:
+            The new graph version.
+
+        """
+        result = await session.execute(
+            statement=update(Workflow)
+            .where(Workflow.id == workflow_id)
+            .values(version=Workflow.version + 1)
+            .returning(Workflow.version)
+        )
+        version = result.scalar_one()
+        await session.commit()
+
+        return version
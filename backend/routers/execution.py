@@ -1,16 +1,85 @@
 """Execution API routes."""
 
-from typing import Annotated
+from collections.abc import AsyncIterator
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Body, Depends, Query
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    Path,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+    WebSocketException,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from dependencies import auth, db, execution
-from schemas import ExecutionCreate, ExecutionResponse, UserResponse
+from exceptions import BaseError
+from schemas import (
+    ExecutionBatchCreate,
+    ExecutionBatchResponse,
+    ExecutionCreate,
+    ExecutionEventResponse,
+    ExecutionNodeRunResponse,
+    ExecutionResponse,
+    UserResponse,
+)
 
 router = APIRouter(prefix="/executions", tags=["Executions"])
 
 
+async def _encode_sse(
+    events: AsyncIterator[tuple[str, dict[str, Any]] | None],
+) -> AsyncIterator[str]:
+    """Encode execution events as server-sent events.
+
+    Args:
+        events: The event ID and event pairs, with None on idle.
+
+    Yields:
+        SSE frames, with comment frames as keepalives.
+
+    """
+    async for item in events:
+        if item is None:
+            yield ": keepalive\n\n"
+            continue
+
+        event_id, event = item
+        payload = ExecutionEventResponse(id=event_id, **event)
+        yield (
+            f"id: {payload.id}\n"
+            f"event: {payload.type}\n"
+            f"data: {payload.model_dump_json()}\n\n"
+        )
+
+
+async def _encode_ndjson(
+    events: AsyncIterator[tuple[str, dict[str, Any]] | None],
+) -> AsyncIterator[str]:
+    """Encode execution events as newline-delimited JSON.
+
+    Args:
+        events: The event ID and event pairs, with None on idle.
+
+    Yields:
+        One JSON line per event, with empty lines as keepalives.
+
+    """
+    async for item in events:
+        if item is None:
+            yield "\n"
+            continue
+
+        event_id, event = item
+        yield ExecutionEventResponse(id=event_id, **event).model_dump_json() + "\n"
+
+
 @router.post(path="")
 async def create_execution(
     data: Annotated[
@@ -33,6 +102,61 @@ async def create_execution(
     )
 
 
+@router.post(path="/batch")
+async def create_execution_batch(
+    data: Annotated[
+        ExecutionBatchCreate, Body(description="Data for creating an execution batch")
+    ],
+    session: Annotated[AsyncSession, Depends(dependency=db.get_session)],
+    usecase: Annotated[
+        execution.ExecutionUsecase,
+        Depends(dependency=execution.get_execution_usecase),
+    ],
+    current_user: Annotated[UserResponse, Depends(dependency=auth.get_current_user)],
+) -> ExecutionBatchResponse:
+    """Create one execution per input of a workflow."""
+    return ExecutionBatchResponse(
+        workflow_id=data.workflow_id,
+        execution_ids=await usecase.create_execution_batch(
+            session=session,
+            user_id=current_user.id,
+            workflow_id=data.workflow_id,
+            inputs=data.inputs,
+            timeout_seconds=data.timeout_seconds,
+            priority=data.priority,
+        ),
+    )
+
+
+@router.post(path="/stream")
+async def stream_execution(
+    data: Annotated[
+        ExecutionCreate, Body(description="Data for creating an execution")
+    ],
+    session: Annotated[AsyncSession, Depends(dependency=db.get_session)],
+    usecase: Annotated[
+        execution.ExecutionUsecase,
+        Depends(dependency=execution.get_execution_usecase),
+    ],
+    current_user: Annotated[UserResponse, Depends(dependency=auth.get_current_user)],
+) -> StreamingResponse:
+    """Create an execution and stream its output tokens as they are generated."""
+    created, events = await usecase.stream_execution(
+        session=session,
+        user_id=current_user.id,
+        **data.model_dump(exclude_none=True),
+    )
+    return StreamingResponse(
+        content=_encode_ndjson(events=events),
+        media_type="application/x-ndjson",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "X-Execution-ID": str(created.id),
+        },
+    )
+
+
 @router.get(path="")
 async def list_executions(
     workflow_id: Annotated[int, Query(gt=0)],
@@ -50,3 +174,122 @@ async def list_executions(
             session=session, user_id=current_user.id, workflow_id=workflow_id
         )
     ]
+
+
+@router.get(path="/{execution_id}")
+async def get_execution(
+    execution_id: Annotated[int, Path(description="Execution ID", gt=0)],
+    session: Annotated[AsyncSession, Depends(dependency=db.get_session)],
+    usecase: Annotated[
+        execution.ExecutionUsecase,
+        Depends(dependency=execution.get_execution_usecase),
+    ],
+    current_user: Annotated[UserResponse, Depends(dependency=auth.get_current_user)],
+) -> ExecutionResponse:
+    """Get an execution by ID."""
+    return ExecutionResponse.model_validate(
+        await usecase.get_execution(
+            session=session, execution_id=execution_id, user_id=current_user.id
+        )
+    )
+
+
+@router.post(path="/{execution_id}/cancel")
+async def cancel_execution(
+    execution_id: Annotated[int, Path(description="Execution ID", gt=0)],
+    session: Annotated[AsyncSession, Depends(dependency=db.get_session)],
+    usecase: Annotated[
+        execution.ExecutionUsecase,
+        Depends(dependency=execution.get_execution_usecase),
+    ],
+    current_user: Annotated[UserResponse, Depends(dependency=auth.get_current_user)],
+) -> ExecutionResponse:
+    """Cancel an execution."""
+    return ExecutionResponse.model_validate(
+        await usecase.cancel_execution(
+            session=session, execution_id=execution_id, user_id=current_user.id
+        )
+    )
+
+
+@router.get(path="/{execution_id}/nodes")
+async def list_execution_node_runs(
+    execution_id: Annotated[int, Path(description="Execution ID", gt=0)],
+    session: Annotated[AsyncSession, Depends(dependency=db.get_session)],
+    usecase: Annotated[
+        execution.ExecutionUsecase,
+        Depends(dependency=execution.get_execution_usecase),
+    ],
+    current_user: Annotated[UserResponse, Depends(dependency=auth.get_current_user)],
+) -> list[ExecutionNodeRunResponse]:
+    """List the per-node timing and usage of an execution."""
+    return [
+        ExecutionNodeRunResponse.model_validate(node_run)
+        for node_run in await usecase.get_execution_node_runs(
+            session=session, execution_id=execution_id, user_id=current_user.id
+        )
+    ]
+
+
+@router.get(path="/{execution_id}/events")
+async def stream_execution_events(
+    execution_id: Annotated[int, Path(description="Execution ID", gt=0)],
+    session: Annotated[AsyncSession, Depends(dependency=db.get_session)],
+    usecase: Annotated[
+        execution.ExecutionUsecase,
+        Depends(dependency=execution.get_execution_usecase),
+    ],
+    current_user: Annotated[UserResponse, Depends(dependency=auth.get_current_user)],
+    last_event_id: Annotated[
+        str, Header(description="ID of the last event received")
+    ] = "0",
+) -> StreamingResponse:
+    """Stream execution progress as server-sent events."""
+    events = await usecase.get_execution_events(
+        session=session,
+        execution_id=execution_id,
+        user_id=current_user.id,
+        last_event_id=last_event_id,
+    )
+    return StreamingResponse(
+        content=_encode_sse(events=events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket(path="/{execution_id}/ws")
+async def execution_events_websocket(
+    websocket: WebSocket,
+    execution_id: Annotated[int, Path(description="Execution ID", gt=0)],
+    session: Annotated[AsyncSession, Depends(dependency=db.get_session)],
+    usecase: Annotated[
+        execution.ExecutionUsecase,
+        Depends(dependency=execution.get_execution_usecase),
+    ],
+    current_user: Annotated[UserResponse, Depends(dependency=auth.get_websocket_user)],
+) -> None:
+    """Stream execution progress over a WebSocket."""
+    try:
+        events = await usecase.get_execution_events(
+            session=session, execution_id=execution_id, user_id=current_user.id
+        )
+    except BaseError as e:
+        raise WebSocketException(
+            code=status.WS_1008_POLICY_VIOLATION, reason=e.message
+        ) from e
+
+    await websocket.accept()
+    try:
+        async for item in events:
+            if item is None:
+                continue
+
+            event_id, event = item
+            await websocket.send_text(
+                ExecutionEventResponse(id=event_id, **event).model_dump_json()
+            )
+    except WebSocketDisconnect:
+        return
+
+    await websocket.close()
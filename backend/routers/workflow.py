@@ -7,7 +7,13 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from dependencies import auth, db, workflow
-from schemas import UserResponse, WorkflowCreate, WorkflowResponse, WorkflowUpdate
+from schemas import (
+    UserResponse,
+    WorkflowCreate,
+    WorkflowPlanResponse,
+    WorkflowResponse,
+    WorkflowUpdate,
+)
 
 router = APIRouter(prefix="/workflows", tags=["Workflows"])
 
@@ -48,6 +54,24 @@ async def list_workflows(
     ]
 
 
+@router.get(path="/{workflow_id}/plan")
+async def get_workflow_plan(
+    workflow_id: Annotated[int, Path(description="Workflow ID", gt=0)],
+    session: Annotated[AsyncSession, Depends(dependency=db.get_session)],
+    usecase: Annotated[
+        workflow.WorkflowUsecase,
+        Depends(dependency=workflow.get_workflow_usecase),
+    ],
+    current_user: Annotated[UserResponse, Depends(dependency=auth.get_current_user)],
+) -> WorkflowPlanResponse:
+    """Analyze the levels, critical path and expected cost of a workflow."""
+    return WorkflowPlanResponse.model_validate(
+        await usecase.get_workflow_plan(
+            session=session, workflow_id=workflow_id, user_id=current_user.id
+        )
+    )
+
+
 @router.patch(path="/{workflow_id}")
 async def update_workflow(
     workflow_id: Annotated[int, Path(description="Workflow ID", gt=0)],
@@ -2,7 +2,14 @@
 
 from schemas.auth import Login, Token
 from schemas.edge import EdgeCreate, EdgeResponse, EdgeUpdate
-from schemas.execution import ExecutionCreate, ExecutionResponse
+from schemas.execution import (
+    ExecutionBatchCreate,
+    ExecutionBatchResponse,
+    ExecutionCreate,
+    ExecutionEventResponse,
+    ExecutionNodeRunResponse,
+    ExecutionResponse,
+)
 from schemas.health import HealthResponse, ServiceHealthResponse
 from schemas.llm_provider import (
     LLMProviderCreate,
@@ -15,13 +22,22 @@ from schemas.node import (
     NodeUpdate,
 )
 from schemas.user import UserCreate, UserResponse
-from schemas.workflow import WorkflowCreate, WorkflowResponse, WorkflowUpdate
+from schemas.workflow import (
+    WorkflowCreate,
+    WorkflowPlanResponse,
+    WorkflowResponse,
+    WorkflowUpdate,
+)
 
 __all__ = [
     "EdgeCreate",
     "EdgeResponse",
     "EdgeUpdate",
+    "ExecutionBatchCreate",
+    "ExecutionBatchResponse",
     "ExecutionCreate",
+    "ExecutionEventResponse",
+    "ExecutionNodeRunResponse",
     "ExecutionResponse",
     "HealthResponse",
     "LLMProviderCreate",
@@ -36,6 +52,7 @@ __all__ = [
     "UserCreate",
     "UserResponse",
     "WorkflowCreate",
+    "WorkflowPlanResponse",
     "WorkflowResponse",
     "WorkflowUpdate",
 ]
@@ -1,10 +1,13 @@
 """Schemas for execution API payloads."""
 
 from datetime import datetime
+from typing import Any
+from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from enums import ExecutionStatus
+from enums import ExecutionEventType, ExecutionPriority, ExecutionStatus, NodeType
+from settings import executor_settings
 
 
 class ExecutionCreate(BaseModel):
@@ -12,6 +15,43 @@ class ExecutionCreate(BaseModel):
 
     workflow_id: int = Field(default=..., description="Workflow ID", gt=0)
     input_data: dict | None = Field(default=None, description="Execution input")
+    timeout_seconds: int | None = Field(
+        default=None,
+        description="Seconds of running before the execution is cancelled",
+        gt=0,
+    )
+    priority: ExecutionPriority = Field(
+        default=ExecutionPriority.INTERACTIVE, description="Scheduling class"
+    )
+
+
+class ExecutionBatchCreate(BaseModel):
+    """Payload for launching one workflow over many inputs."""
+
+    workflow_id: int = Field(default=..., description="Workflow ID", gt=0)
+    inputs: list[dict | None] = Field(
+        default=...,
+        description="Execution inputs, one execution each",
+        min_length=1,
+        max_length=executor_settings.batch_max_size,
+    )
+    timeout_seconds: int | None = Field(
+        default=None,
+        description="Seconds of running before each execution is cancelled",
+        gt=0,
+    )
+    priority: ExecutionPriority = Field(
+        default=ExecutionPriority.BATCH, description="Scheduling class"
+    )
+
+
+class ExecutionBatchResponse(BaseModel):
+    """Response model for execution batches."""
+
+    workflow_id: int = Field(default=..., description="Workflow ID", gt=0)
+    execution_ids: list[int] = Field(
+        default=..., description="Execution IDs, in the order of the inputs"
+    )
 
 
 class ExecutionResponse(BaseModel):
@@ -22,8 +62,42 @@ class ExecutionResponse(BaseModel):
     id: int = Field(default=..., description="Execution ID", gt=0)
     workflow_id: int = Field(default=..., description="Workflow ID", gt=0)
     status: ExecutionStatus = Field(default=..., description="Execution status")
+    priority: ExecutionPriority = Field(default=..., description="Scheduling class")
     input_data: dict | None = Field(default=None, description="Execution input")
     output_data: dict | None = Field(default=None, description="Execution output")
+    input_blob: str | None = Field(default=None, description="Offloaded input key")
+    output_blob: str | None = Field(default=None, description="Offloaded output key")
     error: str | None = Field(default=None, description="Error message")
+    timeout_seconds: int | None = Field(default=None, description="Timeout seconds")
+    flow_run_id: UUID | None = Field(default=None, description="Prefect flow run ID")
     started_at: datetime = Field(default=..., description="Started at")
+    running_at: datetime | None = Field(default=None, description="Running since")
     finished_at: datetime | None = Field(default=None, description="Finished at")
+
+
+class ExecutionNodeRunResponse(BaseModel):
+    """Response model for the run of one node within an execution."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int = Field(default=..., description="Node run ID", gt=0)
+    node_id: int = Field(default=..., description="Node ID", gt=0)
+    node_type: NodeType = Field(default=..., description="Node type")
+    queued_at: datetime = Field(default=..., description="Ready at")
+    started_at: datetime = Field(default=..., description="Started at")
+    finished_at: datetime = Field(default=..., description="Finished at")
+    queue_wait_ms: float = Field(default=..., description="Queue wait in ms")
+    duration_ms: float = Field(default=..., description="Duration in ms")
+    prompt_tokens: int | None = Field(default=None, description="Prompt tokens")
+    completion_tokens: int | None = Field(default=None, description="Completion tokens")
+    cached: bool = Field(default=..., description="Served without running")
+    error: str | None = Field(default=None, description="Error message")
+
+
+class ExecutionEventResponse(BaseModel):
+    """Progress event published while an execution runs."""
+
+    id: str = Field(default=..., description="Event ID")
+    type: ExecutionEventType = Field(default=..., description="Event type")
+    node_id: int | None = Field(default=None, description="Node ID")
+    data: dict[str, Any] = Field(default_factory=dict, description="Event payload")
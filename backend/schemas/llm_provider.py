@@ -12,6 +12,9 @@ class LLMProviderCreate(BaseModel):
     type: LLMProviderType = Field(default=..., description="Provider type")
     api_key: str = Field(default=..., description="Encrypted API key")
     base_url: str | None = Field(default=None, description="Custom base URL")
+    group: str | None = Field(
+        default=None, description="Load-balancing group name", max_length=128
+    )
     is_default: bool = Field(default=False, description="Is default provider")
 
 
@@ -22,6 +25,9 @@ class LLMProviderUpdate(BaseModel):
     type: LLMProviderType | None = Field(default=None, description="Provider type")
     api_key: str | None = Field(default=None, description="Encrypted API key")
     base_url: str | None = Field(default=None, description="Custom base URL")
+    group: str | None = Field(
+        default=None, description="Load-balancing group name", max_length=128
+    )
     is_default: bool | None = Field(default=None, description="Is default provider")
 
 
@@ -35,4 +41,5 @@ class LLMProviderResponse(BaseModel):
     name: str = Field(default=..., description="Provider name")
     type: LLMProviderType = Field(default=..., description="Provider type")
     base_url: str | None = Field(default=None, description="Custom base URL")
+    group: str | None = Field(default=None, description="Load-balancing group name")
     is_default: bool = Field(default=..., description="Is default provider")
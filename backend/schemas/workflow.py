@@ -25,5 +25,34 @@ class WorkflowResponse(BaseModel):
     id: int = Field(default=..., description="Workflow ID", gt=0)
     owner_id: int = Field(default=..., description="Owner user ID", gt=0)
     name: str = Field(default=..., description="Workflow name")
+    version: int = Field(default=..., description="Graph version", gt=0)
     created_at: datetime = Field(default=..., description="Created at")
     updated_at: datetime = Field(default=..., description="Updated at")
+
+
+class WorkflowPlanResponse(BaseModel):
+    """Response model for the pre-execution analysis of a workflow graph."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    workflow_id: int = Field(default=..., description="Workflow ID", gt=0)
+    version: int = Field(default=..., description="Graph version", gt=0)
+    levels: list[list[int]] = Field(
+        default=..., description="Node IDs grouped by topological level"
+    )
+    width: int = Field(default=..., description="Most nodes in one level")
+    critical_path: list[int] = Field(
+        default=..., description="Node IDs of the longest estimated chain"
+    )
+    estimated_duration_ms: float = Field(
+        default=..., description="Estimated latency in ms"
+    )
+    estimated_prompt_tokens: float = Field(
+        default=..., description="Estimated prompt tokens"
+    )
+    estimated_completion_tokens: float = Field(
+        default=..., description="Estimated completion tokens"
+    )
+    unestimated_node_ids: list[int] = Field(
+        default=..., description="Node IDs without recent runs"
+    )
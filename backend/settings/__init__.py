@@ -1,16 +1,24 @@
 """Settings exports."""
 
 from settings.auth import auth_settings
+from settings.blob import blob_settings
 from settings.chroma import chroma_settings
+from settings.engine import engine_settings
+from settings.executor import executor_settings
 from settings.ollama import ollama_settings
+from settings.partition import partition_settings
 from settings.postgres import postgres_settings
 from settings.prefect import prefect_settings
 from settings.redis import redis_settings
 
 __all__ = [
     "auth_settings",
+    "blob_settings",
     "chroma_settings",
+    "engine_settings",
+    "executor_settings",
     "ollama_settings",
+    "partition_settings",
     "postgres_settings",
     "prefect_settings",
     "redis_settings",
@@ -0,0 +1,24 @@
+"""Settings for the execution payload blob store."""
+
+from pydantic import Field
+from pydantic_settings import SettingsConfigDict
+
+from settings.base import BaseSettings
+
+
+class BlobSettings(BaseSettings):
+    """Configuration for offloading large payloads to compressed files."""
+
+    model_config = SettingsConfigDict(env_prefix="blob_")
+
+    path: str = Field(default="/data/blobs", title="Blob directory")
+    threshold: int = Field(
+        default=16 * 1024, title="Payload bytes above which it is offloaded"
+    )
+    preview_size: int = Field(
+        default=512, title="Characters of an offloaded payload kept in the row"
+    )
+    compression_level: int = Field(default=3, title="Zstandard compression level")
+
+
+blob_settings = BlobSettings()
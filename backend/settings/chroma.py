@@ -14,6 +14,9 @@ class ChromaSettings(BaseSettings):
     image: str = Field(default="chromadb/chroma:1.0.20", title="Chroma image")
     host: str = Field(default="chroma", title="Chroma host")
     port: int = Field(default=8000, title="Chroma port")
+    tenant: str = Field(default="default_tenant", title="Chroma tenant")
+    database: str = Field(default="default_database", title="Chroma database")
+    timeout: float = Field(default=5.0, title="Chroma request timeout")
 
     @property
     def url(self) -> str:
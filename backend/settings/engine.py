@@ -0,0 +1,93 @@
+"""Settings for the workflow execution engine."""
+
+from pydantic import Field
+from pydantic_settings import SettingsConfigDict
+
+from settings.base import BaseSettings
+
+
+class EngineSettings(BaseSettings):
+    """Configuration for the workflow execution engine."""
+
+    model_config = SettingsConfigDict(env_prefix="engine_")
+
+    plan_cache_size: int = Field(
+        default=1024, title="Compiled plans kept in memory per process"
+    )
+    memo_ttl: int = Field(
+        default=7 * 24 * 60 * 60, title="Memoized node output TTL in seconds"
+    )
+    memo_max_entries: int = Field(
+        default=10_000, title="Node outputs memoized before evicting the oldest"
+    )
+    memo_max_size: int = Field(
+        default=64 * 1024, title="Largest node output memoized, in bytes"
+    )
+    completion_cache: bool = Field(
+        default=True, title="Whether deterministic LLM completions are cached"
+    )
+    completion_cache_ttl: int = Field(
+        default=7 * 24 * 60 * 60, title="Cached LLM completion TTL in seconds"
+    )
+    completion_cache_max_entries: int = Field(
+        default=10_000, title="LLM completions kept before evicting the oldest"
+    )
+    completion_cache_max_size: int = Field(
+        default=64 * 1024, title="Largest LLM completion cached, in bytes"
+    )
+    semantic_cache: bool = Field(
+        default=True, title="Whether nodes with a threshold use the semantic cache"
+    )
+    semantic_cache_collection: str = Field(
+        default="llm-completions", title="Chroma collection of cached completions"
+    )
+    semantic_cache_model: str = Field(
+        default="nomic-embed-text", title="Default model embedding cached prompts"
+    )
+    provider_eject_failures: int = Field(
+        default=3, title="Consecutive failures ejecting a provider host", gt=0
+    )
+    provider_eject_seconds: float = Field(
+        default=30.0, title="Seconds an ejected provider host gets no requests"
+    )
+    provider_latency_decay: float = Field(
+        default=0.3, title="Weight of the latest request in host latency", gt=0, le=1
+    )
+    events_ttl: int = Field(
+        default=24 * 60 * 60, title="Execution event stream TTL in seconds"
+    )
+    events_max_length: int = Field(
+        default=10_000, title="Approximate maximum events kept per execution"
+    )
+    token_flush_interval: float = Field(
+        default=0.05, title="Seconds LLM tokens are buffered into one event", ge=0
+    )
+    events_keepalive: int = Field(
+        default=15, title="Seconds between keepalives on idle event streams"
+    )
+    checkpoint_ttl: int = Field(
+        default=24 * 60 * 60, title="Completed node outputs TTL in seconds"
+    )
+    dedupe: bool = Field(
+        default=False,
+        title="Whether identical concurrent executions of reproducible workflows "
+        "share a run",
+    )
+    flight_ttl: int = Field(
+        default=60 * 60, title="Seconds identical executions wait for a shared run"
+    )
+    batch_concurrency: int = Field(
+        default=64, title="Executions of one batch run concurrently"
+    )
+    node_concurrency: int = Field(
+        default=32, title="Nodes of one execution run concurrently", gt=0
+    )
+    map_concurrency: int = Field(
+        default=16, title="Items of one MAP node run concurrently"
+    )
+    estimate_window_days: int = Field(
+        default=30, title="Days of node runs averaged into plan estimates"
+    )
+
+
+engine_settings = EngineSettings()
@@ -0,0 +1,56 @@
+"""Settings for the execution worker pool."""
+
+from pydantic import Field
+from pydantic_settings import SettingsConfigDict
+
+from enums import ExecutionMode
+from settings.base import BaseSettings
+
+
+class ExecutorSettings(BaseSettings):
+    """Admission limits for workflow executions and how they are run."""
+
+    model_config = SettingsConfigDict(env_prefix="executor_")
+
+    mode: ExecutionMode = Field(
+        default=ExecutionMode.LOCAL, title="Where executions are run"
+    )
+    workers: int = Field(default=32, title="Executions run concurrently")
+    queue_size: int = Field(default=256, title="Executions waiting for a worker")
+    user_limit: int = Field(default=8, title="Queued and running executions per user")
+    global_limit: int = Field(
+        default=1024, title="Queued and running executions across all processes"
+    )
+    batch_max_size: int = Field(default=50_000, title="Executions per batch request")
+    retry_after: int = Field(default=5, title="Retry-After seconds when saturated")
+    interactive_weight: int = Field(
+        default=8, title="Share of workers given to interactive executions", gt=0
+    )
+    batch_weight: int = Field(
+        default=1, title="Share of workers given to batch executions", gt=0
+    )
+    supervise: bool = Field(
+        default=True, title="Whether API processes resume abandoned executions"
+    )
+    execution_lease: int = Field(
+        default=60, title="Seconds without heartbeat before an execution is resumed"
+    )
+    execution_heartbeat: int = Field(
+        default=15, title="Seconds between running execution heartbeats"
+    )
+    queue_consume: bool = Field(
+        default=True, title="Whether API processes also consume the queue"
+    )
+    queue_lease: int = Field(
+        default=60, title="Seconds without heartbeat before a job is reclaimed"
+    )
+    queue_heartbeat: int = Field(default=15, title="Seconds between job heartbeats")
+    queue_max_deliveries: int = Field(
+        default=3, title="Deliveries of a job before its executions are failed"
+    )
+    queue_shutdown_grace: int = Field(
+        default=25, title="Seconds running jobs get to finish on shutdown"
+    )
+
+
+executor_settings = ExecutorSettings()
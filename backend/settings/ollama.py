@@ -14,6 +14,24 @@ class OllamaSettings(BaseSettings):
     image: str = Field(default="ollama/ollama:latest", title="Ollama image")
     host: str = Field(default="ollama", title="Ollama host")
     port: int = Field(default=11434, title="Ollama port")
+    timeout: float = Field(default=300.0, title="Ollama request timeout")
+    connect_timeout: float = Field(default=5.0, title="Ollama connect timeout")
+    pool_timeout: float = Field(
+        default=30.0, title="Seconds to wait for a free pooled connection"
+    )
+    max_connections: int = Field(
+        default=100, title="Open connections per Ollama base URL"
+    )
+    max_keepalive_connections: int = Field(
+        default=20, title="Idle connections kept alive per Ollama base URL"
+    )
+    keepalive_expiry: float = Field(
+        default=60.0, title="Seconds an idle connection is kept alive"
+    )
+    embed_batch_window: float = Field(
+        default=0.005, title="Seconds an embedding batch waits for more texts"
+    )
+    embed_batch_max_size: int = Field(default=64, title="Texts embedded in one request")
 
     @property
     def url(self) -> str:
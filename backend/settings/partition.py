@@ -0,0 +1,22 @@
+"""Settings for the time partitioning of execution tables."""
+
+from pydantic import Field
+from pydantic_settings import SettingsConfigDict
+
+from settings.base import BaseSettings
+
+
+class PartitionSettings(BaseSettings):
+    """Configuration for monthly partitions and their retention."""
+
+    model_config = SettingsConfigDict(env_prefix="partition_")
+
+    retention_months: int = Field(
+        default=6, title="Full months of executions kept before the current one"
+    )
+    premake_months: int = Field(
+        default=2, title="Months after the current one given a partition ahead"
+    )
+
+
+partition_settings = PartitionSettings()
@@ -17,6 +17,15 @@ class PrefectSettings(BaseSettings):
     host: str = Field(default="prefect-server", title="Prefect server host")
     port: int = Field(default=4200, title="Prefect server port")
     pool_name: str = Field(default="local-pool", title="Prefect pool name")
+    batch_queue_limit: int = Field(
+        default=4, title="Batch execution flow runs running at once", gt=0
+    )
+    deployment: str = Field(
+        default="execute-workflow/default", title="Execution flow deployment"
+    )
+    batch_deployment: str = Field(
+        default="execute-batch/default", title="Batch execution flow deployment"
+    )
 
     @property
     def url(self) -> str:
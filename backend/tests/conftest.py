@@ -1,8 +1,11 @@
 """Pytest fixtures for backend tests."""
 
-from collections.abc import AsyncGenerator
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Generator
 
+import pytest
 import pytest_asyncio
+import redis.asyncio as redis
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -11,11 +14,15 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from testcontainers.postgres import PostgresContainer
+from testcontainers.redis import RedisContainer
 
 from dependencies import db
+from engine.plan import plan_cache
+from engine.topology import topology_cache
 from main import app
 from models import Base
-from settings import postgres_settings
+from settings import postgres_settings, redis_settings
+from utils.redis import redis_client
 
 
 @pytest_asyncio.fixture(scope="session")
@@ -25,6 +32,43 @@ async def postgres_container() -> AsyncGenerator[PostgresContainer, None]:
         yield postgres
 
 
+@pytest.fixture(scope="session")
+def redis_container() -> Generator[RedisContainer, None, None]:
+    """Spin up a Redis container for the test session."""
+    with RedisContainer(image=redis_settings.image) as container:
+        yield container
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def test_redis(
+    redis_container: RedisContainer, monkeypatch: pytest.MonkeyPatch
+) -> AsyncGenerator[redis.Redis, None]:
+    """Point the shared Redis client at the emptied test container.
+
+    Connections belong to the event loop of one test, so every test gets a
+    fresh pool.
+    """
+    pool = redis.ConnectionPool(
+        host=redis_container.get_container_host_ip(),
+        port=int(redis_container.get_exposed_port(redis_container.port)),
+        db=redis_settings.db,
+        decode_responses=True,
+    )
+    monkeypatch.setattr(redis_client, "connection_pool", pool)
+    await redis_client.flushdb()
+
+    yield redis_client
+
+    await pool.disconnect()
+
+
+@pytest.fixture(autouse=True)
+def clear_graph_caches(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Start every test with empty graph caches, as fresh databases reuse IDs."""
+    monkeypatch.setattr(plan_cache, "_plans", OrderedDict())
+    monkeypatch.setattr(topology_cache, "_orders", OrderedDict())
+
+
 @pytest_asyncio.fixture(scope="function")
 async def test_engine(
     postgres_container: PostgresContainer,
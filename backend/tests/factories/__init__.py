@@ -2,6 +2,7 @@
 
 from tests.factories.edge import EdgeFactory
 from tests.factories.execution import ExecutionFactory
+from tests.factories.execution_node_run import ExecutionNodeRunFactory
 from tests.factories.llm_provider import LLMProviderFactory
 from tests.factories.node import NodeFactory
 from tests.factories.user import UserFactory
@@ -10,6 +11,7 @@ from tests.factories.workflow import WorkflowFactory
 __all__ = [
     "EdgeFactory",
     "ExecutionFactory",
+    "ExecutionNodeRunFactory",
     "LLMProviderFactory",
     "NodeFactory",
     "UserFactory",
@@ -0,0 +1,34 @@
+"""Execution node run model factory."""
+
+from datetime import UTC, datetime
+
+from factory.declarations import LazyFunction
+
+from enums import NodeType
+from models.execution_node_run import ExecutionNodeRun
+from tests.factories.base import AsyncSQLAlchemyModelFactory
+
+
+def _utcnow() -> datetime:
+    """Return the current naive UTC time."""
+    return datetime.now(tz=UTC).replace(tzinfo=None)
+
+
+class ExecutionNodeRunFactory(AsyncSQLAlchemyModelFactory):
+    """Factory for creating ExecutionNodeRun instances."""
+
+    class Meta:
+        """Factory meta configuration."""
+
+        model = ExecutionNodeRun
+
+    execution_id = None
+    node_id = None
+    node_type = NodeType.LLM
+    execution_started_at = LazyFunction(_utcnow)
+    queued_at = LazyFunction(_utcnow)
+    started_at = LazyFunction(_utcnow)
+    finished_at = LazyFunction(_utcnow)
+    queue_wait_ms = 0.0
+    duration_ms = 0.0
+    cached = False
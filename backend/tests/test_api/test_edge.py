@@ -1,5 +1,7 @@
 """Edge API tests."""
 
+from http import HTTPStatus
+
 import pytest
 
 from enums import NodeType
@@ -48,6 +50,44 @@ class TestEdgeCreate(BaseTestCase):
         if data["workflow_id"] != workflow.id:
             pytest.fail("Edge workflow_id did not match request")
 
+    @pytest.mark.asyncio
+    async def test_cycle(self) -> None:
+        """Edges closing a cycle are rejected."""
+        user, headers = await self.create_user_and_get_token()
+        workflow = await WorkflowFactory.create_async(
+            session=self.session, owner_id=user["id"]
+        )
+        nodes = [
+            await NodeFactory.create_async(
+                session=self.session, workflow_id=workflow.id, type=NodeType.LLM
+            )
+            for _ in range(3)
+        ]
+
+        responses = [
+            await self.client.post(
+                url=self.url,
+                json={
+                    "workflow_id": workflow.id,
+                    "source_node_id": source.id,
+                    "target_node_id": target.id,
+                },
+                headers=headers,
+            )
+            for source, target in [
+                (nodes[1], nodes[2]),
+                (nodes[0], nodes[1]),
+                (nodes[2], nodes[0]),
+            ]
+        ]
+
+        if [response.status_code for response in responses] != [
+            HTTPStatus.OK,
+            HTTPStatus.OK,
+            HTTPStatus.BAD_REQUEST,
+        ]:
+            pytest.fail("Expected only the cycle-closing edge to be rejected")
+
 
 class TestEdgeList(BaseTestCase):
     """Tests for GET /edges."""
@@ -1,10 +1,22 @@
 """Execution API tests."""
 
+from http import HTTPStatus
+from pathlib import Path
+
 import pytest
+import redis.asyncio as redis
 
-from enums import ExecutionStatus
-from tests.factories import ExecutionFactory, WorkflowFactory
+from engine import execution_executor
+from enums import ExecutionEventType, ExecutionPriority, ExecutionStatus
+from tests.factories import (
+    ExecutionFactory,
+    ExecutionNodeRunFactory,
+    NodeFactory,
+    WorkflowFactory,
+)
 from tests.test_api.base import BaseTestCase
+from utils.blob import blob_store
+from utils.redis import redis_client
 
 
 class TestExecutionCreate(BaseTestCase):
@@ -32,6 +44,129 @@ class TestExecutionCreate(BaseTestCase):
             pytest.fail("Execution workflow_id did not match request")
         if data["status"] != ExecutionStatus.CREATED:
             pytest.fail("Execution status did not match default")
+        if data["priority"] != ExecutionPriority.INTERACTIVE:
+            pytest.fail("Execution priority did not match default")
+
+    @pytest.mark.asyncio
+    async def test_user_limit(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Saturated users are told to retry later."""
+        monkeypatch.setattr(execution_executor, "_user_limit", 0)
+        user, headers = await self.create_user_and_get_token()
+        workflow = await WorkflowFactory.create_async(
+            session=self.session, owner_id=user["id"]
+        )
+
+        response = await self.client.post(
+            url=self.url, json={"workflow_id": workflow.id}, headers=headers
+        )
+
+        if response.status_code != HTTPStatus.TOO_MANY_REQUESTS:
+            pytest.fail(f"Expected TOO_MANY_REQUESTS, got {response.status_code}")
+        if "retry-after" not in response.headers:
+            pytest.fail("Expected a Retry-After header")
+
+    @pytest.mark.asyncio
+    async def test_offloaded(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """Large inputs are kept as previews in lists and loaded by ID."""
+        monkeypatch.setattr(blob_store, "_path", tmp_path)
+        monkeypatch.setattr(blob_store, "_threshold", 64)
+        user, headers = await self.create_user_and_get_token()
+        workflow = await WorkflowFactory.create_async(
+            session=self.session, owner_id=user["id"]
+        )
+        input_data = {"document": "x" * 1024}
+
+        response = await self.client.post(
+            url=self.url,
+            json={"workflow_id": workflow.id, "input_data": input_data},
+            headers=headers,
+        )
+        created = await self.assert_response_dict(response=response)
+        listed = await self.client.get(
+            url=self.url, params={"workflow_id": workflow.id}, headers=headers
+        )
+        fetched = await self.client.get(
+            url=f"{self.url}/{created['id']}", headers=headers
+        )
+
+        if not created["input_blob"]:
+            pytest.fail("Expected the input to be offloaded")
+        if listed.json()[0]["input_data"] == input_data:
+            pytest.fail("Expected a preview of the input in the list")
+        if fetched.json()["input_data"] != input_data:
+            pytest.fail("Expected the whole input when fetched by ID")
+
+
+class TestExecutionBatchCreate(BaseTestCase):
+    """Tests for POST /executions/batch."""
+
+    url = "/executions/batch"
+
+    @pytest.mark.asyncio
+    async def test_ok(self) -> None:
+        """Batch creation returns one execution per input, in order."""
+        user, headers = await self.create_user_and_get_token()
+        workflow = await WorkflowFactory.create_async(
+            session=self.session, owner_id=user["id"]
+        )
+        inputs = [{"seed": seed} for seed in range(5)]
+
+        response = await self.client.post(
+            url=self.url,
+            json={"workflow_id": workflow.id, "inputs": inputs},
+            headers=headers,
+        )
+
+        data = await self.assert_response_dict(response=response)
+        executions = [
+            await self.client.get(url=f"/executions/{execution_id}", headers=headers)
+            for execution_id in data["execution_ids"]
+        ]
+        if [execution.json()["input_data"] for execution in executions] != inputs:
+            pytest.fail("Batch executions did not match the inputs in order")
+        if executions[0].json()["priority"] != ExecutionPriority.BATCH:
+            pytest.fail("Batch executions did not default to the batch class")
+
+    @pytest.mark.asyncio
+    async def test_empty(self) -> None:
+        """Batches need at least one input."""
+        user, headers = await self.create_user_and_get_token()
+        workflow = await WorkflowFactory.create_async(
+            session=self.session, owner_id=user["id"]
+        )
+
+        response = await self.client.post(
+            url=self.url,
+            json={"workflow_id": workflow.id, "inputs": []},
+            headers=headers,
+        )
+
+        if response.status_code != HTTPStatus.UNPROCESSABLE_ENTITY:
+            pytest.fail(f"Expected UNPROCESSABLE_ENTITY, got {response.status_code}")
+
+
+class TestExecutionStream(BaseTestCase):
+    """Tests for POST /executions/stream."""
+
+    url = "/executions/stream"
+
+    @pytest.mark.asyncio
+    async def test_not_owner(self) -> None:
+        """Streaming another user's workflow is rejected before streaming."""
+        owner, _ = await self.create_user_and_get_token()
+        _, headers = await self.create_user_and_get_token()
+        workflow = await WorkflowFactory.create_async(
+            session=self.session, owner_id=owner["id"]
+        )
+
+        response = await self.client.post(
+            url=self.url, json={"workflow_id": workflow.id}, headers=headers
+        )
+
+        if response.status_code != HTTPStatus.NOT_FOUND:
+            pytest.fail(f"Expected NOT_FOUND, got {response.status_code}")
 
 
 class TestExecutionList(BaseTestCase):
@@ -64,3 +199,192 @@ class TestExecutionList(BaseTestCase):
         ids = {item.get("id") for item in data}
         if first.id not in ids or second.id not in ids:
             pytest.fail("Expected executions to appear in list")
+
+
+class TestExecutionGet(BaseTestCase):
+    """Tests for GET /executions/{execution_id}."""
+
+    url = "/executions"
+
+    @pytest.mark.asyncio
+    async def test_ok(self) -> None:
+        """Fetching an execution returns its data."""
+        user, headers = await self.create_user_and_get_token()
+        workflow = await WorkflowFactory.create_async(
+            session=self.session, owner_id=user["id"]
+        )
+        execution = await ExecutionFactory.create_async(
+            session=self.session, workflow_id=workflow.id
+        )
+
+        response = await self.client.get(
+            url=f"{self.url}/{execution.id}", headers=headers
+        )
+
+        data = await self.assert_response_dict(response=response)
+        if data["id"] != execution.id:
+            pytest.fail("Execution id did not match request")
+
+
+class TestExecutionCancel(BaseTestCase):
+    """Tests for POST /executions/{execution_id}/cancel."""
+
+    url = "/executions"
+
+    @pytest.mark.asyncio
+    async def test_ok(self) -> None:
+        """Unfinished executions are cancelled."""
+        user, headers = await self.create_user_and_get_token()
+        workflow = await WorkflowFactory.create_async(
+            session=self.session, owner_id=user["id"]
+        )
+        execution = await ExecutionFactory.create_async(
+            session=self.session, workflow_id=workflow.id
+        )
+
+        response = await self.client.post(
+            url=f"{self.url}/{execution.id}/cancel", headers=headers
+        )
+
+        data = await self.assert_response_dict(response=response)
+        if data["status"] != ExecutionStatus.CANCELLED:
+            pytest.fail("Execution was not cancelled")
+        if data["finished_at"] is None:
+            pytest.fail("Cancelled execution has no finished_at")
+
+    @pytest.mark.asyncio
+    async def test_finished(self) -> None:
+        """Finished executions keep their status."""
+        user, headers = await self.create_user_and_get_token()
+        workflow = await WorkflowFactory.create_async(
+            session=self.session, owner_id=user["id"]
+        )
+        execution = await ExecutionFactory.create_async(
+            session=self.session,
+            workflow_id=workflow.id,
+            status=ExecutionStatus.SUCCESS,
+        )
+
+        response = await self.client.post(
+            url=f"{self.url}/{execution.id}/cancel", headers=headers
+        )
+
+        data = await self.assert_response_dict(response=response)
+        if data["status"] != ExecutionStatus.SUCCESS:
+            pytest.fail("Finished execution status was changed")
+
+
+class TestExecutionNodeRuns(BaseTestCase):
+    """Tests for GET /executions/{execution_id}/nodes."""
+
+    url = "/executions"
+
+    @pytest.mark.asyncio
+    async def test_ok(self) -> None:
+        """Node runs of the execution are listed."""
+        user, headers = await self.create_user_and_get_token()
+        workflow = await WorkflowFactory.create_async(
+            session=self.session, owner_id=user["id"]
+        )
+        node = await NodeFactory.create_async(
+            session=self.session, workflow_id=workflow.id
+        )
+        execution = await ExecutionFactory.create_async(
+            session=self.session, workflow_id=workflow.id
+        )
+        await ExecutionNodeRunFactory.create_async(
+            session=self.session,
+            execution_id=execution.id,
+            node_id=node.id,
+            prompt_tokens=12,
+            completion_tokens=34,
+        )
+
+        response = await self.client.get(
+            url=f"{self.url}/{execution.id}/nodes", headers=headers
+        )
+
+        data = await self.assert_response_list(response=response)
+        if len(data) != 1:
+            pytest.fail(f"Expected 1 node run, got {len(data)}")
+        if (data[0]["node_id"], data[0]["completion_tokens"]) != (node.id, 34):
+            pytest.fail("Node run did not match the recorded run")
+
+
+class TestExecutionEvents(BaseTestCase):
+    """Tests for GET /executions/{execution_id}/events."""
+
+    url = "/executions"
+
+    @pytest.mark.asyncio
+    async def test_not_owner(self) -> None:
+        """Streaming another user's execution is rejected before streaming."""
+        owner, _ = await self.create_user_and_get_token()
+        _, headers = await self.create_user_and_get_token()
+        workflow = await WorkflowFactory.create_async(
+            session=self.session, owner_id=owner["id"]
+        )
+        execution = await ExecutionFactory.create_async(
+            session=self.session, workflow_id=workflow.id
+        )
+
+        response = await self.client.get(
+            url=f"{self.url}/{execution.id}/events", headers=headers
+        )
+
+        if response.status_code != HTTPStatus.NOT_FOUND:
+            pytest.fail(f"Expected NOT_FOUND, got {response.status_code}")
+
+    @pytest.mark.asyncio
+    async def test_redis_error(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A Redis error ends the stream with an error event."""
+        user, headers = await self.create_user_and_get_token()
+        workflow = await WorkflowFactory.create_async(
+            session=self.session, owner_id=user["id"]
+        )
+        execution = await ExecutionFactory.create_async(
+            session=self.session,
+            workflow_id=workflow.id,
+            status=ExecutionStatus.RUNNING,
+        )
+
+        async def fail(*_: object, **__: object) -> None:
+            raise redis.ConnectionError
+
+        monkeypatch.setattr(redis_client, "xread", fail)
+        response = await self.client.get(
+            url=f"{self.url}/{execution.id}/events",
+            headers={**headers, "Last-Event-ID": "5-0"},
+        )
+
+        if response.status_code != HTTPStatus.OK:
+            pytest.fail(f"Expected OK, got {response.status_code}")
+        if f"id: 5-0\nevent: {ExecutionEventType.STREAM_ERROR}\n" not in response.text:
+            pytest.fail(f"Expected a stream error event, got {response.text}")
+
+    @pytest.mark.asyncio
+    async def test_redis_error_finished(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Without Redis, a finished execution is replayed from the database."""
+        user, headers = await self.create_user_and_get_token()
+        workflow = await WorkflowFactory.create_async(
+            session=self.session, owner_id=user["id"]
+        )
+        execution = await ExecutionFactory.create_async(
+            session=self.session,
+            workflow_id=workflow.id,
+            status=ExecutionStatus.SUCCESS,
+            output_data={"answer": 42},
+        )
+
+        async def fail(*_: object, **__: object) -> None:
+            raise redis.ConnectionError
+
+        monkeypatch.setattr(redis_client, "exists", fail)
+        response = await self.client.get(
+            url=f"{self.url}/{execution.id}/events", headers=headers
+        )
+
+        if f"event: {ExecutionEventType.EXECUTION_FINISHED}\n" not in response.text:
+            pytest.fail(f"Expected the finished event, got {response.text}")
+        if '"answer":42' not in response.text:
+            pytest.fail(f"Expected the output from the database, got {response.text}")
@@ -24,6 +24,7 @@ class TestLLMProviderCreate(BaseTestCase):
             "type": LLMProviderType.OLLAMA,
             "api_key": secrets.token_urlsafe(18),
             "base_url": "https://example.com",
+            "group": "gpu",
             "is_default": True,
         }
 
@@ -32,12 +33,14 @@ class TestLLMProviderCreate(BaseTestCase):
         data = await self.assert_response_dict(response=response)
         self.assert_has_keys(
             data,
-            {"id", "user_id", "name", "type", "base_url", "is_default"},
+            {"id", "user_id", "name", "type", "base_url", "group", "is_default"},
         )
         if data["name"] != payload["name"]:
             pytest.fail("Provider name did not match request")
         if data["type"] != payload["type"]:
             pytest.fail("Provider type did not match request")
+        if data["group"] != payload["group"]:
+            pytest.fail("Provider group did not match request")
         if data["user_id"] != user["id"]:
             pytest.fail("Provider user_id did not match current user")
         if "api_key" in data:
@@ -41,6 +41,30 @@ class TestNodeCreate(BaseTestCase):
         if data["type"] != NodeType.INPUT:
             pytest.fail("Node type did not match request")
 
+    @pytest.mark.asyncio
+    async def test_map(self) -> None:
+        """MAP nodes keep the workflow they run per item."""
+        user, headers = await self.create_user_and_get_token()
+        workflow = await WorkflowFactory.create_async(
+            session=self.session, owner_id=user["id"]
+        )
+        subgraph = await WorkflowFactory.create_async(
+            session=self.session, owner_id=user["id"]
+        )
+        payload = {
+            "workflow_id": workflow.id,
+            "type": NodeType.MAP,
+            "data": {"workflow_id": subgraph.id, "concurrency": 4},
+        }
+
+        response = await self.client.post(url=self.url, json=payload, headers=headers)
+
+        data = await self.assert_response_dict(response=response)
+        if data["type"] != NodeType.MAP:
+            pytest.fail("Node type did not match request")
+        if data["data"]["workflow_id"] != subgraph.id:
+            pytest.fail("Node subgraph did not match request")
+
 
 class TestNodeList(BaseTestCase):
     """Tests for GET /nodes."""
@@ -110,6 +134,36 @@ class TestNodeUpdate(BaseTestCase):
         if data["position_x"] != new_x or data["position_y"] != new_y:
             pytest.fail("Node positions were not updated")
 
+    @pytest.mark.asyncio
+    async def test_version(self) -> None:
+        """Only data changes bump the workflow graph version."""
+        user, headers = await self.create_user_and_get_token()
+        workflow = await WorkflowFactory.create_async(
+            session=self.session, owner_id=user["id"]
+        )
+        node = await NodeFactory.create_async(
+            session=self.session, workflow_id=workflow.id
+        )
+        version = workflow.version
+
+        await self.client.patch(
+            url=f"{self.url}/{node.id}",
+            json={"position_x": 1.0, "position_y": 2.0},
+            headers=headers,
+        )
+        await self.session.refresh(workflow)
+        if workflow.version != version:
+            pytest.fail("Moving a node should not bump the workflow version")
+
+        await self.client.patch(
+            url=f"{self.url}/{node.id}",
+            json={"data": {"label": "renamed"}},
+            headers=headers,
+        )
+        await self.session.refresh(workflow)
+        if workflow.version != version + 1:
+            pytest.fail("Changing node data should bump the workflow version")
+
 
 class TestNodeDelete(BaseTestCase):
     """Tests for DELETE /nodes/{node_id}."""
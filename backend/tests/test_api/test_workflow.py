@@ -4,7 +4,14 @@ import uuid
 
 import pytest
 
-from tests.factories import UserFactory, WorkflowFactory
+from tests.factories import (
+    EdgeFactory,
+    ExecutionFactory,
+    ExecutionNodeRunFactory,
+    NodeFactory,
+    UserFactory,
+    WorkflowFactory,
+)
 from tests.test_api.base import BaseTestCase
 
 
@@ -63,6 +70,55 @@ class TestWorkflowList(BaseTestCase):
             pytest.fail("Unexpected workflow from another user in list")
 
 
+class TestWorkflowPlan(BaseTestCase):
+    """Tests for GET /workflows/{workflow_id}/plan."""
+
+    url = "/workflows"
+
+    @pytest.mark.asyncio
+    async def test_ok(self) -> None:
+        """The slowest branch of a diamond is the critical path."""
+        user, headers = await self.create_user_and_get_token()
+        workflow = await WorkflowFactory.create_async(
+            session=self.session, owner_id=user["id"]
+        )
+        head, fast, slow, tail = [
+            await NodeFactory.create_async(
+                session=self.session, workflow_id=workflow.id
+            )
+            for _ in range(4)
+        ]
+        for source, target in ((head, fast), (head, slow), (fast, tail), (slow, tail)):
+            await EdgeFactory.create_async(
+                session=self.session,
+                workflow_id=workflow.id,
+                source_node_id=source.id,
+                target_node_id=target.id,
+            )
+        execution = await ExecutionFactory.create_async(
+            session=self.session, workflow_id=workflow.id
+        )
+        for node, duration_ms in ((fast, 100.0), (slow, 300.0)):
+            await ExecutionNodeRunFactory.create_async(
+                session=self.session,
+                execution_id=execution.id,
+                node_id=node.id,
+                duration_ms=duration_ms,
+            )
+
+        response = await self.client.get(
+            url=f"{self.url}/{workflow.id}/plan", headers=headers
+        )
+
+        data = await self.assert_response_dict(response=response)
+        if data["critical_path"] != [head.id, slow.id, tail.id]:
+            pytest.fail("Critical path did not follow the slow branch")
+        if (data["width"], data["estimated_duration_ms"]) != (2, 300.0):
+            pytest.fail("Width or estimated duration did not match the graph")
+        if data["unestimated_node_ids"] != [head.id, tail.id]:
+            pytest.fail("Nodes without runs were not reported")
+
+
 class TestWorkflowUpdate(BaseTestCase):
     """Tests for PATCH /workflows/{workflow_id}."""
 
@@ -0,0 +1 @@
+"""Engine unit tests."""
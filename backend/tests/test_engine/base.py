@@ -0,0 +1,106 @@
+"""Shared test helpers for engine tests backed by the database."""
+
+import asyncio
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from engine.nodes import NODE_HANDLERS, NodeContext
+from engine.runner import ExecutionEngine
+from enums import ExecutionStatus, NodeType
+from exceptions import NodeExecutionError
+from models import Execution, Node
+from tests.factories import (
+    EdgeFactory,
+    ExecutionFactory,
+    NodeFactory,
+    UserFactory,
+    WorkflowFactory,
+)
+
+
+class EngineTestCase:
+    """Base test case running an INPUT -> LLM -> LLM -> OUTPUT workflow.
+
+    LLM nodes append `!` to their input through a stub handler that records
+    its calls and can be made to block or fail.
+    """
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup(
+        self,
+        test_engine: AsyncEngine,
+        test_session: AsyncSession,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Create the workflow, an engine on the test database and the stub."""
+        self.session = test_session
+        self.session_factory = async_sessionmaker(
+            test_engine, class_=AsyncSession, expire_on_commit=False
+        )
+        self.engine = ExecutionEngine(session_factory=self.session_factory)
+        monkeypatch.setattr(self.engine, "_watch_cancellations", lambda: None)
+
+        self.user = await UserFactory.create_async(session=test_session)
+        self.workflow = await WorkflowFactory.create_async(
+            session=test_session, owner_id=self.user.id
+        )
+        self.nodes = [
+            await NodeFactory.create_async(
+                session=test_session,
+                workflow_id=self.workflow.id,
+                type=node_type,
+                data={},
+            )
+            for node_type in (
+                NodeType.INPUT,
+                NodeType.LLM,
+                NodeType.LLM,
+                NodeType.OUTPUT,
+            )
+        ]
+        for source, target in zip(self.nodes, self.nodes[1:], strict=False):
+            await EdgeFactory.create_async(
+                session=test_session,
+                workflow_id=self.workflow.id,
+                source_node_id=source.id,
+                target_node_id=target.id,
+            )
+
+        self.calls: list[int] = []
+        self.started = asyncio.Event()
+        self.error: str | None = None
+        self.block = False
+
+        async def run_llm(node: Node, inputs: list[Any], _context: NodeContext) -> Any:  # noqa: ANN401
+            self.calls.append(node.id)
+            self.started.set()
+            if self.block:
+                await asyncio.Event().wait()
+            if self.error:
+                raise NodeExecutionError(message=self.error)
+
+            return f"{inputs[0]}!"
+
+        monkeypatch.setitem(NODE_HANDLERS, NodeType.LLM, run_llm)
+
+    async def create_execution(
+        self,
+        status: ExecutionStatus = ExecutionStatus.CREATED,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Execution:
+        """Create an execution of the workflow."""
+        return await ExecutionFactory.create_async(
+            session=self.session,
+            workflow_id=self.workflow.id,
+            status=status,
+            input_data="hi",
+            **kwargs,
+        )
+
+    async def reload(self, execution: Execution) -> Execution:
+        """Read the persisted state of an execution."""
+        await self.session.refresh(execution)
+        return execution
@@ -0,0 +1,96 @@
+"""Tests for the LLM provider host balancer."""
+
+import contextlib
+
+import httpx
+import pytest
+
+from engine.balancer import ProviderBalancer
+from exceptions import NodeExecutionError
+
+HOSTS = ["http://a", "http://b"]
+
+
+def fail(balancer: ProviderBalancer, base_url: str, error: Exception) -> None:
+    """Record a request to a host failing with an error."""
+    with contextlib.suppress(Exception), balancer.track(base_url=base_url):
+        raise error
+
+
+def wrapped(error: httpx.HTTPError) -> NodeExecutionError:
+    """Wrap an HTTP error the way LLM nodes report it."""
+    node_error = NodeExecutionError(message=str(error))
+    node_error.__cause__ = error
+    return node_error
+
+
+def status_error(status_code: int) -> httpx.HTTPStatusError:
+    """Return the error raised for a response with a status code."""
+    request = httpx.Request("POST", "http://a/api/generate")
+    return httpx.HTTPStatusError(
+        message="error",
+        request=request,
+        response=httpx.Response(status_code=status_code, request=request),
+    )
+
+
+class TestProviderBalancer:
+    """Tests for ProviderBalancer."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self) -> None:
+        """Create a balancer ejecting hosts after two failures."""
+        self.balancer = ProviderBalancer(eject_failures=2, eject_seconds=60, decay=0.5)
+
+    def test_least_outstanding(self) -> None:
+        """Requests go to the host with the fewest requests in flight."""
+        with self.balancer.track(base_url="http://a"):
+            picked = self.balancer.pick(base_urls=HOSTS)
+
+        if picked != "http://b":
+            pytest.fail(f"Expected the idle host, got {picked}")
+
+    def test_transport_errors_eject(self) -> None:
+        """Hosts failing with transport errors or 5xx responses are ejected."""
+        fail(self.balancer, "http://a", httpx.ConnectError("refused"))
+        fail(self.balancer, "http://a", wrapped(status_error(503)))
+
+        with self.balancer.track(base_url="http://b"):
+            picked = self.balancer.pick(base_urls=HOSTS)
+
+        if picked != "http://b":
+            pytest.fail(f"Expected the ejected host to be skipped, got {picked}")
+
+    def test_request_errors_do_not_eject(self) -> None:
+        """Errors caused by the request or node configuration spare the host."""
+        for _ in range(3):
+            fail(self.balancer, "http://a", NodeExecutionError(message="no model"))
+            fail(self.balancer, "http://a", wrapped(status_error(404)))
+
+        with self.balancer.track(base_url="http://b"):
+            picked = self.balancer.pick(base_urls=HOSTS)
+
+        if picked != "http://a":
+            pytest.fail(f"Expected the host to stay in rotation, got {picked}")
+
+    def test_success_resets_failures(self) -> None:
+        """A successful request clears the failures counted against a host."""
+        fail(self.balancer, "http://a", httpx.ReadTimeout("slow"))
+        with self.balancer.track(base_url="http://a"):
+            pass
+        fail(self.balancer, "http://a", httpx.ReadTimeout("slow"))
+
+        with self.balancer.track(base_url="http://b"):
+            picked = self.balancer.pick(base_urls=HOSTS)
+
+        if picked != "http://a":
+            pytest.fail(f"Expected the host not to be ejected, got {picked}")
+
+    def test_all_ejected(self) -> None:
+        """When every host is ejected the group still gets a host."""
+        for base_url in HOSTS:
+            for _ in range(2):
+                fail(self.balancer, base_url, httpx.ConnectError("refused"))
+
+        if self.balancer.pick(base_urls=HOSTS) not in HOSTS:
+            pytest.fail("Expected a host of the group")
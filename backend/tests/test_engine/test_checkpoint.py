@@ -0,0 +1,37 @@
+"""Tests for the checkpoints of completed node outputs."""
+
+import pytest
+
+from engine.checkpoint import ExecutionCheckpoints
+from utils.redis import redis_client
+
+
+class TestExecutionCheckpoints:
+    """Tests for saving and loading execution checkpoints."""
+
+    @pytest.mark.asyncio
+    async def test_versions(self) -> None:
+        """Checkpoints of another graph version are not loaded."""
+        checkpoints = ExecutionCheckpoints(client=redis_client, ttl=60)
+        await checkpoints.save(execution_id=1, version=1, node_id=2, output={"a": 1})
+
+        if await checkpoints.load(execution_id=1, version=2):
+            pytest.fail("Expected nothing checkpointed at the new version")
+        if await checkpoints.load(execution_id=1, version=1) != {2: {"a": 1}}:
+            pytest.fail("Expected the output checkpointed at its version")
+
+        await checkpoints.clear(execution_id=1, version=1)
+        if await checkpoints.load(execution_id=1, version=1):
+            pytest.fail("Expected the cleared checkpoint to be gone")
+
+    @pytest.mark.asyncio
+    async def test_ttl(self) -> None:
+        """Every save refreshes the time to live of the checkpoint."""
+        checkpoints = ExecutionCheckpoints(client=redis_client, ttl=60, prefix="cp")
+        await checkpoints.save(execution_id=1, version=1, node_id=2, output="a")
+        await redis_client.expire("cp:1:1", 5)
+
+        await checkpoints.save(execution_id=1, version=1, node_id=3, output="b")
+
+        if not 5 < await redis_client.ttl("cp:1:1") <= 60:  # noqa: PLR2004
+            pytest.fail("Expected the save to refresh the time to live")
@@ -0,0 +1,90 @@
+"""Tests for the embedding micro-batcher."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from engine import embedding
+from engine.embedding import EmbeddingBatcher
+from utils.ollama import ollama_clients
+
+
+class TestEmbeddingBatcher:
+    """Tests for batching concurrent embed calls."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Replace the Ollama embed request with a stub recording its texts."""
+        self.requests: list[list[str]] = []
+        self.error: Exception | None = None
+
+        async def embed(
+            client: httpx.AsyncClient,  # noqa: ARG001
+            base_url: str,  # noqa: ARG001
+            model: str,  # noqa: ARG001
+            texts: list[str],
+        ) -> list[list[float]]:
+            self.requests.append(texts)
+            if self.error:
+                raise self.error
+
+            return [[float(len(text))] for text in texts]
+
+        monkeypatch.setattr(embedding, "embed", embed)
+        self.batcher = EmbeddingBatcher(clients=ollama_clients, window=0.05, max_size=2)
+
+    async def embed(self, *texts: str) -> list[list[float]]:
+        """Embed texts concurrently with one model."""
+        return await asyncio.gather(
+            *(
+                self.batcher.embed(base_url="http://ollama", model="m", text=text)
+                for text in texts
+            )
+        )
+
+    @pytest.mark.asyncio
+    async def test_window(self) -> None:
+        """Calls within the window share one request."""
+        embeddings = await self.embed("a", "bb")
+
+        if self.requests != [["a", "bb"]]:
+            pytest.fail(f"Expected one request, got {self.requests}")
+        if embeddings != [[1.0], [2.0]]:
+            pytest.fail(f"Unexpected embeddings {embeddings}")
+
+    @pytest.mark.asyncio
+    async def test_max_size(self) -> None:
+        """A batch is sent as soon as it holds `max_size` texts."""
+        embeddings = await self.embed("a", "bb", "ccc", "dddd", "eeeee")
+
+        if self.requests != [["a", "bb"], ["ccc", "dddd"], ["eeeee"]]:
+            pytest.fail(f"Expected batches of two, got {self.requests}")
+        if embeddings != [[1.0], [2.0], [3.0], [4.0], [5.0]]:
+            pytest.fail(f"Unexpected embeddings {embeddings}")
+
+    @pytest.mark.asyncio
+    async def test_duplicates(self) -> None:
+        """Identical texts in a batch are embedded once and share a position."""
+        embeddings = await self.embed("a", "a", "bb")
+
+        if self.requests != [["a", "bb"]]:
+            pytest.fail(f"Expected the duplicate embedded once, got {self.requests}")
+        if embeddings != [[1.0], [1.0], [2.0]]:
+            pytest.fail(f"Unexpected embeddings {embeddings}")
+
+    @pytest.mark.asyncio
+    async def test_failure(self) -> None:
+        """A failed request fails every call in its batch."""
+        self.error = httpx.ConnectError("refused")
+
+        results = await asyncio.gather(
+            self.batcher.embed(base_url="http://ollama", model="m", text="a"),
+            self.batcher.embed(base_url="http://ollama", model="m", text="bb"),
+            return_exceptions=True,
+        )
+
+        if not all(isinstance(result, httpx.ConnectError) for result in results):
+            pytest.fail(f"Expected every call to fail, got {results}")
+        if len(self.requests) != 1:
+            pytest.fail(f"Expected one request, got {self.requests}")
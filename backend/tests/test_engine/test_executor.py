@@ -0,0 +1,56 @@
+"""Tests for the in-process execution worker pool."""
+
+import pytest
+import redis.asyncio as redis
+
+from engine.executor import ExecutionExecutor
+from engine.lease import execution_leases
+from engine.slots import ExecutionSlots
+from exceptions import ExecutionQueueFullError, ExecutionRateLimitError
+from settings.executor import ExecutorSettings
+from tests.test_engine.base import EngineTestCase
+from utils.redis import redis_client
+
+
+class TestExecutionExecutor(EngineTestCase):
+    """Tests for admitting executions to the worker pool."""
+
+    def create_executor(self, **kwargs: int) -> ExecutionExecutor:
+        """Build an executor with slots on the test Redis."""
+        self.slots = ExecutionSlots(client=redis_client, ttl=60, retry_after=1)
+        return ExecutionExecutor(
+            engine=self.engine,
+            settings=ExecutorSettings(workers=1).model_copy(update=kwargs),
+            leases=execution_leases,
+            slots=self.slots,
+        )
+
+    @pytest.mark.asyncio
+    async def test_batch_slots(self) -> None:
+        """A batch is charged one slot per execution it runs at once."""
+        executor = self.create_executor(user_limit=4)
+        await executor.reserve(user_id=self.user.id, slots=3)
+
+        with pytest.raises(ExecutionRateLimitError):
+            await executor.reserve(user_id=self.user.id, slots=2)
+        await executor.reserve(user_id=self.user.id)
+
+        await executor.release(user_id=self.user.id, slots=3)
+        await executor.reserve(user_id=self.user.id, slots=3)
+
+    @pytest.mark.asyncio
+    async def test_fallback_limits(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Without Redis, the user and global limits are counted per process."""
+        executor = self.create_executor(user_limit=4, global_limit=5)
+
+        async def acquire(**_: int) -> list[str]:
+            raise redis.ConnectionError
+
+        monkeypatch.setattr(self.slots, "acquire", acquire)
+        await executor.reserve(user_id=self.user.id, slots=4)
+        with pytest.raises(ExecutionRateLimitError):
+            await executor.reserve(user_id=self.user.id)
+
+        await executor.reserve(user_id=self.user.id + 1)
+        with pytest.raises(ExecutionQueueFullError):
+            await executor.reserve(user_id=self.user.id + 1)
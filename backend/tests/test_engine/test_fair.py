@@ -0,0 +1,70 @@
+"""Tests for the weighted fair job queue."""
+
+from collections import Counter
+
+import pytest
+
+from engine.fair import FairQueue
+from enums import ExecutionPriority
+
+WEIGHTS = {ExecutionPriority.INTERACTIVE: 3, ExecutionPriority.BATCH: 1}
+
+
+async def drain(queue: FairQueue[str], count: int) -> list[str]:
+    """Take jobs off a queue in the order it serves them."""
+    return [await queue.get() for _ in range(count)]
+
+
+class TestFairQueue:
+    """Tests for FairQueue."""
+
+    @pytest.mark.asyncio
+    async def test_weights(self) -> None:
+        """Priority classes are served in proportion to their weights."""
+        queue: FairQueue[str] = FairQueue(weights=WEIGHTS)
+        for i in range(8):
+            queue.put_nowait(f"batch-{i}", priority=ExecutionPriority.BATCH, user_id=1)
+        for i in range(8):
+            queue.put_nowait(
+                f"interactive-{i}", priority=ExecutionPriority.INTERACTIVE, user_id=1
+            )
+
+        served = Counter(job.split("-")[0] for job in await drain(queue, count=8))
+
+        if served != {"interactive": 6, "batch": 2}:
+            pytest.fail(f"Expected a 3:1 share, got {dict(served)}")
+
+    @pytest.mark.asyncio
+    async def test_users_round_robin(self) -> None:
+        """Users of one class take turns instead of waiting behind each other."""
+        queue: FairQueue[str] = FairQueue(weights=WEIGHTS)
+        for i in range(3):
+            queue.put_nowait(f"a-{i}", priority=ExecutionPriority.BATCH, user_id=1)
+        queue.put_nowait("b-0", priority=ExecutionPriority.BATCH, user_id=2)
+
+        served = await drain(queue, count=4)
+
+        if served != ["a-0", "b-0", "a-1", "a-2"]:
+            pytest.fail(f"Expected users to alternate, got {served}")
+
+    @pytest.mark.asyncio
+    async def test_idle_class_banks_no_turns(self) -> None:
+        """A class that was idle does not get a burst of turns when it returns."""
+        queue: FairQueue[str] = FairQueue(weights=WEIGHTS)
+        for i in range(9):
+            queue.put_nowait(
+                f"interactive-{i}", priority=ExecutionPriority.INTERACTIVE, user_id=1
+            )
+        await drain(queue, count=9)
+        for i in range(4):
+            queue.put_nowait(f"batch-{i}", priority=ExecutionPriority.BATCH, user_id=1)
+            queue.put_nowait(
+                f"interactive-{i}", priority=ExecutionPriority.INTERACTIVE, user_id=1
+            )
+
+        served = Counter(job.split("-")[0] for job in await drain(queue, count=4))
+
+        if served["batch"] > 2:  # noqa: PLR2004
+            pytest.fail(f"Expected no burst of batch turns, got {dict(served)}")
+        if len(queue) != 4:  # noqa: PLR2004
+            pytest.fail(f"Expected 4 queued jobs left, got {len(queue)}")
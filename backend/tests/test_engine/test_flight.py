@@ -0,0 +1,225 @@
+"""Tests for sharing runs between identical executions."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from engine.flight import ExecutionFlights, execution_flights
+from engine.lease import execution_leases
+from engine.supervisor import ExecutionSupervisor
+from enums import ExecutionStatus
+from models import Execution
+from settings import engine_settings
+from tests.test_engine.base import EngineTestCase
+from usecases.execution import ExecutionUsecase
+from utils.redis import redis_client
+
+
+class RecordingExecutor:
+    """Executor stub recording the executions submitted to it."""
+
+    def __init__(self) -> None:
+        """Initialize the stub."""
+        self.submitted: list[int] = []
+
+    async def reserve(self, user_id: int, slots: int = 1) -> None:
+        """Accept every reservation."""
+
+    async def release(self, user_id: int, slots: int = 1) -> None:
+        """Release nothing."""
+
+    async def submit(self, execution_id: int, **_: object) -> None:
+        """Record a submitted execution."""
+        self.submitted.append(execution_id)
+
+
+class TestDedupe(EngineTestCase):
+    """Tests for deciding which executions follow a running one."""
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup_usecase(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Create a usecase submitting to a recording executor."""
+        self.executor = RecordingExecutor()
+        self.usecase = ExecutionUsecase()
+        monkeypatch.setattr(self.usecase, "_executor", self.executor)
+        monkeypatch.setattr(engine_settings, "dedupe", True)
+
+    async def create_twice(self) -> list[int | None]:
+        """Create two identical executions and return their leaders."""
+        leaders = []
+        for _ in range(2):
+            execution = await self.usecase.create_execution(
+                session=self.session,
+                user_id=self.user.id,
+                workflow_id=self.workflow.id,
+                input_data={"text": "hi"},
+            )
+            leaders.append(execution.leader_id)
+
+        return leaders
+
+    @pytest.mark.asyncio
+    async def test_reproducible(self) -> None:
+        """Identical executions of a temperature zero workflow share a run."""
+        for node in self.nodes[1:3]:
+            node.data = {"temperature": 0}
+        await self.session.commit()
+
+        leaders = await self.create_twice()
+
+        if leaders[0] is not None or leaders[1] != self.executor.submitted[0]:
+            pytest.fail(f"Expected the second execution to follow, got {leaders}")
+        if len(self.executor.submitted) != 1:
+            pytest.fail(f"Expected one submitted run, got {self.executor.submitted}")
+
+    @pytest.mark.asyncio
+    async def test_sampled(self) -> None:
+        """Executions of a workflow sampling its LLM nodes run on their own."""
+        self.nodes[1].data = {"temperature": 0}
+        await self.session.commit()
+
+        leaders = await self.create_twice()
+
+        if leaders != [None, None]:
+            pytest.fail(f"Expected no followers, got {leaders}")
+        if len(self.executor.submitted) != 2:  # noqa: PLR2004
+            pytest.fail(f"Expected two submitted runs, got {self.executor.submitted}")
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Without deduplication, identical executions run on their own."""
+        monkeypatch.setattr(engine_settings, "dedupe", False)
+        for node in self.nodes[1:3]:
+            node.data = {"temperature": 0}
+        await self.session.commit()
+
+        if await self.create_twice() != [None, None]:
+            pytest.fail("Expected no followers with deduplication disabled")
+
+
+class TestExecutionFlights:
+    """Tests for leading and following flights in Redis."""
+
+    @pytest.mark.asyncio
+    async def test_join(self) -> None:
+        """The first execution of a key leads and later ones follow it."""
+        flights = ExecutionFlights(client=redis_client, ttl=60)
+
+        if await flights.join(key="key", execution_id=1) is not None:
+            pytest.fail("Expected the first execution to lead")
+        if await flights.join(key="key", execution_id=2) != 1:
+            pytest.fail("Expected the second execution to follow the first")
+        if await flights.join(key="other", execution_id=3) is not None:
+            pytest.fail("Expected another key to have its own flight")
+
+    @pytest.mark.asyncio
+    async def test_land(self) -> None:
+        """A landed flight is led by the next execution joining its key."""
+        flights = ExecutionFlights(client=redis_client, ttl=60)
+        await flights.join(key="key", execution_id=1)
+
+        await flights.land(execution_id=1)
+
+        if await flights.join(key="key", execution_id=2) is not None:
+            pytest.fail("Expected a new flight after landing")
+
+    @pytest.mark.asyncio
+    async def test_hand_over(self) -> None:
+        """A flight handed over is followed, and landed, through its successor."""
+        flights = ExecutionFlights(client=redis_client, ttl=60)
+        await flights.join(key="key", execution_id=1)
+
+        await flights.hand_over(execution_id=1, successor_id=2)
+
+        if await flights.join(key="key", execution_id=3) != 2:  # noqa: PLR2004
+            pytest.fail("Expected new executions to follow the successor")
+        await flights.land(execution_id=1)
+        if await flights.join(key="key", execution_id=4) != 2:  # noqa: PLR2004
+            pytest.fail("Expected the former leader not to land the flight")
+        await flights.land(execution_id=2)
+        if await flights.join(key="key", execution_id=5) is not None:
+            pytest.fail("Expected the successor to land the flight")
+
+
+class TestFollowers(EngineTestCase):
+    """Tests for finishing and promoting executions that follow a leader."""
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def enable_dedupe(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Enable deduplication."""
+        monkeypatch.setattr(engine_settings, "dedupe", True)
+
+    async def create_flight(self) -> list[Execution]:
+        """Create a leader and two executions following it."""
+        leader = await self.create_execution()
+        followers = [await self.create_execution(leader_id=leader.id) for _ in range(2)]
+        await execution_flights.join(key="key", execution_id=leader.id)
+
+        return [leader, *followers]
+
+    @pytest.mark.asyncio
+    async def test_finish(self) -> None:
+        """Followers finish with the outcome of their leader, without running."""
+        leader, *followers = await self.create_flight()
+
+        await self.engine.run(execution_id=leader.id)
+
+        for follower in followers:
+            finished = await self.reload(execution=follower)
+            if finished.status != ExecutionStatus.SUCCESS:
+                pytest.fail(f"Expected SUCCESS, got {finished.status}")
+            if finished.output_data != {str(self.nodes[-1].id): "hi!!"}:
+                pytest.fail(f"Unexpected output {finished.output_data}")
+        if len(self.calls) != 2:  # noqa: PLR2004
+            pytest.fail(f"Expected the workflow to run once, got {self.calls}")
+        if await execution_flights.join(key="key", execution_id=0) is not None:
+            pytest.fail("Expected the flight to land with its leader")
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader(self) -> None:
+        """The oldest follower of a cancelled leader runs and leads the others."""
+        leader, promoted, follower = await self.create_flight()
+        self.block = True
+
+        task = asyncio.create_task(self.engine.run(execution_id=leader.id))
+        await asyncio.wait_for(self.started.wait(), timeout=5)
+        self.block = False
+        if await execution_flights.join(key="key", execution_id=0) != leader.id:
+            pytest.fail("Expected the leader to lead the flight")
+        self.engine.cancel(execution_id=leader.id)
+        await asyncio.wait_for(task, timeout=5)
+
+        leader, promoted, follower = [
+            await self.reload(execution=execution)
+            for execution in (leader, promoted, follower)
+        ]
+        if leader.status != ExecutionStatus.CANCELLED:
+            pytest.fail(f"Expected the leader CANCELLED, got {leader.status}")
+        if promoted.status != ExecutionStatus.SUCCESS or promoted.leader_id:
+            pytest.fail("Expected the oldest follower to lead and succeed")
+        if follower.leader_id != promoted.id:
+            pytest.fail("Expected the other follower to follow the promoted one")
+        if follower.output_data != promoted.output_data:
+            pytest.fail("Expected the follower to finish with the promoted output")
+
+    @pytest.mark.asyncio
+    async def test_orphans(self) -> None:
+        """The supervisor runs executions whose leader finished without them."""
+        leader = await self.create_execution(status=ExecutionStatus.SUCCESS)
+        orphan = await self.create_execution(leader_id=leader.id)
+        await self.session.commit()
+        supervisor = ExecutionSupervisor(
+            engine=self.engine,
+            leases=execution_leases,
+            interval=1,
+            limit=1,
+            session_factory=self.session_factory,
+        )
+
+        await supervisor._sweep()  # noqa: SLF001
+        await asyncio.gather(*supervisor._jobs)  # noqa: SLF001
+
+        orphan = await self.reload(execution=orphan)
+        if orphan.status != ExecutionStatus.SUCCESS or orphan.leader_id:
+            pytest.fail("Expected the orphan to run on its own")
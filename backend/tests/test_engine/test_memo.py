@@ -0,0 +1,34 @@
+"""Tests for the memoized node output store."""
+
+import pytest
+
+from engine.memo import NodeOutputStore
+from utils.redis import redis_client
+
+
+class TestNodeOutputStore:
+    """Tests for bounding the memory of memoized outputs."""
+
+    @pytest.mark.asyncio
+    async def test_evict_least_recent(self) -> None:
+        """Past the maximum, the least recently used outputs are evicted."""
+        store = NodeOutputStore(client=redis_client, ttl=60, max_entries=2, max_size=64)
+        await store.set(key="a", value="first")
+        await store.set(key="b", value="second")
+        await store.get(key="a")
+
+        await store.set(key="c", value="third")
+
+        found = [(await store.get(key=key))[0] for key in ("a", "b", "c")]
+        if found != [True, False, True]:
+            pytest.fail(f"Expected only the least recent output evicted, got {found}")
+
+    @pytest.mark.asyncio
+    async def test_max_size(self) -> None:
+        """Outputs over the maximum size are not stored."""
+        store = NodeOutputStore(client=redis_client, ttl=60, max_entries=2, max_size=8)
+
+        await store.set(key="a", value="x" * 8)
+
+        if await store.get(key="a") != (False, None):
+            pytest.fail("Expected the large output not to be stored")
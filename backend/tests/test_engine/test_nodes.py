@@ -0,0 +1,71 @@
+"""Tests for the node handlers."""
+
+from typing import Any
+
+import pytest
+
+from engine.nodes import NodeContext, run_map
+from engine.plan import compile_plan
+from engine.runner import ExecutionEngine
+from enums import NodeType
+from exceptions import NodeExecutionError
+from models import Edge, Node
+from utils.ollama import ollama_clients
+
+
+def map_node(data: dict[str, Any]) -> Node:
+    """Return a MAP node with the given data."""
+    return Node(id=10, workflow_id=1, type=NodeType.MAP, data=data)
+
+
+def map_context() -> NodeContext:
+    """Return a context whose subgraph 2 passes its input through."""
+    subgraph = compile_plan(
+        workflow_id=2,
+        version=1,
+        nodes=[
+            Node(id=1, workflow_id=2, type=NodeType.INPUT, data={}),
+            Node(id=2, workflow_id=2, type=NodeType.OUTPUT, data={}),
+        ],
+        edges=[Edge(id=1, workflow_id=2, source_node_id=1, target_node_id=2)],
+    )
+
+    return NodeContext(
+        input_data=None,
+        clients=ollama_clients,
+        subgraphs={2: subgraph},
+        run_graph=ExecutionEngine().run_graph,
+    )
+
+
+class TestRunMap:
+    """Tests for MAP nodes."""
+
+    @pytest.mark.asyncio
+    async def test_items(self) -> None:
+        """Every item runs through the subgraph, in order."""
+        outputs = await run_map(
+            node=map_node(data={"workflow_id": 2, "concurrency": 2}),
+            inputs=[["a", "b", "c"]],
+            context=map_context(),
+        )
+
+        if outputs != [{"2": "a"}, {"2": "b"}, {"2": "c"}]:
+            pytest.fail(f"Unexpected outputs {outputs}")
+
+    @pytest.mark.asyncio
+    async def test_missing_workflow(self) -> None:
+        """A MAP node without a workflow ID fails as a node error."""
+        with pytest.raises(NodeExecutionError, match="no workflow_id"):
+            await run_map(node=map_node(data={}), inputs=[["a"]], context=map_context())
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("concurrency", [None, 0, "2"])
+    async def test_invalid_concurrency(self, concurrency: Any) -> None:  # noqa: ANN401
+        """A MAP node whose concurrency is not a positive integer fails."""
+        with pytest.raises(NodeExecutionError, match="positive integer"):
+            await run_map(
+                node=map_node(data={"workflow_id": 2, "concurrency": concurrency}),
+                inputs=[["a"]],
+                context=map_context(),
+            )
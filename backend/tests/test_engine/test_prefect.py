@@ -0,0 +1,180 @@
+"""Tests for running executions on Prefect."""
+
+import uuid
+from collections.abc import Generator
+from functools import partial
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from prefect.client.orchestration import get_client
+from prefect.client.schemas.filters import TaskRunFilter, TaskRunFilterName
+from prefect.exceptions import PrefectException
+from prefect.states import Crashed, Running, State
+from prefect.testing.utilities import prefect_test_harness
+
+from engine import prefect
+from engine.prefect import PrefectExecutor
+from engine.runner import ExecutionEngine
+from enums import ExecutionPriority, ExecutionStatus
+from flows import execution as flows
+from flows.execution import PrefectExecutionEngine, execute_workflow, sync_executions
+from tests.test_engine.base import EngineTestCase
+
+
+@pytest.fixture(scope="module", autouse=True)
+def prefect_server() -> Generator[None, None, None]:
+    """Run the flows of this module against a temporary Prefect server."""
+    with prefect_test_harness():
+        yield
+
+
+class PrefectTestCase(EngineTestCase):
+    """Base test case submitting flow runs to a recording stub."""
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup_prefect(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Replace the deployment runs with a stub and build the executor."""
+        self.submitted: list[dict[str, Any]] = []
+        self.submit_error: Exception | None = None
+
+        async def run_deployment(**kwargs: Any) -> SimpleNamespace:  # noqa: ANN401
+            if self.submit_error:
+                raise self.submit_error
+            self.submitted.append(kwargs)
+            return SimpleNamespace(id=uuid.uuid4())
+
+        monkeypatch.setattr(prefect, "run_deployment", run_deployment)
+        self.executor = PrefectExecutor(
+            deployment="execute-workflow/default",
+            batch_deployment="execute-batch/default",
+            session_factory=self.session_factory,
+        )
+
+
+class TestPrefectExecutor(PrefectTestCase):
+    """Tests for handing executions over to flow runs."""
+
+    @pytest.mark.asyncio
+    async def test_submit(self) -> None:
+        """A submitted execution is linked to its flow run and tagged."""
+        execution = await self.create_execution()
+
+        await self.executor.submit(
+            execution_id=execution.id,
+            user_id=self.user.id,
+            priority=ExecutionPriority.BATCH,
+        )
+
+        execution = await self.reload(execution=execution)
+        if execution.flow_run_id is None:
+            pytest.fail("Expected the execution to be linked to its flow run")
+        if self.submitted[0]["parameters"] != {"execution_id": execution.id}:
+            pytest.fail(f"Unexpected parameters {self.submitted[0]['parameters']}")
+        if f"priority-{ExecutionPriority.BATCH}" not in self.submitted[0]["tags"]:
+            pytest.fail(f"Unexpected tags {self.submitted[0]['tags']}")
+        if self.submitted[0]["work_queue_name"] != ExecutionPriority.BATCH:
+            pytest.fail("Expected the flow run on the work queue of its class")
+
+    @pytest.mark.asyncio
+    async def test_submit_failed(self) -> None:
+        """An execution Prefect cannot take is failed right away."""
+        self.submit_error = PrefectException("work pool is gone")
+        execution = await self.create_execution()
+
+        await self.executor.submit(execution_id=execution.id, user_id=self.user.id)
+
+        execution = await self.reload(execution=execution)
+        if execution.status != ExecutionStatus.FAILED:
+            pytest.fail(f"Expected FAILED, got {execution.status}")
+        if "work pool is gone" not in (execution.error or ""):
+            pytest.fail(f"Unexpected error {execution.error}")
+
+
+class TestPrefectExecutionEngine(EngineTestCase):
+    """Tests for running executions with nodes reported as task runs."""
+
+    @pytest.mark.asyncio
+    async def test_task_runs(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Every node of the execution runs as a task run named after it."""
+        engine = PrefectExecutionEngine(session_factory=self.session_factory)
+        monkeypatch.setattr(engine, "_watch_cancellations", lambda: None)
+        execution = await self.create_execution()
+
+        await engine.run(execution_id=execution.id)
+
+        execution = await self.reload(execution=execution)
+        if execution.status != ExecutionStatus.SUCCESS:
+            pytest.fail(f"Expected SUCCESS, got {execution.status}")
+        names = [f"{node.type}-{node.id}" for node in self.nodes]
+        async with get_client() as client:
+            task_runs = await client.read_task_runs(
+                task_run_filter=TaskRunFilter(name=TaskRunFilterName(any_=names))
+            )
+        if sorted(task_run.name for task_run in task_runs) != sorted(names):
+            pytest.fail(f"Expected one task run per node, got {task_runs}")
+
+
+class TestSyncExecutions(PrefectTestCase):
+    """Tests for reconciling executions with their flow runs."""
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup_sync(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Point the flow at the test database and the stubbed executor."""
+        monkeypatch.setattr(flows, "async_session", self.session_factory)
+        monkeypatch.setattr(
+            flows,
+            "ExecutionEngine",
+            partial(ExecutionEngine, session_factory=self.session_factory),
+        )
+        monkeypatch.setattr(flows, "prefect_executor", self.executor)
+
+    async def create_flow_run(self, state: State) -> uuid.UUID:
+        """Create a flow run of the execution flow in a state."""
+        async with get_client() as client:
+            flow_run = await client.create_flow_run(flow=execute_workflow, state=state)
+
+        return flow_run.id
+
+    @pytest.mark.asyncio
+    async def test_reconcile(self) -> None:
+        """Executions of ended or missing flow runs fail; others are left."""
+        crashed = await self.create_execution(
+            flow_run_id=await self.create_flow_run(state=Crashed())
+        )
+        missing = await self.create_execution(flow_run_id=uuid.uuid4())
+        running = await self.create_execution(
+            status=ExecutionStatus.RUNNING,
+            flow_run_id=await self.create_flow_run(state=Running()),
+        )
+
+        failed = await sync_executions()
+
+        if failed != 2:  # noqa: PLR2004
+            pytest.fail(f"Expected 2 executions failed, got {failed}")
+        for execution in (crashed, missing):
+            await self.reload(execution=execution)
+            if execution.status != ExecutionStatus.FAILED:
+                pytest.fail(f"Expected {execution.id} FAILED, got {execution.status}")
+        running = await self.reload(execution=running)
+        if running.status != ExecutionStatus.RUNNING:
+            pytest.fail(f"Expected the running execution kept, got {running.status}")
+
+    @pytest.mark.asyncio
+    async def test_orphans(self) -> None:
+        """Followers of a leader that finished without them are resubmitted."""
+        leader = await self.create_execution(status=ExecutionStatus.SUCCESS)
+        follower = await self.create_execution(leader_id=leader.id)
+
+        await sync_executions()
+
+        follower = await self.reload(execution=follower)
+        if follower.leader_id is not None:
+            pytest.fail("Expected the follower to lead itself")
+        if follower.flow_run_id is None:
+            pytest.fail("Expected the follower to be given a flow run")
+        if [run["parameters"] for run in self.submitted] != [
+            {"execution_id": follower.id}
+        ]:
+            pytest.fail(f"Unexpected submissions {self.submitted}")
@@ -0,0 +1,187 @@
+"""Tests for the Redis Streams execution queue."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from engine.queue import StreamExecutor
+from engine.slots import ExecutionSlots
+from enums import ExecutionPriority, ExecutionStatus
+from exceptions import ExecutionQueueFullError, ExecutionRateLimitError
+from settings.executor import ExecutorSettings
+from tests.test_engine.base import EngineTestCase
+from utils.redis import redis_client
+
+
+class StreamTestCase(EngineTestCase):
+    """Base test case consuming the streams with a recording engine."""
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup_stream(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Record the batches the engine is asked to run."""
+        self.ran: list[list[int]] = []
+        self.resumed: list[bool] = []
+        self.done = asyncio.Event()
+        self.expected = 0
+
+        async def run_batch(execution_ids: list[int], *, resume: bool) -> None:
+            self.ran.append(execution_ids)
+            self.resumed.append(resume)
+            if len(self.ran) >= self.expected:
+                self.done.set()
+
+        monkeypatch.setattr(self.engine, "run_batch", run_batch)
+
+    def create_executor(self, **kwargs: int) -> StreamExecutor:
+        """Build an executor on the test Redis with one worker by default."""
+        settings = ExecutorSettings(workers=1, queue_heartbeat=1).model_copy(
+            update=kwargs
+        )
+        return StreamExecutor(
+            client=redis_client,
+            engine=self.engine,
+            settings=settings,
+            slots=ExecutionSlots(client=redis_client, ttl=60, retry_after=1),
+        )
+
+    async def consume(self, executor: StreamExecutor, count: int) -> None:
+        """Consume jobs until the engine ran a number of them."""
+        self.expected = count
+        executor.start()
+        try:
+            await asyncio.wait_for(self.done.wait(), timeout=5)
+        finally:
+            await executor.stop()
+
+
+class TestStreamExecutor(StreamTestCase):
+    """Tests for queueing executions on the streams."""
+
+    @pytest.mark.asyncio
+    async def test_weights(self) -> None:
+        """Priority classes are taken in proportion to their weights."""
+        executor = self.create_executor(interactive_weight=2, batch_weight=1)
+        for i in range(3):
+            await executor.submit(
+                execution_id=i, user_id=self.user.id, priority=ExecutionPriority.BATCH
+            )
+        for i in range(3, 6):
+            await executor.submit(execution_id=i, user_id=self.user.id)
+
+        await self.consume(executor=executor, count=6)
+
+        if self.ran != [[3], [0], [4], [5], [1], [2]]:
+            pytest.fail(f"Expected a 2:1 share of turns, got {self.ran}")
+
+    @pytest.mark.asyncio
+    async def test_reserve_full(self) -> None:
+        """The queue size counts the jobs waiting on every stream."""
+        executor = self.create_executor(queue_size=2)
+        await executor.reserve(user_id=self.user.id)
+        await executor.submit(execution_id=1, user_id=self.user.id)
+        await executor.submit_batch(execution_ids=[2, 3], user_id=self.user.id)
+
+        with pytest.raises(ExecutionQueueFullError):
+            await executor.reserve(user_id=self.user.id)
+
+    @pytest.mark.asyncio
+    async def test_user_limit(self) -> None:
+        """Batches take a slot per execution run at once until acknowledged."""
+        executor = self.create_executor(user_limit=2)
+        await executor.reserve(user_id=self.user.id, slots=2)
+        with pytest.raises(ExecutionRateLimitError):
+            await executor.reserve(user_id=self.user.id)
+
+        await executor.submit_batch(execution_ids=[1, 2], user_id=self.user.id, slots=2)
+        await self.consume(executor=executor, count=1)
+
+        await executor.reserve(user_id=self.user.id, slots=2)
+
+
+class TestStreamRecovery(StreamTestCase):
+    """Tests for sharing and recovering the jobs of the consumer group."""
+
+    async def abandon(self, executor: StreamExecutor, execution_id: int) -> str:
+        """Queue a job and deliver it to a consumer that never acknowledges it."""
+        key = executor._keys[ExecutionPriority.INTERACTIVE]  # noqa: SLF001
+        await executor._create_groups()  # noqa: SLF001
+        await executor.submit(execution_id=execution_id, user_id=self.user.id)
+        await redis_client.xreadgroup(
+            executor._group,  # noqa: SLF001
+            "dead-consumer",
+            {key: ">"},
+            count=1,
+        )
+
+        return key
+
+    @pytest.mark.asyncio
+    async def test_consumer_group(self) -> None:
+        """Consumers of the group each take different jobs and acknowledge them."""
+        executors = [self.create_executor(), self.create_executor()]
+        executors[1]._consumer = "other-consumer"  # noqa: SLF001
+        for i in range(4):
+            await executors[0].submit(execution_id=i, user_id=self.user.id)
+
+        self.expected = 4
+        for executor in executors:
+            executor.start()
+        try:
+            await asyncio.wait_for(self.done.wait(), timeout=5)
+        finally:
+            for executor in executors:
+                await executor.stop()
+
+        if sorted(execution_id for ids in self.ran for execution_id in ids) != [
+            0,
+            1,
+            2,
+            3,
+        ]:
+            pytest.fail(f"Expected every job to run once, got {self.ran}")
+        key = executors[0]._keys[ExecutionPriority.INTERACTIVE]  # noqa: SLF001
+        if await redis_client.xlen(key):
+            pytest.fail("Expected acknowledged jobs to leave the stream")
+
+    @pytest.mark.asyncio
+    async def test_reclaim(self) -> None:
+        """A job idle past its lease is resumed by another consumer."""
+        executor = self.create_executor(queue_lease=1)
+        key = await self.abandon(executor=executor, execution_id=1)
+        await asyncio.sleep(1.1)
+
+        await self.consume(executor=executor, count=1)
+
+        if self.ran != [[1]] or self.resumed != [True]:
+            pytest.fail(f"Expected the job resumed, got {self.ran} {self.resumed}")
+        if await redis_client.xlen(key):
+            pytest.fail("Expected the resumed job to be acknowledged")
+
+    @pytest.mark.asyncio
+    async def test_dead_letter(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A job delivered too many times fails its executions instead."""
+        execution = await self.create_execution()
+        await self.session.commit()
+        executor = self.create_executor(queue_lease=1, queue_max_deliveries=1)
+        key = await self.abandon(executor=executor, execution_id=execution.id)
+        await asyncio.sleep(1.1)
+        release = executor._release_slots  # noqa: SLF001
+
+        # Slots are released once the job is acknowledged.
+        async def release_slots(tokens: list[str], user_id: int) -> None:
+            await release(tokens=tokens, user_id=user_id)
+            self.done.set()
+
+        monkeypatch.setattr(executor, "_release_slots", release_slots)
+        executor.start()
+        try:
+            await asyncio.wait_for(self.done.wait(), timeout=5)
+        finally:
+            await executor.stop()
+
+        execution = await self.reload(execution=execution)
+        if self.ran or execution.status != ExecutionStatus.FAILED:
+            pytest.fail(f"Expected the execution failed unrun, got {execution.status}")
+        if await redis_client.xlen(key):
+            pytest.fail("Expected the failed job to leave the stream")
@@ -0,0 +1,423 @@
+"""Tests for the execution engine scheduler."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+from sqlalchemy import select
+
+from engine import runner
+from engine.nodes import NODE_HANDLERS, NodeContext
+from engine.plan import ExecutionPlan, compile_plan
+from engine.runner import ExecutionEngine
+from enums import ExecutionStatus, NodeType
+from exceptions import NodeExecutionError
+from models import Edge, ExecutionNodeRun, Node
+from settings import engine_settings
+from tests.test_engine.base import EngineTestCase
+from utils.ollama import ollama_clients
+
+
+class MemoryOutputStore:
+    """In-memory stand-in for the Redis node output store."""
+
+    def __init__(self) -> None:
+        """Initialize the store."""
+        self.outputs: dict[str, Any] = {}
+
+    async def get(self, key: str) -> tuple[bool, Any]:
+        """Look up a memoized output."""
+        return key in self.outputs, self.outputs.get(key)
+
+    async def set(self, key: str, value: Any) -> None:  # noqa: ANN401
+        """Memoize an output."""
+        self.outputs[key] = value
+
+
+class MemoryCheckpoints:
+    """In-memory stand-in for the Redis execution checkpoints."""
+
+    def __init__(self, completed: dict[int, Any]) -> None:
+        """Initialize the checkpoints with the outputs of completed nodes."""
+        self.completed = completed
+
+    async def save(
+        self,
+        execution_id: int,  # noqa: ARG002
+        version: int,  # noqa: ARG002
+        node_id: int,
+        output: Any,  # noqa: ANN401
+    ) -> None:
+        """Checkpoint a node output."""
+        self.completed[node_id] = output
+
+    async def load(self, execution_id: int, version: int) -> dict[int, Any]:  # noqa: ARG002
+        """Load the checkpointed node outputs."""
+        return dict(self.completed)
+
+    async def clear(self, execution_id: int, version: int) -> None:  # noqa: ARG002
+        """Drop the checkpoints."""
+        self.completed.clear()
+
+
+def build_plan(
+    types: dict[int, NodeType],
+    pairs: list[tuple[int, int]],
+    data: dict[int, dict[str, Any]] | None = None,
+    version: int = 1,
+) -> ExecutionPlan:
+    """Compile a plan from node types and `(source, target)` node ID pairs."""
+    data = data or {}
+    nodes = [
+        Node(id=node_id, workflow_id=1, type=node_type, data=data.get(node_id, {}))
+        for node_id, node_type in types.items()
+    ]
+    edges = [
+        Edge(id=i + 1, workflow_id=1, source_node_id=source, target_node_id=target)
+        for i, (source, target) in enumerate(pairs)
+    ]
+
+    return compile_plan(workflow_id=1, version=version, nodes=nodes, edges=edges)
+
+
+def llm_plan(temperature: float) -> ExecutionPlan:
+    """Compile an INPUT -> LLM -> OUTPUT plan sampling at `temperature`."""
+    return build_plan(
+        types={1: NodeType.INPUT, 2: NodeType.LLM, 3: NodeType.OUTPUT},
+        pairs=[(1, 2), (2, 3)],
+        data={2: {"prompt": "{input}", "temperature": temperature}},
+    )
+
+
+def chain_plan(version: int, prompt: str) -> ExecutionPlan:
+    """Compile an INPUT -> LLM -> LLM -> OUTPUT plan sampling at the default."""
+    return build_plan(
+        types={1: NodeType.INPUT, 2: NodeType.LLM, 3: NodeType.LLM, 4: NodeType.OUTPUT},
+        pairs=[(1, 2), (2, 3), (3, 4)],
+        data={2: {"prompt": "{input}"}, 3: {"prompt": prompt}},
+        version=version,
+    )
+
+
+def context(input_data: Any = None, owner_id: int | None = None) -> NodeContext:  # noqa: ANN401
+    """Return a node context belonging to no execution."""
+    return NodeContext(input_data=input_data, clients=ollama_clients, owner_id=owner_id)
+
+
+class TestMemoization:
+    """Tests for memoized node outputs."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Count LLM calls and memoize outputs in memory."""
+        self.calls = 0
+
+        async def run_llm(_node: Node, inputs: list[Any], _context: NodeContext) -> Any:  # noqa: ANN401
+            self.calls += 1
+            return f"{inputs[0]}-{self.calls}"
+
+        monkeypatch.setitem(NODE_HANDLERS, NodeType.LLM, run_llm)
+        monkeypatch.setattr(runner, "node_output_store", MemoryOutputStore())
+
+    async def run_twice(self, plan: ExecutionPlan) -> list[dict[str, Any]]:
+        """Run a plan twice with the same input."""
+        engine = ExecutionEngine()
+
+        return [
+            await engine.run_graph(plan=plan, context=context(input_data="hi"))
+            for _ in range(2)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_greedy_reused(self) -> None:
+        """A temperature 0 LLM node is answered from the memo on rerun."""
+        first, second = await self.run_twice(plan=llm_plan(temperature=0))
+
+        if self.calls != 1:
+            pytest.fail(f"Expected 1 LLM call, got {self.calls}")
+        if first != second:
+            pytest.fail(f"Expected the memoized output, got {second}")
+
+    @pytest.mark.asyncio
+    async def test_sampled_rerun(self) -> None:
+        """A temperature > 0 LLM node samples a new completion on every run."""
+        first, second = await self.run_twice(plan=llm_plan(temperature=0.7))
+
+        if self.calls != 2:  # noqa: PLR2004
+            pytest.fail(f"Expected 2 LLM calls, got {self.calls}")
+        if first == second:
+            pytest.fail("Expected a fresh completion on rerun")
+
+    @pytest.mark.asyncio
+    async def test_owner_iteration(self) -> None:
+        """Editing a node reuses the owner's samples of the nodes upstream."""
+        engine = ExecutionEngine()
+        runs = [
+            (chain_plan(version=1, prompt="{input}"), 1),
+            (chain_plan(version=2, prompt="again {input}"), 1),
+            (chain_plan(version=2, prompt="again {input}"), 1),
+            (chain_plan(version=3, prompt="{input}"), 2),
+        ]
+
+        calls = []
+        for plan, owner_id in runs:
+            await engine.run_graph(plan=plan, context=context("hi", owner_id=owner_id))
+            calls.append(self.calls)
+
+        # The edit reuses node 2, a rerun and another owner sample both nodes.
+        if calls != [2, 3, 5, 7]:
+            pytest.fail(f"Unexpected LLM calls after each run {calls}")
+
+    @pytest.mark.asyncio
+    async def test_joinable_until_stored(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A shared run is joinable until its output is memoized."""
+        engine = ExecutionEngine()
+        store = MemoryOutputStore()
+        joinable = []
+
+        async def store_output(key: str, value: Any) -> None:  # noqa: ANN401
+            joinable.append(key in engine._shared_runs)  # noqa: SLF001
+            store.outputs[key] = value
+
+        monkeypatch.setattr(store, "set", store_output)
+        monkeypatch.setattr(runner, "node_output_store", store)
+        await engine.run_graph(plan=llm_plan(temperature=0), context=context("hi"))
+
+        if joinable != [True]:
+            pytest.fail(f"Expected the run joinable while stored, got {joinable}")
+        if engine._shared_runs:  # noqa: SLF001
+            pytest.fail("Expected the shared run to be dropped once finished")
+
+
+class TestRunGraph:
+    """Tests for the scheduling of nodes within one run."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Replace the LLM handler with a stub recording its calls."""
+        self.calls: list[int] = []
+        self.running = 0
+        self.peak = 0
+        self.failing: set[int] = set()
+        self.cancelled: set[int] = set()
+        self.delays: dict[int, float] = {}
+
+        async def run_llm(node: Node, inputs: list[Any], _context: NodeContext) -> Any:  # noqa: ANN401
+            self.calls.append(node.id)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            try:
+                await asyncio.sleep(self.delays.get(node.id, 0.01))
+            except asyncio.CancelledError:
+                self.cancelled.add(node.id)
+                raise
+            finally:
+                self.running -= 1
+            if node.id in self.failing:
+                raise NodeExecutionError(message=f"Node {node.id} failed")
+
+            return [node.id, *inputs]
+
+        monkeypatch.setitem(NODE_HANDLERS, NodeType.LLM, run_llm)
+
+    @pytest.mark.asyncio
+    async def test_parallel(self) -> None:
+        """Nodes ready at the same time run concurrently."""
+        plan = build_plan(
+            types={
+                1: NodeType.INPUT,
+                2: NodeType.LLM,
+                3: NodeType.LLM,
+                4: NodeType.OUTPUT,
+            },
+            pairs=[(1, 2), (1, 3), (2, 4), (3, 4)],
+        )
+
+        outputs = await ExecutionEngine().run_graph(plan=plan, context=context("x"))
+
+        if self.peak != 2:  # noqa: PLR2004
+            pytest.fail(f"Expected both branches to run at once, got {self.peak}")
+        if outputs != {"4": [[2, "x"], [3, "x"]]}:
+            pytest.fail(f"Unexpected outputs {outputs}")
+
+    @pytest.mark.asyncio
+    async def test_failure(self) -> None:
+        """A failing node fails the run, cancels running nodes and skips the rest."""
+        self.failing.add(2)
+        self.delays[3] = 10
+        plan = build_plan(
+            types={
+                1: NodeType.INPUT,
+                2: NodeType.LLM,
+                3: NodeType.LLM,
+                4: NodeType.LLM,
+                5: NodeType.OUTPUT,
+            },
+            pairs=[(1, 2), (1, 3), (2, 4), (3, 5), (4, 5)],
+        )
+
+        with pytest.raises(NodeExecutionError):
+            await ExecutionEngine().run_graph(plan=plan, context=context("x"))
+
+        if 3 not in self.cancelled:  # noqa: PLR2004
+            pytest.fail("Expected the running sibling to be cancelled")
+        if 4 in self.calls:  # noqa: PLR2004
+            pytest.fail("Expected the downstream node not to run")
+
+    @pytest.mark.asyncio
+    async def test_rank_order(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """With one slot, the node on the longest path to the output runs first."""
+        monkeypatch.setattr(engine_settings, "node_concurrency", 1)
+        plan = build_plan(
+            types={
+                1: NodeType.INPUT,
+                2: NodeType.LLM,
+                3: NodeType.LLM,
+                4: NodeType.LLM,
+                5: NodeType.LLM,
+                6: NodeType.OUTPUT,
+            },
+            pairs=[(1, 5), (1, 2), (2, 3), (3, 4), (4, 6), (5, 6)],
+        )
+
+        await ExecutionEngine().run_graph(plan=plan, context=context("x"))
+
+        if self.calls[:2] != [2, 3]:
+            pytest.fail(f"Expected the long chain first, got {self.calls}")
+
+    @pytest.mark.asyncio
+    async def test_resume(self) -> None:
+        """Completed nodes are not run again and feed their outputs downstream."""
+        plan = build_plan(
+            types={
+                1: NodeType.INPUT,
+                2: NodeType.LLM,
+                3: NodeType.LLM,
+                4: NodeType.OUTPUT,
+            },
+            pairs=[(1, 2), (2, 3), (3, 4)],
+        )
+
+        outputs = await ExecutionEngine().run_graph(
+            plan=plan, context=context("x"), completed={1: "x", 2: "done"}
+        )
+
+        if self.calls != [3]:
+            pytest.fail(f"Expected only the pending node to run, got {self.calls}")
+        if outputs != {"4": [3, "done"]}:
+            pytest.fail(f"Unexpected outputs {outputs}")
+
+
+class TestRunExecution(EngineTestCase):
+    """Tests for the lifecycle of executions run by the engine."""
+
+    @pytest.mark.asyncio
+    async def test_success(self) -> None:
+        """A run moves the execution to SUCCESS with its output and node runs."""
+        execution = await self.create_execution()
+
+        await self.engine.run(execution_id=execution.id)
+
+        execution = await self.reload(execution=execution)
+        if execution.status != ExecutionStatus.SUCCESS:
+            pytest.fail(f"Expected SUCCESS, got {execution.status}")
+        if execution.output_data != {str(self.nodes[-1].id): "hi!!"}:
+            pytest.fail(f"Unexpected output {execution.output_data}")
+        node_runs = await self.session.scalars(
+            select(ExecutionNodeRun).where(
+                ExecutionNodeRun.execution_id == execution.id
+            )
+        )
+        if len(node_runs.all()) != len(self.nodes):
+            pytest.fail("Expected one node run per node")
+
+    @pytest.mark.asyncio
+    async def test_failed(self) -> None:
+        """A failing node moves the execution to FAILED with the node error."""
+        self.error = "model exploded"
+        execution = await self.create_execution()
+
+        await self.engine.run(execution_id=execution.id)
+
+        execution = await self.reload(execution=execution)
+        if execution.status != ExecutionStatus.FAILED:
+            pytest.fail(f"Expected FAILED, got {execution.status}")
+        if "model exploded" not in (execution.error or ""):
+            pytest.fail(f"Unexpected error {execution.error}")
+        if self.calls != [self.nodes[1].id]:
+            pytest.fail(f"Expected no node after the failure, got {self.calls}")
+
+    @pytest.mark.asyncio
+    async def test_cancel(self) -> None:
+        """Cancelling a running execution stops it as CANCELLED."""
+        self.block = True
+        execution = await self.create_execution()
+
+        task = asyncio.create_task(self.engine.run(execution_id=execution.id))
+        await asyncio.wait_for(self.started.wait(), timeout=5)
+        if not self.engine.cancel(execution_id=execution.id):
+            pytest.fail("Expected the execution to be running here")
+        await asyncio.wait_for(task, timeout=5)
+
+        execution = await self.reload(execution=execution)
+        if execution.status != ExecutionStatus.CANCELLED:
+            pytest.fail(f"Expected CANCELLED, got {execution.status}")
+
+    @pytest.mark.asyncio
+    async def test_timeout_after_queueing(self) -> None:
+        """The timeout counts from the start of the run, not from queueing."""
+        queued_at = datetime.now(tz=UTC).replace(tzinfo=None) - timedelta(hours=1)
+        execution = await self.create_execution(
+            started_at=queued_at, timeout_seconds=60
+        )
+
+        await self.engine.run(execution_id=execution.id)
+
+        execution = await self.reload(execution=execution)
+        if execution.status != ExecutionStatus.SUCCESS:
+            pytest.fail(f"Expected SUCCESS, got {execution.status}: {execution.error}")
+        if execution.running_at is None or execution.running_at <= queued_at:
+            pytest.fail(f"Expected the run start stamped, got {execution.running_at}")
+
+    @pytest.mark.asyncio
+    async def test_timeout(self) -> None:
+        """An execution running past its timeout is CANCELLED."""
+        self.block = True
+        execution = await self.create_execution(timeout_seconds=1)
+
+        await asyncio.wait_for(self.engine.run(execution_id=execution.id), timeout=5)
+
+        execution = await self.reload(execution=execution)
+        if execution.status != ExecutionStatus.CANCELLED:
+            pytest.fail(f"Expected CANCELLED, got {execution.status}")
+
+    @pytest.mark.asyncio
+    async def test_resume(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A resumed execution skips the nodes checkpointed before."""
+        checkpoints = MemoryCheckpoints(
+            completed={self.nodes[0].id: "hi", self.nodes[1].id: "saved"}
+        )
+        monkeypatch.setattr(runner, "execution_checkpoints", checkpoints)
+        execution = await self.create_execution(status=ExecutionStatus.RUNNING)
+
+        await self.engine.run_batch(execution_ids=[execution.id], resume=True)
+
+        execution = await self.reload(execution=execution)
+        if self.calls != [self.nodes[2].id]:
+            pytest.fail(f"Expected only the pending node to run, got {self.calls}")
+        if execution.output_data != {str(self.nodes[-1].id): "saved!"}:
+            pytest.fail(f"Unexpected output {execution.output_data}")
+        if checkpoints.completed:
+            pytest.fail("Expected the checkpoints to be cleared")
+
+    @pytest.mark.asyncio
+    async def test_not_resumed(self) -> None:
+        """A RUNNING execution is left alone unless resuming."""
+        execution = await self.create_execution(status=ExecutionStatus.RUNNING)
+
+        await self.engine.run(execution_id=execution.id)
+
+        execution = await self.reload(execution=execution)
+        if self.calls or execution.status != ExecutionStatus.RUNNING:
+            pytest.fail("Expected the running execution not to be started again")
@@ -0,0 +1,167 @@
+"""Tests for the similarity cache of LLM completions."""
+
+import math
+import time
+from typing import Any
+
+import httpx
+import pytest
+
+from engine import semantic
+from engine.semantic import SemanticCache, SemanticScope
+
+SCOPE = SemanticScope(owner_id=1, key="model")
+
+
+def _matches(metadata: dict[str, Any], where: dict[str, Any]) -> bool:
+    """Return whether record metadata passes a Chroma `$and` filter."""
+    for condition in where["$and"]:
+        ((field, value),) = condition.items()
+        if isinstance(value, dict):
+            if metadata[field] < value["$gte"]:
+                return False
+        elif metadata[field] != value:
+            return False
+
+    return True
+
+
+class TestSemanticCache:
+    """Tests for answering prompts from similar ones."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Replace the Chroma requests with an in-memory collection."""
+        self.records: dict[str, tuple[list[float], dict[str, Any]]] = {}
+        self.collections = 0
+        self.error: Exception | None = None
+
+        async def get_or_create_collection(**_: object) -> str:
+            self.collections += 1
+            return "collection"
+
+        async def query(
+            embedding: list[float], where: dict[str, Any], **_: object
+        ) -> list[dict[str, Any]]:
+            if self.error:
+                raise self.error
+
+            return sorted(
+                (
+                    {
+                        "id": record_id,
+                        "distance": 1 - _cosine(embedding, record_embedding),
+                        "metadata": metadata,
+                    }
+                    for record_id, (record_embedding, metadata) in self.records.items()
+                    if _matches(metadata=metadata, where=where)
+                ),
+                key=lambda neighbour: neighbour["distance"],
+            )[:1]
+
+        async def upsert(
+            ids: list[str],
+            embeddings: list[list[float]],
+            metadatas: list[dict[str, Any]],
+            **_: object,
+        ) -> None:
+            if self.error:
+                raise self.error
+
+            self.records.update(
+                zip(ids, zip(embeddings, metadatas, strict=True), strict=True)
+            )
+
+        monkeypatch.setattr(
+            semantic, "get_or_create_collection", get_or_create_collection
+        )
+        monkeypatch.setattr(semantic, "query", query)
+        monkeypatch.setattr(semantic, "upsert", upsert)
+        self.cache = SemanticCache(collection="completions", ttl=60)
+        self.client = httpx.AsyncClient()
+
+    async def store(self, scope: SemanticScope = SCOPE) -> None:
+        """Cache the completion of a prompt embedded as `[1, 0]`."""
+        await self.cache.set(
+            client=self.client,
+            scope=scope,
+            embedding=[1.0, 0.0],
+            prompt="hi",
+            response="hello",
+        )
+
+    async def lookup(
+        self,
+        scope: SemanticScope = SCOPE,
+        embedding: tuple[float, float] = (1.0, 0.0),
+        threshold: float = 0.9,
+    ) -> str | None:
+        """Look up the completion of a prompt."""
+        return await self.cache.get(
+            client=self.client,
+            scope=scope,
+            embedding=list(embedding),
+            threshold=threshold,
+        )
+
+    @pytest.mark.asyncio
+    async def test_scopes(self) -> None:
+        """Completions are only shared within one owner and model scope."""
+        await self.store()
+
+        if await self.lookup() != "hello":
+            pytest.fail("Expected a hit within the scope")
+        if await self.lookup(scope=SemanticScope(owner_id=2, key="model")):
+            pytest.fail("Expected another owner to miss")
+        if await self.lookup(scope=SemanticScope(owner_id=1, key="other")):
+            pytest.fail("Expected another model to miss")
+
+    @pytest.mark.asyncio
+    async def test_threshold(self) -> None:
+        """Prompts less similar than the threshold miss."""
+        await self.store()
+
+        if await self.lookup(embedding=(1.0, 1.0), threshold=0.9):
+            pytest.fail("Expected a prompt below the threshold to miss")
+        if await self.lookup(embedding=(1.0, 1.0), threshold=0.7) != "hello":
+            pytest.fail("Expected a prompt above the threshold to hit")
+
+    @pytest.mark.asyncio
+    async def test_ttl(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Records older than the TTL are not returned."""
+        await self.store()
+        later = time.time() + 61
+
+        monkeypatch.setattr(semantic.time, "time", lambda: later)
+
+        if await self.lookup():
+            pytest.fail("Expected the expired record to miss")
+
+    @pytest.mark.asyncio
+    async def test_chroma_error(self) -> None:
+        """Chroma errors are misses, and a missing collection is created again."""
+        request = httpx.Request("POST", "http://chroma")
+        self.error = httpx.HTTPStatusError(
+            "gone", request=request, response=httpx.Response(404, request=request)
+        )
+
+        await self.store()
+        if await self.lookup() is not None:
+            pytest.fail("Expected a Chroma error to be a miss")
+        if self.collections != 2:  # noqa: PLR2004
+            pytest.fail(
+                f"Expected the collection looked up again, got {self.collections}"
+            )
+
+        self.error = httpx.ConnectError("down")
+        for _ in range(2):
+            if await self.lookup() is not None:
+                pytest.fail("Expected an unreachable Chroma to be a miss")
+        if self.collections != 3:  # noqa: PLR2004
+            pytest.fail("Expected the collection ID kept when Chroma is unreachable")
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    """Return the cosine similarity of two vectors."""
+    dot = sum(x * y for x, y in zip(a, b, strict=True))
+    return dot / (math.hypot(*a) * math.hypot(*b))
@@ -0,0 +1,101 @@
+"""Tests for resuming executions abandoned by dead workers."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+
+from engine import supervisor
+from engine.lease import ExecutionLeases
+from engine.supervisor import ExecutionSupervisor
+from enums import ExecutionStatus
+from models import Execution
+from tests.test_engine.base import EngineTestCase
+from utils.redis import redis_client
+
+
+class TestExecutionSupervisor(EngineTestCase):
+    """Tests for sweeping executions no live process holds a lease on."""
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup_supervisor(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Record the executions the engine is asked to run."""
+        self.ran: list[tuple[list[int], bool]] = []
+        self.leases = ExecutionLeases(client=redis_client, ttl=60)
+
+        async def run_batch(execution_ids: list[int], *, resume: bool) -> None:
+            self.ran.append((execution_ids, resume))
+
+        monkeypatch.setattr(self.engine, "run_batch", run_batch)
+
+    async def create_executions(
+        self, status: ExecutionStatus, count: int, age: timedelta
+    ) -> list[Execution]:
+        """Create executions started one second apart, the oldest `age` ago."""
+        started_at = datetime.now(tz=UTC).replace(tzinfo=None) - age
+        executions = [
+            await self.create_execution(
+                status=status, started_at=started_at + timedelta(seconds=i)
+            )
+            for i in range(count)
+        ]
+        await self.session.commit()
+
+        return executions
+
+    async def sweep(self, limit: int) -> None:
+        """Sweep once and wait for the executions it started."""
+        watcher = ExecutionSupervisor(
+            engine=self.engine,
+            leases=self.leases,
+            interval=1,
+            limit=limit,
+            session_factory=self.session_factory,
+        )
+        await watcher._sweep()  # noqa: SLF001
+        await asyncio.gather(*watcher._jobs)  # noqa: SLF001
+
+    @pytest.mark.asyncio
+    async def test_claim(self) -> None:
+        """Only unleased RUNNING executions are resumed, under a new lease."""
+        leased, abandoned = await self.create_executions(
+            status=ExecutionStatus.RUNNING, count=2, age=timedelta(minutes=1)
+        )
+        await self.leases.renew(execution_ids=[leased.id])
+
+        await self.sweep(limit=2)
+
+        if self.ran != [([abandoned.id], True)]:
+            pytest.fail(f"Expected the abandoned execution resumed, got {self.ran}")
+        if await self.leases.claim(execution_id=abandoned.id):
+            pytest.fail("Expected the resumed execution to be leased")
+
+    @pytest.mark.asyncio
+    async def test_page_past_leased(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Leased executions do not hide abandoned ones on later pages."""
+        monkeypatch.setattr(supervisor, "SWEEP_PAGE_SIZE", 2)
+        *leased, abandoned = await self.create_executions(
+            status=ExecutionStatus.RUNNING, count=5, age=timedelta(minutes=1)
+        )
+        await self.leases.renew(execution_ids=[execution.id for execution in leased])
+
+        await self.sweep(limit=1)
+
+        if self.ran != [([abandoned.id], True)]:
+            pytest.fail(f"Expected the last execution resumed, got {self.ran}")
+
+    @pytest.mark.asyncio
+    async def test_created(self) -> None:
+        """CREATED executions are only run once unleased for a lease TTL."""
+        (lost,) = await self.create_executions(
+            status=ExecutionStatus.CREATED, count=1, age=timedelta(hours=1)
+        )
+        await self.create_executions(
+            status=ExecutionStatus.CREATED, count=1, age=timedelta(seconds=1)
+        )
+
+        await self.sweep(limit=2)
+
+        if self.ran != [([lost.id], False)]:
+            pytest.fail(f"Expected only the old execution started, got {self.ran}")
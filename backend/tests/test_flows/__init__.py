@@ -0,0 +1 @@
+"""Flow tests."""
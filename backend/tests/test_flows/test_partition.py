@@ -0,0 +1,243 @@
+"""Tests for the monthly partitions of execution tables."""
+
+import asyncio
+import logging
+import os
+from collections.abc import AsyncGenerator
+from datetime import UTC, date, datetime
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+import pytest_asyncio
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from flows import partition as flows
+from flows.partition import maintain_partitions
+from models import Execution, ExecutionNodeRun
+from repositories import PartitionRepository
+from repositories.partition import shift_months
+from settings import postgres_settings
+from tests.factories import ExecutionNodeRunFactory
+from tests.test_engine.base import EngineTestCase
+from utils.blob import BlobStore
+
+MONTH = date(year=2020, month=3, day=1)
+# The revision preceding the migrations partitioning execution tables.
+BEFORE_PARTITIONS = "e3c81a5f9d24"
+
+
+def _naive(*args: int) -> datetime:
+    """Build a naive UTC timestamp, as stored by the models."""
+    return datetime(*args, tzinfo=UTC).replace(tzinfo=None)
+
+
+class PartitionTestCase(EngineTestCase):
+    """Base test case with helpers reading where rows are stored."""
+
+    async def get_partition(self, model: Any, row_id: int) -> str | None:  # noqa: ANN401
+        """Return the partition holding a row, if it still exists.
+
+        A session of its own is used, as a transaction left open on the
+        table would block detaching partitions.
+        """
+        async with self.session_factory() as session:
+            return await session.scalar(
+                select(text("tableoid::regclass::text"))
+                .select_from(model)
+                .where(model.id == row_id)
+            )
+
+    async def create_old_run(self, **kwargs: Any) -> tuple[Execution, int]:  # noqa: ANN401
+        """Create an execution of MONTH and a node run queued the month after."""
+        started_at = _naive(2020, 3, 31, 23)
+        execution = await self.create_execution(started_at=started_at, **kwargs)
+        node_run = await ExecutionNodeRunFactory.create_async(
+            session=self.session,
+            execution_id=execution.id,
+            execution_started_at=started_at,
+            node_id=self.nodes[1].id,
+            queued_at=_naive(2020, 4, 1, 1),
+        )
+        await self.session.commit()
+
+        return execution, node_run.id
+
+
+class TestPartitionRepository(PartitionTestCase):
+    """Tests for creating and dropping monthly partitions."""
+
+    @pytest.mark.asyncio
+    async def test_create(self) -> None:
+        """A new partition takes over the rows of its month from the default."""
+        execution, node_run_id = await self.create_old_run()
+        if await self.get_partition(Execution, execution.id) != "executions_default":
+            pytest.fail("Expected the execution in the default partition")
+
+        for table, column in flows.PARTITIONED_TABLES.items():
+            repository = PartitionRepository(table=table, column=column)
+            async with self.session_factory() as session:
+                await repository.create(session=session, month=MONTH)
+                await repository.create(session=session, month=MONTH)
+                if await repository.get_all(session=session) != [MONTH]:
+                    pytest.fail(f"Expected one partition of {table}")
+
+        if await self.get_partition(Execution, execution.id) != "executions_p2020_03":
+            pytest.fail("Expected the execution moved to its month")
+        partition = await self.get_partition(ExecutionNodeRun, node_run_id)
+        if partition != "execution_node_runs_p2020_03":
+            pytest.fail(f"Expected the node run with its execution, got {partition}")
+
+    @pytest.mark.asyncio
+    async def test_drop(self) -> None:
+        """Dropping a month removes its partition and rows."""
+        execution, _ = await self.create_old_run()
+        repository = PartitionRepository(table="executions", column="started_at")
+        async with self.session_factory() as session:
+            await repository.create(session=session, month=MONTH)
+            await repository.drop(session=session, month=MONTH)
+            months = await repository.get_all(session=session)
+
+        if months:
+            pytest.fail(f"Expected no monthly partition left, got {months}")
+        if await self.get_partition(Execution, execution.id) is not None:
+            pytest.fail("Expected the execution dropped with its month")
+
+
+class TestMaintainPartitions(PartitionTestCase):
+    """Tests for the partition maintenance flow."""
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup_flow(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+        """Point the flow at the test database and a temporary blob store."""
+        self.blobs = BlobStore(
+            path=str(tmp_path), threshold=0, preview_size=8, compression_level=3
+        )
+        monkeypatch.setattr(flows, "async_session", self.session_factory)
+        monkeypatch.setattr(flows, "blob_store", self.blobs)
+        monkeypatch.setattr(flows, "get_run_logger", logging.getLogger)
+
+    async def offload(self, value: str, written_at: datetime) -> str:
+        """Store a blob last written at a point in time and return its key."""
+        _, offloaded = await self.blobs.offload(value=value)
+        if offloaded is None:
+            pytest.fail("Expected the value to be offloaded")
+        key = cast("str", offloaded)
+        timestamp = written_at.replace(tzinfo=UTC).timestamp()
+        os.utime(self.blobs._blob_path(key), (timestamp, timestamp))  # noqa: SLF001
+
+        return key
+
+    @pytest.mark.asyncio
+    async def test_retention(self) -> None:
+        """Expired months are dropped with their node runs and unused blobs."""
+        written_at = _naive(2020, 3, 31, 23, 30)
+        expired = await self.offload(value="expired", written_at=written_at)
+        reused = await self.offload(value="reused", written_at=written_at)
+        execution, node_run_id = await self.create_old_run(output_blob=expired)
+        await self.create_old_run(output_blob=reused)
+        await self.blobs.offload(value="reused")
+        for table, column in flows.PARTITIONED_TABLES.items():
+            async with self.session_factory() as session:
+                await PartitionRepository(table=table, column=column).create(
+                    session=session, month=MONTH
+                )
+
+        dropped = await maintain_partitions.fn()
+
+        if dropped != ["executions_p2020_03", "execution_node_runs_p2020_03"]:
+            pytest.fail(f"Unexpected dropped partitions {dropped}")
+        if await self.get_partition(Execution, execution.id) is not None:
+            pytest.fail("Expected the execution dropped")
+        if await self.get_partition(ExecutionNodeRun, node_run_id) is not None:
+            pytest.fail("Expected the node run dropped with its execution")
+        if self.blobs._blob_path(expired).exists():  # noqa: SLF001
+            pytest.fail("Expected the blob of the dropped execution deleted")
+        if not self.blobs._blob_path(reused).exists():  # noqa: SLF001
+            pytest.fail("Expected the blob written again after the month kept")
+
+        current = shift_months(month=datetime.now(UTC).date(), months=0)
+        async with self.session_factory() as session:
+            months = await PartitionRepository(
+                table="executions", column="started_at"
+            ).get_all(session=session)
+        if months != [shift_months(month=current, months=i) for i in range(3)]:
+            pytest.fail(f"Expected the coming months partitioned, got {months}")
+
+
+class TestPartitionMigration:
+    """Tests for the migrations partitioning execution tables."""
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup(
+        self, test_engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+    ) -> AsyncGenerator[None, None]:
+        """Point the migrations at an empty database next to the test one."""
+        url = test_engine.url
+        autocommit = test_engine.execution_options(isolation_level="AUTOCOMMIT")
+        async with autocommit.connect() as conn:
+            await conn.execute(text("DROP DATABASE IF EXISTS migrations"))
+            await conn.execute(text("CREATE DATABASE migrations"))
+
+        for field, value in (
+            ("host", url.host),
+            ("port", url.port),
+            ("user", url.username),
+            ("password", url.password or ""),
+            ("db", "migrations"),
+        ):
+            monkeypatch.setattr(postgres_settings, field, value)
+        self.engine = create_async_engine(url=make_url(postgres_settings.url))
+
+        self.config = Config()
+        self.config.set_main_option(
+            "script_location", str(Path(__file__).parents[2] / "migrations")
+        )
+
+        yield
+
+        await self.engine.dispose()
+        async with autocommit.connect() as conn:
+            await conn.execute(text("DROP DATABASE migrations"))
+
+    async def migrate(self, *, upgrade: bool, revision: str) -> None:
+        """Run the migrations in a thread, as they start their own event loop."""
+        migration = command.upgrade if upgrade else command.downgrade
+        await asyncio.to_thread(migration, self.config, revision)
+
+    async def get_partition_keys(self) -> dict[str, str]:
+        """Return the partition key of every partitioned table."""
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                text(
+                    "SELECT partrelid::regclass::text,"
+                    " pg_get_partkeydef(partrelid) FROM pg_partitioned_table"
+                )
+            )
+
+        return dict(result.tuples().all())
+
+    @pytest.mark.asyncio
+    async def test_upgrade_downgrade(self) -> None:
+        """The schema is partitioned at head, matches the models and unwinds."""
+        keys = {
+            "executions": "RANGE (started_at)",
+            "execution_node_runs": "RANGE (execution_started_at)",
+        }
+        await self.migrate(upgrade=True, revision="head")
+        if await self.get_partition_keys() != keys:
+            pytest.fail("Expected the execution tables partitioned")
+        await asyncio.to_thread(command.check, self.config)
+
+        await self.migrate(upgrade=False, revision=BEFORE_PARTITIONS)
+        if await self.get_partition_keys():
+            pytest.fail("Expected no partitioned table left")
+
+        await self.migrate(upgrade=True, revision="head")
+        partition_keys = await self.get_partition_keys()
+        if partition_keys != keys:
+            pytest.fail(f"Unexpected partition keys {partition_keys}")
@@ -0,0 +1,87 @@
+"""Tests for the pooled Ollama HTTP clients."""
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from settings import ollama_settings
+from utils.ollama import OllamaClients
+
+
+class TestOllamaClients:
+    """Tests for sharing HTTP clients per base URL and event loop."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self) -> None:
+        """Create an empty pool."""
+        self.clients = OllamaClients(settings=ollama_settings)
+
+    async def get_on(self, loop: asyncio.AbstractEventLoop) -> httpx.AsyncClient:
+        """Open a client on another running event loop."""
+
+        async def get() -> httpx.AsyncClient:
+            return self.clients.get(base_url="http://ollama")
+
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(get(), loop))
+
+    @pytest.mark.asyncio
+    async def test_reuse(self) -> None:
+        """Every request to one base URL shares a client."""
+        client = self.clients.get(base_url="http://ollama")
+
+        if self.clients.get(base_url="http://ollama/") is not client:
+            pytest.fail("Expected the same client for the same base URL")
+        if self.clients.get(base_url="http://other") is client:
+            pytest.fail("Expected another client for another base URL")
+
+    @pytest.mark.asyncio
+    async def test_aclose(self) -> None:
+        """Closing the pool closes its clients, and later calls reopen one."""
+        client = self.clients.get(base_url="http://ollama")
+
+        await self.clients.aclose()
+
+        if not client.is_closed:
+            pytest.fail("Expected the client to be closed")
+        reopened = self.clients.get(base_url="http://ollama")
+        if reopened is client or reopened.is_closed:
+            pytest.fail("Expected a new open client after closing")
+        await self.clients.aclose()
+
+    @pytest.mark.asyncio
+    async def test_other_loop(self) -> None:
+        """Clients of another loop are closed on that loop and replaced."""
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+            stale = await self.get_on(loop=loop)
+
+            client = self.clients.get(base_url="http://ollama")
+            # The close was scheduled on the other loop before this sleep.
+            await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(asyncio.sleep(0.1), loop)
+            )
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            await asyncio.to_thread(thread.join)
+            loop.close()
+
+        if client is stale or not stale.is_closed:
+            pytest.fail("Expected the client of the other loop closed and replaced")
+        await self.clients.aclose()
+
+    @pytest.mark.asyncio
+    async def test_closed_loop(self) -> None:
+        """Clients of a loop that is already closed are dropped."""
+
+        async def get() -> httpx.AsyncClient:
+            return self.clients.get(base_url="http://ollama")
+
+        stale = await asyncio.to_thread(asyncio.run, get())
+
+        if self.clients.get(base_url="http://ollama") is stale:
+            pytest.fail("Expected a new client for the running loop")
+        await self.clients.aclose()
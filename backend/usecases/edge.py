@@ -2,7 +2,10 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from engine.plan import invalidate_plan
+from engine.topology import load_topology, topology_cache
 from exceptions import (
+    EdgeCycleError,
     EdgeNodeMismatchError,
     EdgeNotFoundError,
     NodeNotFoundError,
@@ -45,6 +48,7 @@ class EdgeUsecase:
             WorkflowNotFoundError: If the workflow is not found.
             NodeNotFoundError: If the source or target node is not found.
             EdgeNodeMismatchError: If the nodes do not belong to the workflow.
+            EdgeCycleError: If the edge would create a cycle.
 
         """
         workflow = await self._workflow_repository.get_by(
@@ -70,14 +74,28 @@ class EdgeUsecase:
         if target_node.workflow_id != workflow_id:
             raise EdgeNodeMismatchError
 
-        return await self._edge_repository.create(
-            session=session,
-            data={
-                "workflow_id": workflow_id,
-                "source_node_id": source_node_id,
-                "target_node_id": target_node_id,
-            },
+        topology = await load_topology(
+            session=session, workflow_id=workflow_id, version=workflow.version
         )
+        topology.add_edge(source=source_node_id, target=target_node_id)
+        try:
+            edge = await self._edge_repository.create(
+                session=session,
+                data={
+                    "workflow_id": workflow_id,
+                    "source_node_id": source_node_id,
+                    "target_node_id": target_node_id,
+                },
+            )
+        except Exception:
+            topology.remove_edge(source=source_node_id, target=target_node_id)
+            raise
+
+        await self._commit_edge(
+            session=session, edge=edge, previous_version=workflow.version
+        )
+
+        return edge
 
     async def get_edges(
         self, session: AsyncSession, user_id: int, workflow_id: int
@@ -151,6 +169,9 @@ class EdgeUsecase:
         Raises:
             EdgeNotFoundError: If the edge is not found.
             WorkflowNotFoundError: If the workflow is not found.
+            NodeNotFoundError: If the source or target node is not found.
+            EdgeNodeMismatchError: If the nodes do not belong to the workflow.
+            EdgeCycleError: If the edge would create a cycle.
 
         """
         edge = await self.get_edge(session=session, edge_id=edge_id, user_id=user_id)
@@ -159,8 +180,10 @@ class EdgeUsecase:
         if not update_data:
             return edge
 
-        source_node_id = update_data.get("source_node_id", edge.source_node_id)
-        target_node_id = update_data.get("target_node_id", edge.target_node_id)
+        source = update_data.get("source_node_id")
+        source_node_id = source if isinstance(source, int) else edge.source_node_id
+        target = update_data.get("target_node_id")
+        target_node_id = target if isinstance(target, int) else edge.target_node_id
 
         source_node = await self._node_repository.get_by(
             session=session, id=source_node_id
@@ -179,15 +202,45 @@ class EdgeUsecase:
         if target_node.workflow_id != edge.workflow_id:
             raise EdgeNodeMismatchError
 
-        edge = await self._edge_repository.update_by(
-            session=session,
-            data=update_data,
-            id=edge_id,
+        version = await self._get_version(session=session, edge=edge)
+        topology = await load_topology(
+            session=session, workflow_id=edge.workflow_id, version=version
         )
-        if not edge:
+        previous = {
+            "source_node_id": edge.source_node_id,
+            "target_node_id": edge.target_node_id,
+        }
+        topology.remove_edge(source=edge.source_node_id, target=edge.target_node_id)
+        try:
+            topology.add_edge(source=source_node_id, target=target_node_id)
+        except EdgeCycleError:
+            topology.add_edge(
+                source=previous["source_node_id"], target=previous["target_node_id"]
+            )
+            raise
+
+        updated = None
+        try:
+            updated = await self._edge_repository.update_by(
+                session=session,
+                data=update_data,
+                id=edge_id,
+            )
+        finally:
+            if not updated:
+                topology.remove_edge(source=source_node_id, target=target_node_id)
+                topology.add_edge(
+                    source=previous["source_node_id"],
+                    target=previous["target_node_id"],
+                )
+        if not updated:
             raise EdgeNotFoundError
 
-        return edge
+        await self._commit_edge(
+            session=session, edge=updated, previous_version=version, undo=previous
+        )
+
+        return updated
 
     async def delete_edge(
         self, session: AsyncSession, edge_id: int, user_id: int
@@ -204,8 +257,77 @@ class EdgeUsecase:
             WorkflowNotFoundError: If the workflow is not found.
 
         """
-        await self.get_edge(session=session, edge_id=edge_id, user_id=user_id)
+        edge = await self.get_edge(session=session, edge_id=edge_id, user_id=user_id)
+        version = await self._get_version(session=session, edge=edge)
 
         deleted = await self._edge_repository.delete_by(session=session, id=edge_id)
         if not deleted:
             raise EdgeNotFoundError
+
+        topology = topology_cache.get(workflow_id=edge.workflow_id, version=version)
+        if topology:
+            topology.remove_edge(source=edge.source_node_id, target=edge.target_node_id)
+        await invalidate_plan(session=session, workflow_id=edge.workflow_id)
+
+    async def _get_version(self, session: AsyncSession, edge: Edge) -> int:
+        """Return the graph version of the workflow of an edge.
+
+        Args:
+            session: The session.
+            edge: The edge.
+
+        Returns:
+            The workflow graph version.
+
+        Raises:
+            WorkflowNotFoundError: If the workflow is not found.
+
+        """
+        workflow = await self._workflow_repository.get_by(
+            session=session, id=edge.workflow_id
+        )
+        if not workflow:
+            raise WorkflowNotFoundError
+
+        return workflow.version
+
+    async def _commit_edge(
+        self,
+        session: AsyncSession,
+        edge: Edge,
+        previous_version: int,
+        undo: dict[str, int] | None = None,
+    ) -> None:
+        """Publish a stored edge, undoing it if it closed a concurrent cycle.
+
+        The local order only covers changes made through this process. When
+        the graph version moved by more than one, another process changed the
+        graph meanwhile and the whole graph is checked again.
+
+        Args:
+            session: The session.
+            edge: The created or updated edge.
+            previous_version: The graph version the edge was checked against.
+            undo: The previous nodes of an updated edge; new edges are deleted.
+
+        Raises:
+            EdgeCycleError: If the edge closed a cycle with concurrent changes.
+
+        """
+        version = await invalidate_plan(session=session, workflow_id=edge.workflow_id)
+        if version == previous_version + 1:
+            return
+
+        try:
+            await load_topology(
+                session=session, workflow_id=edge.workflow_id, version=version
+            )
+        except EdgeCycleError:
+            if undo is None:
+                await self._edge_repository.delete_by(session=session, id=edge.id)
+            else:
+                await self._edge_repository.update_by(
+                    session=session, data=undo, id=edge.id
+                )
+            await invalidate_plan(session=session, workflow_id=edge.workflow_id)
+            raise
@@ -1,10 +1,41 @@
 """Execution use case implementation."""
 
+from collections.abc import AsyncIterator
+from typing import Any
+
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
-from exceptions import ExecutionNotFoundError, WorkflowNotFoundError
-from models import Execution
-from repositories import ExecutionRepository, WorkflowRepository
+from engine import execution_executor, execution_stream, prefect_executor
+from engine.cancel import execution_cancellations
+from engine.events import execution_events
+from engine.flight import execution_flights
+from engine.nodes import reuses_completion
+from engine.plan import load_plan
+from enums import (
+    ExecutionEventType,
+    ExecutionMode,
+    ExecutionPriority,
+    ExecutionStatus,
+    NodeType,
+)
+from exceptions import (
+    ExecutionGraphError,
+    ExecutionNotFoundError,
+    ExecutionQueueFullError,
+    ExecutionRateLimitError,
+    WorkflowNotFoundError,
+)
+from models import Execution, ExecutionNodeRun, Workflow
+from repositories import (
+    ExecutionNodeRunRepository,
+    ExecutionRepository,
+    WorkflowRepository,
+)
+from settings import engine_settings, executor_settings
+from utils.blob import blob_store
+from utils.hashing import digest
 
 
 class ExecutionUsecase:
@@ -13,7 +44,13 @@ class ExecutionUsecase:
     def __init__(self) -> None:
         """Initialize the usecase."""
         self._execution_repository = ExecutionRepository()
+        self._execution_node_run_repository = ExecutionNodeRunRepository()
         self._workflow_repository = WorkflowRepository()
+        self._executor = {
+            ExecutionMode.LOCAL: execution_executor,
+            ExecutionMode.PREFECT: prefect_executor,
+            ExecutionMode.QUEUE: execution_stream,
+        }[executor_settings.mode]
 
     async def create_execution(
         self,
@@ -21,20 +58,143 @@ class ExecutionUsecase:
         user_id: int,
         workflow_id: int,
         input_data: dict | None = None,
+        **kwargs: object,
     ) -> Execution:
-        """Create an execution for a workflow.
+        """Create an execution for a workflow and queue it for running.
+
+        The execution is returned in the CREATED state; the engine moves it
+        through RUNNING to SUCCESS or FAILED in the background, either in
+        this process or on the Prefect work pool. A queue slot is reserved
+        before the row is inserted so rejected requests leave nothing behind.
+        When deduplication is enabled and the workflow is reproducible, an
+        execution identical to one still running, with the same workflow
+        version, input and timeout, gives its slot back and is finished with
+        the outcome of the running one instead.
 
         Args:
             session: The session.
             user_id: The owner user ID.
             workflow_id: The workflow ID.
             input_data: The execution input data.
+            **kwargs: The other execution creation fields, such as the
+                timeout and the priority class.
 
         Returns:
             The created execution.
 
         Raises:
             WorkflowNotFoundError: If the workflow is not found.
+            ExecutionRateLimitError: If the user has too many executions.
+            ExecutionQueueFullError: If the execution queue is full.
+
+        """
+        workflow = await self._workflow_repository.get_by(
+            session=session, id=workflow_id, owner_id=user_id
+        )
+        if not workflow:
+            raise WorkflowNotFoundError
+
+        dedupe = engine_settings.dedupe and await self._is_reproducible(
+            session=session, workflow=workflow
+        )
+        await self._executor.reserve(user_id=user_id)
+        try:
+            stored_input, input_blob = await blob_store.offload(value=input_data)
+            execution = await self._execution_repository.create(
+                session=session,
+                data={
+                    **kwargs,
+                    "workflow_id": workflow_id,
+                    "input_data": stored_input,
+                    "input_blob": input_blob,
+                },
+            )
+        except Exception:
+            await self._executor.release(user_id=user_id)
+            raise
+
+        leader_id = None
+        if dedupe:
+            leader_id = await execution_flights.join(
+                key=digest(
+                    workflow_id, workflow.version, execution.timeout_seconds, input_data
+                ),
+                execution_id=execution.id,
+            )
+        # The leader may have finished since its flight was found.
+        if leader_id is not None and not await self._execution_repository.follow(
+            session=session, execution_id=execution.id, leader_id=leader_id
+        ):
+            leader_id = None
+        if leader_id is None:
+            await self._executor.submit(
+                execution_id=execution.id,
+                user_id=user_id,
+                priority=execution.priority,
+            )
+        else:
+            await self._executor.release(user_id=user_id)
+        set_committed_value(execution, "input_data", input_data)
+        set_committed_value(execution, "leader_id", leader_id)
+
+        return execution
+
+    async def _is_reproducible(self, session: AsyncSession, workflow: Workflow) -> bool:
+        """Return whether identical executions of a workflow may share a run.
+
+        Every LLM node must reuse completions, so a shared run answers as a
+        run of its own would. MAP nodes disqualify the workflow, as the
+        workflows they run are not inspected.
+
+        Args:
+            session: The session.
+            workflow: The workflow.
+
+        Returns:
+            True if executions with the same input may follow each other.
+
+        """
+        try:
+            plan = await load_plan(session=session, workflow=workflow)
+        except ExecutionGraphError:
+            return False
+
+        return all(
+            node.type != NodeType.MAP
+            and (node.type != NodeType.LLM or reuses_completion(node=node))
+            for node in plan.nodes
+        )
+
+    async def create_execution_batch(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        workflow_id: int,
+        inputs: list[dict | None],
+        **kwargs: object,
+    ) -> list[int]:
+        """Create executions of a workflow for many inputs and queue them together.
+
+        Ownership is checked and queue slots reserved once for the whole
+        batch, one per execution it runs at once, up to the user limit; the
+        rows are inserted in one statement and the batch runs against a
+        single compiled plan.
+
+        Args:
+            session: The session.
+            user_id: The owner user ID.
+            workflow_id: The workflow ID.
+            inputs: The input data of every execution.
+            **kwargs: The other fields shared by the executions, such as the
+                timeout and the priority class, which defaults to batch.
+
+        Returns:
+            The created execution IDs, in the order of the inputs.
+
+        Raises:
+            WorkflowNotFoundError: If the workflow is not found.
+            ExecutionRateLimitError: If the user has too many executions.
+            ExecutionQueueFullError: If the execution queue is full.
 
         """
         workflow = await self._workflow_repository.get_by(
@@ -43,12 +203,95 @@ class ExecutionUsecase:
         if not workflow:
             raise WorkflowNotFoundError
 
-        return await self._execution_repository.create(
+        data = {"priority": ExecutionPriority.BATCH, **kwargs}
+        slots = min(
+            len(inputs), engine_settings.batch_concurrency, executor_settings.user_limit
+        )
+        await self._executor.reserve(user_id=user_id, slots=slots)
+        try:
+            offloaded = [await blob_store.offload(value=value) for value in inputs]
+            execution_ids = await self._execution_repository.create_batch(
+                session=session,
+                inputs=[value for value, _ in offloaded],
+                input_blobs=[blob for _, blob in offloaded],
+                data={**data, "workflow_id": workflow_id},
+            )
+        except Exception:
+            await self._executor.release(user_id=user_id, slots=slots)
+            raise
+
+        await self._executor.submit_batch(
+            execution_ids=execution_ids,
+            user_id=user_id,
+            priority=ExecutionPriority(data["priority"]),
+            slots=slots,
+        )
+
+        return execution_ids
+
+    async def stream_execution(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        workflow_id: int,
+        input_data: dict | None = None,
+        **kwargs: object,
+    ) -> tuple[Execution, AsyncIterator[tuple[str, dict[str, Any]] | None]]:
+        """Create an execution and follow the tokens of its output nodes.
+
+        Only tokens of LLM nodes feeding an output node directly are relayed,
+        as they are generated, followed by the execution-finished event.
+        Reading starts at the beginning of the event stream, so tokens
+        published before the caller subscribes are not lost.
+
+        Args:
+            session: The session.
+            user_id: The owner user ID.
+            workflow_id: The workflow ID.
+            input_data: The execution input data.
+            **kwargs: The other execution creation fields, such as the
+                timeout and the priority class.
+
+        Returns:
+            The created execution and an iterator of its relayed events,
+            yielding None on idle.
+
+        Raises:
+            WorkflowNotFoundError: If the workflow is not found.
+            ExecutionGraphError: If the workflow graph contains a cycle.
+            ExecutionRateLimitError: If the user has too many executions.
+            ExecutionQueueFullError: If the execution queue is full.
+
+        """
+        workflow = await self._workflow_repository.get_by(
+            session=session, id=workflow_id, owner_id=user_id
+        )
+        if not workflow:
+            raise WorkflowNotFoundError
+
+        plan = await load_plan(session=session, workflow=workflow)
+        node_ids = frozenset(
+            node.id
+            for i, node in enumerate(plan.nodes)
+            if node.type == NodeType.LLM
+            and any(
+                plan.nodes[successor].type == NodeType.OUTPUT
+                for successor in plan.successors(i)
+            )
+        )
+
+        execution = await self.create_execution(
             session=session,
-            data={
-                "workflow_id": workflow_id,
-                "input_data": input_data,
-            },
+            user_id=user_id,
+            workflow_id=workflow_id,
+            input_data=input_data,
+            **kwargs,
+        )
+        # Release the pooled connection before the long-lived stream starts.
+        await session.close()
+
+        return execution, self._relay_tokens(
+            execution_id=execution.id, node_ids=node_ids
         )
 
     async def get_executions(
@@ -81,7 +324,188 @@ class ExecutionUsecase:
     async def get_execution(
         self, session: AsyncSession, execution_id: int, user_id: int
     ) -> Execution:
-        """Fetch an execution by ID.
+        """Fetch an execution by ID, with its offloaded payloads loaded.
+
+        Args:
+            session: The session.
+            execution_id: The execution ID.
+            user_id: The owner user ID.
+
+        Returns:
+            The execution.
+
+        Raises:
+            ExecutionNotFoundError: If the execution is not found.
+            WorkflowNotFoundError: If the workflow is not found.
+
+        """
+        execution = await self._get_execution(
+            session=session, execution_id=execution_id, user_id=user_id
+        )
+
+        return await self._hydrate(execution=execution)
+
+    async def cancel_execution(
+        self, session: AsyncSession, execution_id: int, user_id: int
+    ) -> Execution:
+        """Cancel an execution that has not finished yet.
+
+        The row is marked as cancelled right away, so queued executions are
+        never started; running ones are stopped by whichever process holds
+        them. Executions following the cancelled one are queued behind the
+        oldest of them, which leads the others from then on; when no slot is
+        free, the supervising sweep queues them later. Cancelling a finished
+        execution leaves it unchanged.
+
+        Args:
+            session: The session.
+            execution_id: The execution ID.
+            user_id: The owner user ID.
+
+        Returns:
+            The execution.
+
+        Raises:
+            ExecutionNotFoundError: If the execution is not found.
+            WorkflowNotFoundError: If the workflow is not found.
+
+        """
+        execution = await self._get_execution(
+            session=session, execution_id=execution_id, user_id=user_id
+        )
+
+        data = {"status": ExecutionStatus.CANCELLED, "error": "Execution cancelled"}
+        if await self._execution_repository.finish_unfinished(
+            session=session,
+            execution_id=execution_id,
+            data={**data, "finished_at": func.now()},
+        ):
+            await execution_cancellations.publish(execution_id=execution_id)
+            await execution_events.publish(
+                execution_id=execution_id,
+                event_type=ExecutionEventType.EXECUTION_FINISHED,
+                data=data,
+            )
+            if engine_settings.dedupe:
+                await self._promote_follower(session=session, execution=execution)
+
+        await session.refresh(execution)
+        return await self._hydrate(execution=execution)
+
+    async def _promote_follower(
+        self, session: AsyncSession, execution: Execution
+    ) -> None:
+        """Queue the oldest follower of a cancelled execution to lead the others.
+
+        Args:
+            session: The session.
+            execution: The cancelled execution.
+
+        """
+        workflow = await self._workflow_repository.get_by(
+            session=session, id=execution.workflow_id
+        )
+        if not workflow:
+            return
+
+        try:
+            await self._executor.reserve(user_id=workflow.owner_id)
+        except (ExecutionRateLimitError, ExecutionQueueFullError):
+            return
+
+        promoted = await self._execution_repository.promote_follower(
+            session=session, leader_id=execution.id
+        )
+        if promoted is None:
+            await self._executor.release(user_id=workflow.owner_id)
+            return
+
+        await execution_flights.hand_over(
+            execution_id=execution.id, successor_id=promoted.id
+        )
+        await self._executor.submit(
+            execution_id=promoted.id,
+            user_id=workflow.owner_id,
+            priority=promoted.priority,
+        )
+
+    async def get_execution_node_runs(
+        self, session: AsyncSession, execution_id: int, user_id: int
+    ) -> list[ExecutionNodeRun]:
+        """List the node runs of an execution.
+
+        Args:
+            session: The session.
+            execution_id: The execution ID.
+            user_id: The owner user ID.
+
+        Returns:
+            The node runs in start order.
+
+        Raises:
+            ExecutionNotFoundError: If the execution is not found.
+            WorkflowNotFoundError: If the workflow is not found.
+
+        """
+        await self._get_execution(
+            session=session, execution_id=execution_id, user_id=user_id
+        )
+
+        return await self._execution_node_run_repository.get_all_by_execution(
+            session=session, execution_id=execution_id
+        )
+
+    async def get_execution_events(
+        self,
+        session: AsyncSession,
+        execution_id: int,
+        user_id: int,
+        last_event_id: str = "0",
+    ) -> AsyncIterator[tuple[str, dict[str, Any]] | None]:
+        """Follow the progress events of an execution.
+
+        Ownership is checked once up front; the returned iterator only talks
+        to Redis, so subscribers cost no database queries while they wait.
+
+        Args:
+            session: The session.
+            execution_id: The execution ID.
+            user_id: The owner user ID.
+            last_event_id: The ID of the last event the client has seen.
+
+        Returns:
+            An iterator of event ID and event pairs, yielding None on idle.
+
+        Raises:
+            ExecutionNotFoundError: If the execution is not found.
+            WorkflowNotFoundError: If the workflow is not found.
+
+        """
+        execution = await self._get_execution(
+            session=session, execution_id=execution_id, user_id=user_id
+        )
+        # Release the pooled connection before the long-lived stream starts.
+        await session.close()
+
+        if execution.status in {
+            ExecutionStatus.SUCCESS,
+            ExecutionStatus.FAILED,
+            ExecutionStatus.CANCELLED,
+        } and not await execution_events.exists(execution_id=execution_id):
+            return self._replay_finished(
+                execution=await self._hydrate(execution=execution)
+            )
+
+        return execution_events.read(
+            execution_id=execution_id,
+            last_event_id=last_event_id,
+            block=engine_settings.events_keepalive,
+        )
+
+    async def _get_execution(
+        self, session: AsyncSession, execution_id: int, user_id: int
+    ) -> Execution:
+        """Fetch an execution by ID, leaving offloaded payloads as previews.
 
         Args:
             session: The session.
@@ -109,3 +533,83 @@ class ExecutionUsecase:
             raise WorkflowNotFoundError
 
         return execution
+
+    @staticmethod
+    async def _hydrate(execution: Execution) -> Execution:
+        """Replace the previews of offloaded payloads with the payloads.
+
+        The payloads are set as already committed state, so the session
+        never writes them back to the row.
+
+        Args:
+            execution: The execution.
+
+        Returns:
+            The same execution.
+
+        """
+        if execution.input_blob:
+            input_data = await blob_store.load(key=execution.input_blob)
+            set_committed_value(execution, "input_data", input_data)
+        if execution.output_blob:
+            output_data = await blob_store.load(key=execution.output_blob)
+            set_committed_value(execution, "output_data", output_data)
+
+        return execution
+
+    @staticmethod
+    async def _relay_tokens(
+        execution_id: int, node_ids: frozenset[int]
+    ) -> AsyncIterator[tuple[str, dict[str, Any]] | None]:
+        """Filter the events of an execution down to output tokens.
+
+        Args:
+            execution_id: The execution ID.
+            node_ids: The IDs of the nodes whose tokens are relayed.
+
+        Yields:
+            Token events of the given nodes and the events ending the
+            stream, or None when no event arrived in time.
+
+        """
+        async for item in execution_events.read(
+            execution_id=execution_id, block=engine_settings.events_keepalive
+        ):
+            if item is not None:
+                _, event = item
+                if event["type"] not in {
+                    ExecutionEventType.EXECUTION_FINISHED,
+                    ExecutionEventType.STREAM_ERROR,
+                } and (
+                    event["type"] != ExecutionEventType.TOKEN
+                    or event["node_id"] not in node_ids
+                ):
+                    continue
+
+            yield item
+
+    @staticmethod
+    async def _replay_finished(
+        execution: Execution,
+    ) -> AsyncIterator[tuple[str, dict[str, Any]] | None]:
+        """Yield the final event of a finished execution whose stream expired.
+
+        Args:
+            execution: The finished execution.
+
+        Yields:
+            A single execution-finished event built from the row.
+
+        """
+        yield (
+            "0-0",
+            {
+                "type": ExecutionEventType.EXECUTION_FINISHED,
+                "node_id": None,
+                "data": {
+                    "status": execution.status,
+                    "output_data": execution.output_data,
+                    "error": execution.error,
+                },
+            },
+        )
@@ -2,6 +2,8 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from engine.plan import invalidate_plan
+from engine.topology import topology_cache
 from exceptions import NodeNotFoundError, WorkflowNotFoundError
 from models import Node
 from repositories import NodeRepository, WorkflowRepository
@@ -41,10 +43,13 @@ class NodeUsecase:
         if not workflow:
             raise WorkflowNotFoundError
 
-        return await self._node_repository.create(
+        node = await self._node_repository.create(
             session=session,
             data=kwargs,
         )
+        await invalidate_plan(session=session, workflow_id=node.workflow_id)
+
+        return node
 
     async def get_nodes(
         self, session: AsyncSession, user_id: int, workflow_id: int
@@ -136,6 +141,9 @@ class NodeUsecase:
         if not node:
             raise NodeNotFoundError
 
+        if "data" in update_data:
+            await invalidate_plan(session=session, workflow_id=node.workflow_id)
+
         return node
 
     async def delete_node(
@@ -153,8 +161,19 @@ class NodeUsecase:
             WorkflowNotFoundError: If the workflow is not found.
 
         """
-        await self.get_node(session=session, node_id=node_id, user_id=user_id)
+        node = await self.get_node(session=session, node_id=node_id, user_id=user_id)
+        workflow = await self._workflow_repository.get_by(
+            session=session, id=node.workflow_id
+        )
 
         deleted = await self._node_repository.delete_by(session=session, id=node_id)
         if not deleted:
             raise NodeNotFoundError
+
+        if workflow:
+            topology = topology_cache.get(
+                workflow_id=workflow.id, version=workflow.version
+            )
+            if topology:
+                topology.remove_node(node=node_id)
+        await invalidate_plan(session=session, workflow_id=node.workflow_id)
@@ -1,10 +1,19 @@
 """Workflow use case implementation."""
 
+from datetime import UTC, datetime, timedelta
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from engine.analysis import NodeEstimate, PlanAnalysis, analyze_plan
+from engine.plan import load_plan
 from exceptions import WorkflowNotFoundError
 from models import Workflow
-from repositories import UserRepository, WorkflowRepository
+from repositories import (
+    ExecutionNodeRunRepository,
+    UserRepository,
+    WorkflowRepository,
+)
+from settings import engine_settings
 
 
 class WorkflowUsecase:
@@ -14,6 +23,7 @@ class WorkflowUsecase:
         """Initialize the usecase."""
         self._workflow_repository = WorkflowRepository()
         self._user_repository = UserRepository()
+        self._execution_node_run_repository = ExecutionNodeRunRepository()
 
     async def create_workflow(
         self, session: AsyncSession, user_id: int, name: str
@@ -76,6 +86,53 @@ class WorkflowUsecase:
 
         return workflow
 
+    async def get_workflow_plan(
+        self, session: AsyncSession, workflow_id: int, user_id: int
+    ) -> PlanAnalysis:
+        """Analyze the graph of a workflow before running it.
+
+        The analysis runs on the same compiled plan the engine executes, with
+        node costs averaged over recent successful runs that were not served
+        from the memo store.
+
+        Args:
+            session: The session.
+            workflow_id: The workflow ID.
+            user_id: The owner user ID.
+
+        Returns:
+            The levels, critical path, width and cost estimate of the graph.
+
+        Raises:
+            WorkflowNotFoundError: If the workflow is not found.
+            ExecutionGraphError: If the graph contains a cycle.
+
+        """
+        workflow = await self.get_workflow(
+            session=session, workflow_id=workflow_id, user_id=user_id
+        )
+        plan = await load_plan(session=session, workflow=workflow)
+
+        # Timestamp columns are naive UTC, like the server-side now() defaults.
+        since = datetime.now(tz=UTC).replace(tzinfo=None) - timedelta(
+            days=engine_settings.estimate_window_days
+        )
+        averages = await self._execution_node_run_repository.get_averages(
+            session=session, workflow_id=workflow_id, since=since
+        )
+
+        return analyze_plan(
+            plan=plan,
+            estimates={
+                node_id: NodeEstimate(
+                    duration_ms=duration_ms,
+                    prompt_tokens=prompt_tokens,
+                    completion_tokens=completion_tokens,
+                )
+                for node_id, duration_ms, prompt_tokens, completion_tokens in averages
+            },
+        )
+
     async def update_workflow(
         self, session: AsyncSession, workflow_id: int, user_id: int, **kwargs: object
     ) -> Workflow:
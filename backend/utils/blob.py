@@ -0,0 +1,149 @@
+"""Content-addressed, compressed storage of large JSON payloads."""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import zstandard
+
+from settings import blob_settings
+from utils.hashing import canonical_json
+
+
+class BlobStore:
+    """Filesystem store of zstd-compressed JSON payloads keyed by digest.
+
+    Payloads are written once under their SHA-256 digest, so identical
+    payloads share one file and a blob never changes after it is written.
+    Writing a payload that is already stored touches its file instead, so
+    the modification time tells when a blob was last referenced.
+    """
+
+    def __init__(
+        self, path: str, threshold: int, preview_size: int, compression_level: int
+    ) -> None:
+        """Initialize the store.
+
+        Args:
+            path: The directory holding the blobs.
+            threshold: The serialized size in bytes above which to offload.
+            preview_size: The characters of a payload kept as its preview.
+            compression_level: The zstd compression level.
+
+        """
+        self._path = Path(path)
+        self._threshold = threshold
+        self._preview_size = preview_size
+        self._compression_level = compression_level
+
+    async def offload(self, value: Any) -> tuple[Any, str | None]:  # noqa: ANN401
+        """Store a payload if it is too large to be kept in a row.
+
+        Args:
+            value: The JSON-compatible payload.
+
+        Returns:
+            The value to keep in the row, either the payload itself or a
+            preview of it, and the blob key if the payload was offloaded.
+
+        """
+        if value is None:
+            return None, None
+
+        raw = canonical_json(value)
+        if len(raw) <= self._threshold:
+            return value, None
+
+        key = hashlib.sha256(raw).hexdigest()
+        await asyncio.to_thread(self._write, key, raw)
+
+        preview = {
+            "preview": raw[: self._preview_size].decode(errors="ignore"),
+            "size": len(raw),
+        }
+        return preview, key
+
+    async def load(self, key: str) -> Any:  # noqa: ANN401
+        """Read an offloaded payload.
+
+        Args:
+            key: The blob key.
+
+        Returns:
+            The JSON-compatible payload.
+
+        """
+        raw = await asyncio.to_thread(self._read, key)
+        return json.loads(raw)
+
+    async def delete(self, keys: Iterable[str], before: datetime) -> int:
+        """Delete blobs unless they were written again since a point in time.
+
+        Args:
+            keys: The blob keys.
+            before: The time a blob must not have been written since.
+
+        Returns:
+            The number of blobs deleted.
+
+        """
+        return await asyncio.to_thread(self._delete, list(keys), before.timestamp())
+
+    def _blob_path(self, key: str) -> Path:
+        """Return the file of a blob, fanned out over two directory levels."""
+        return self._path / key[:2] / key[2:4] / f"{key}.zst"
+
+    def _write(self, key: str, raw: bytes) -> None:
+        """Compress and write a blob atomically unless it already exists."""
+        path = self._blob_path(key)
+        if path.exists():
+            path.touch()
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        compressed = zstandard.ZstdCompressor(level=self._compression_level).compress(
+            raw
+        )
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(compressed)
+            Path(tmp).replace(path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _delete(self, keys: list[str], before: float) -> int:
+        """Delete the blobs last written before a timestamp."""
+        deleted = 0
+        for key in keys:
+            path = self._blob_path(key)
+            try:
+                if path.stat().st_mtime >= before:
+                    continue
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            deleted += 1
+
+        return deleted
+
+    def _read(self, key: str) -> bytes:
+        """Read and decompress a blob."""
+        return zstandard.ZstdDecompressor().decompress(
+            self._blob_path(key).read_bytes()
+        )
+
+
+blob_store = BlobStore(
+    path=blob_settings.path,
+    threshold=blob_settings.threshold,
+    preview_size=blob_settings.preview_size,
+    compression_level=blob_settings.compression_level,
+)
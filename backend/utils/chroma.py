@@ -0,0 +1,119 @@
+"""Chroma HTTP API helpers."""
+
+from typing import Any
+
+import httpx
+
+from settings import chroma_settings
+
+
+def _database_url() -> str:
+    """Return the URL of the configured Chroma tenant database."""
+    return (
+        f"{chroma_settings.url}/api/v2/tenants/{chroma_settings.tenant}"
+        f"/databases/{chroma_settings.database}"
+    )
+
+
+async def get_or_create_collection(
+    client: httpx.AsyncClient, name: str, metadata: dict[str, Any] | None = None
+) -> str:
+    """Return the ID of a collection, creating it if it does not exist.
+
+    Args:
+        client: The HTTP client.
+        name: The collection name.
+        metadata: The metadata to create the collection with.
+
+    Returns:
+        The collection ID.
+
+    Raises:
+        httpx.HTTPError: If the request fails.
+
+    """
+    response = await client.post(
+        f"{_database_url()}/collections",
+        json={"name": name, "metadata": metadata, "get_or_create": True},
+        timeout=chroma_settings.timeout,
+    )
+    response.raise_for_status()
+
+    return response.json()["id"]
+
+
+async def query(
+    client: httpx.AsyncClient,
+    collection_id: str,
+    embedding: list[float],
+    where: dict[str, Any] | None = None,
+    n_results: int = 1,
+) -> list[dict[str, Any]]:
+    """Find the nearest neighbours of an embedding in a collection.
+
+    Args:
+        client: The HTTP client.
+        collection_id: The collection ID.
+        embedding: The query embedding.
+        where: The metadata filter.
+        n_results: The number of neighbours returned.
+
+    Returns:
+        The neighbours, nearest first, with their `id`, `distance`,
+        `document` and `metadata`.
+
+    Raises:
+        httpx.HTTPError: If the request fails.
+
+    """
+    response = await client.post(
+        f"{_database_url()}/collections/{collection_id}/query",
+        json={
+            "query_embeddings": [embedding],
+            "n_results": n_results,
+            "where": where,
+            "include": ["distances", "documents", "metadatas"],
+        },
+        timeout=chroma_settings.timeout,
+    )
+    response.raise_for_status()
+
+    result = response.json()
+    return [
+        {"id": id_, "distance": distance, "document": document, "metadata": metadata}
+        for id_, distance, document, metadata in zip(
+            result["ids"][0],
+            result["distances"][0],
+            result["documents"][0],
+            result["metadatas"][0],
+            strict=True,
+        )
+    ]
+
+
+async def upsert(
+    client: httpx.AsyncClient,
+    collection_id: str,
+    ids: list[str],
+    embeddings: list[list[float]],
+    **fields: list[Any],
+) -> None:
+    """Insert or replace records of a collection.
+
+    Args:
+        client: The HTTP client.
+        collection_id: The collection ID.
+        ids: The record IDs.
+        embeddings: The record embeddings.
+        **fields: Other record fields, such as `documents` and `metadatas`.
+
+    Raises:
+        httpx.HTTPError: If the request fails.
+
+    """
+    response = await client.post(
+        f"{_database_url()}/collections/{collection_id}/upsert",
+        json={"ids": ids, "embeddings": embeddings, **fields},
+        timeout=chroma_settings.timeout,
+    )
+    response.raise_for_status()
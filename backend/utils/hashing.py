@@ -0,0 +1,37 @@
+"""Content hashing helpers."""
+
+import hashlib
+import json
+from typing import Any
+
+
+def canonical_json(value: Any) -> bytes:  # noqa: ANN401
+    """Serialize a value to JSON with a stable key order and no whitespace.
+
+    Args:
+        value: The JSON-compatible value.
+
+    Returns:
+        The UTF-8 encoded canonical JSON.
+
+    """
+    return json.dumps(
+        value,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    ).encode()
+
+
+def digest(*parts: Any) -> str:  # noqa: ANN401
+    """Return the SHA-256 hex digest of the canonical JSON of some values.
+
+    Args:
+        *parts: The JSON-compatible values.
+
+    Returns:
+        The hex digest.
+
+    """
+    return hashlib.sha256(canonical_json(list(parts))).hexdigest()
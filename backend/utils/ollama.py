@@ -0,0 +1,158 @@
+"""Ollama HTTP API helpers and pooled clients."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+
+import httpx
+
+from settings import ollama_settings
+from settings.ollama import OllamaSettings
+
+
+class OllamaClients:
+    """Long-lived HTTP clients, one per Ollama base URL.
+
+    Every LLM call to the same server reuses the keep-alive connections of
+    one client, so nodes do not pay TCP setup per request. Clients belong to
+    the event loop that created them and are closed on that loop when
+    another loop asks, as happens across Prefect flow runs.
+    """
+
+    def __init__(self, settings: OllamaSettings) -> None:
+        """Initialize the pool without opening any client.
+
+        Args:
+            settings: The timeouts and connection limits of every client.
+
+        """
+        self._limits = httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        )
+        self._timeout = httpx.Timeout(
+            settings.timeout,
+            connect=settings.connect_timeout,
+            pool=settings.pool_timeout,
+        )
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def get(self, base_url: str) -> httpx.AsyncClient:
+        """Return the client of a base URL, opening it on first use.
+
+        Args:
+            base_url: The Ollama base URL.
+
+        Returns:
+            The shared client.
+
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._close_stale()
+            self._loop = loop
+
+        key = base_url.rstrip("/")
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(limits=self._limits, timeout=self._timeout)
+            self._clients[key] = client
+
+        return client
+
+    def _close_stale(self) -> None:
+        """Close the clients of the previous event loop on that loop.
+
+        Clients of a loop that is already closed can no longer be awaited;
+        their sockets are released when the clients are collected.
+        """
+        clients, self._clients = list(self._clients.values()), {}
+        if clients and self._loop is not None and not self._loop.is_closed():
+            asyncio.run_coroutine_threadsafe(_close(clients=clients), self._loop)
+
+    async def aclose(self) -> None:
+        """Close every client, dropping their pooled connections."""
+        clients, self._clients = list(self._clients.values()), {}
+        await _close(clients=clients)
+
+
+async def _close(clients: list[httpx.AsyncClient]) -> None:
+    """Close clients, ignoring those that fail to close.
+
+    Args:
+        clients: The clients, all of the running event loop.
+
+    """
+    await asyncio.gather(
+        *(client.aclose() for client in clients), return_exceptions=True
+    )
+
+
+async def stream_generate(
+    client: httpx.AsyncClient,
+    base_url: str,
+    model: str,
+    prompt: str,
+    options: dict | None = None,
+) -> AsyncIterator[dict]:
+    """Run a streaming completion against Ollama.
+
+    Args:
+        client: The HTTP client, whose timeouts apply.
+        base_url: The Ollama base URL.
+        model: The model name.
+        prompt: The prompt text.
+        options: The sampling options.
+
+    Yields:
+        The decoded `/api/generate` chunks; the last one has `done` set.
+
+    Raises:
+        httpx.HTTPError: If the request fails.
+
+    """
+    async with client.stream(
+        "POST",
+        f"{base_url.rstrip('/')}/api/generate",
+        json={
+            "model": model,
+            "prompt": prompt,
+            "stream": True,
+            "options": options or {},
+        },
+    ) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if line:
+                yield json.loads(line)
+
+
+async def embed(
+    client: httpx.AsyncClient, base_url: str, model: str, texts: list[str]
+) -> list[list[float]]:
+    """Embed texts with Ollama in one request.
+
+    Args:
+        client: The HTTP client, whose timeouts apply.
+        base_url: The Ollama base URL.
+        model: The embedding model name.
+        texts: The texts to embed.
+
+    Returns:
+        One embedding per text, in order.
+
+    Raises:
+        httpx.HTTPError: If the request fails.
+
+    """
+    response = await client.post(
+        f"{base_url.rstrip('/')}/api/embed", json={"model": model, "input": texts}
+    )
+    response.raise_for_status()
+
+    return response.json()["embeddings"]
+
+
+ollama_clients = OllamaClients(settings=ollama_settings)